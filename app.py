@@ -1,22 +1,99 @@
 import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
+import time
 from datetime import date
 
+from ironos import perf
+from ironos.analytics import Rollups, overlay_profile
+from ironos.catalog import get_catalog
+from ironos.config import build_storage, sheets_api_options, storage_settings
+from ironos.library import build_library_index, compile_library
+from ironos.lifts import get_resolver, profile_for
+from ironos.loader import SheetLoader
+from ironos.partitions import PartitionedStorage
+from ironos.prefetch import prefetch, prefetched_workout, upcoming
+from ironos.snapshots import SnapshotStore, SnapshotWriter, restore
+from ironos.storage import MemoryStorage
+from ironos.sync import SaveJournal, SyncWorker
+from ironos.workout import WorkoutSession, parse_multi_value
+
 # ==========================================
 # 1. CONFIG & CSS
 # ==========================================
 st.set_page_config(page_title="IronOS", page_icon="⚡", layout="wide")
 
-# Initialize connection
+# Timings for this rerun and this session (see the Performance panel)
+_rerun_started = time.perf_counter()
+rerun_perf = perf.Recorder()
+session_perf = st.session_state.setdefault("perf_session", perf.Recorder())
+perf.collect_into(rerun_perf, session_perf)
+
+def get_storage_settings():
+    """Backend choice from [storage] in secrets.toml, else IRONOS_STORAGE / IRONOS_DB"""
+    try:
+        secrets = dict(st.secrets.get("storage", {}))
+    except Exception:
+        secrets = {}
+    return storage_settings(secrets)
+
+def get_service_account():
+    """Service account configured for st-gsheets-connection, reused by the sheets_api backend"""
+    try:
+        return dict(st.secrets.get("connections", {}).get("gsheets", {}))
+    except Exception:
+        return {}
+
+@st.cache_resource
+def get_storage(backend, path, archive=None):
+    connection = st.connection("gsheets", type=GSheetsConnection) if backend == "gsheets" else None
+    api = sheets_api_options(get_storage_settings(), get_service_account()) if backend == "sheets_api" else None
+    return build_storage(backend, path, archive, connection, api)
+
+@st.cache_resource
+def get_loader(backend, path, archive=None):
+    return SheetLoader(get_storage(backend, path, archive))
+
+@st.cache_resource
+def get_journal(journal_path):
+    return SaveJournal(journal_path)
+
+@st.cache_resource
+def get_sync_worker(backend, path, archive, journal_path):
+    worker = SyncWorker(get_journal(journal_path), get_storage(backend, path, archive))
+    worker.start()
+    return worker
+
+@st.cache_resource
+def get_snapshots(snapshot_path):
+    store = SnapshotStore(snapshot_path)
+    SnapshotWriter(store).start()
+    return store
+
+@st.cache_resource
+def get_rollups(analytics_dir):
+    return Rollups.load(analytics_dir)
+
+@st.cache_resource
+def start_metrics_server(port):
+    return perf.serve_metrics(port)
+
+# Initialize storage
+_settings = get_storage_settings()
+if _settings["metrics_port"]:
+    start_metrics_server(int(_settings["metrics_port"]))
+journal = get_journal(_settings["journal"])
+snapshots = get_snapshots(_settings["snapshots"])
 try:
-    conn = st.connection("gsheets", type=GSheetsConnection)
+    _backend = (_settings["backend"], _settings["path"], _settings["archive"])
+    storage = get_storage(*_backend)
+    loader = get_loader(*_backend)
+    sync_worker = get_sync_worker(*_backend, _settings["journal"])
 except Exception as e:
     st.error(f"Connection Error: {e}")
-    class DummyConnection:
-        def read(self, **kwargs): return pd.DataFrame()
-        def update(self, **kwargs): pass
-    conn = DummyConnection()
+    storage = MemoryStorage()
+    loader = SheetLoader(storage)
+    sync_worker = None  # saves stay in the journal until a backend is reachable
 
 # CSS to force horizontal layout
 st.markdown("""
@@ -123,123 +200,124 @@ st.markdown("""
 # ==========================================
 # 2. DATA LOADING
 # ==========================================
-@st.cache_data(ttl=600)
+def report_sheet_errors(sheets):
+    for name, sheet in sheets.items():
+        if sheet.error:
+            st.warning(f"⚠️ Could not load {name}: {sheet.error}")
+        if sheet.issues:
+            with st.expander(f"⚠️ {name}: {len(sheet.issues)} invalid values (treated as blank)"):
+                st.text("\n".join(str(issue) for issue in sheet.issues[:50]))
+
 def load_static_data():
-    df_lib = pd.DataFrame()
-    df_profile = pd.DataFrame()
-    df_dir = pd.DataFrame()
+    """Master and Profile, fetched concurrently and cached per sheet"""
+    sheets = loader.load(["Master", "Profile"])
+    report_sheet_errors(sheets)
     
-    try:
-        df_lib = conn.read(worksheet="Master", ttl=0, dtype=str)
-    except:
-        pass
-    
-    try:
-        df_profile = conn.read(worksheet="Profile", ttl=0, dtype=str)
-    except:
-        pass
-    
-    try:
-        df_dir = conn.read(worksheet="Directory", ttl=0, dtype=str)
-    except:
-        pass
-    
-    # Ensure DataFrames have expected columns
-    if df_lib.empty:
-        df_lib = pd.DataFrame(columns=['Template', 'Week', 'Day', 'Exercise', 'Sets', 'Reps', 'Pct', 'Category'])
-    else:
-        df_lib.dropna(how='all', inplace=True)
-    
-    if df_profile.empty:
-        df_profile = pd.DataFrame(columns=['Lift', 'Max'])
-    else:
-        df_profile['Max'] = pd.to_numeric(df_profile['Max'], errors='coerce').fillna(0.0)
+    df_lib = sheets["Master"].frame
+    df_profile = sheets["Profile"].frame
+    lib_index = build_library_index(df_lib, sheets["Master"].version)
     
-    if df_dir.empty:
-        df_dir = pd.DataFrame(columns=['Exercise'])
-    
-    return df_lib, df_profile, df_dir
+    return df_lib, df_profile, lib_index
+
+def load_directory():
+    """Directory is only needed by Custom Build, so it loads on demand"""
+    sheet = loader.get("Directory")
+    report_sheet_errors({"Directory": sheet})
+    return sheet.frame
 
 def get_profile_max(df_profile, lift_name):
-    if df_profile.empty:
-        return 0.0
-    lift_name = str(lift_name).lower()
-    for _, row in df_profile.iterrows():
-        p_lift = str(row.get('Lift', '')).lower()
-        if p_lift in lift_name:
-            try:
-                return float(row.get('Max', 0))
-            except:
-                return 0.0
-    return 0.0
-
-def parse_multi_value(value_str, count, is_number=False):
-    """Parse comma-separated values"""
-    if pd.isna(value_str) or value_str is None:
-        value_str = ""
-    val_str = str(value_str).replace(" ", "").strip()
-    
-    if not val_str:
-        if is_number:
-            return [0.0] * count
-        else:
-            return ["5"] * count
-    
-    parts = val_str.split(',')
-    if len(parts) == 1:
-        try:
-            v = float(parts[0]) if is_number else parts[0]
-            return [v] * count
-        except:
-            if is_number:
-                return [0.0] * count
-            else:
-                return ["5"] * count
-    
-    result = []
-    for i in range(count):
-        raw = parts[i] if i < len(parts) else parts[-1]
-        if is_number:
-            try:
-                result.append(float(raw))
-            except:
-                result.append(0.0)
-        else:
-            result.append(str(raw))
-    return result
+    return get_resolver(df_profile).max_for(lift_name)
 
 # Load data
-df_lib, df_profile, df_dir = load_static_data()
+df_lib, shared_profile, lib_index = load_static_data()
+
+# Training rollups, caught up with any newly synced Logs rows
+rollups = get_rollups(_settings["analytics"])
+try:
+    if rollups.refresh(storage):
+        rollups.save(_settings["analytics"])
+except Exception as e:
+    st.warning(f"⚠️ Could not update analytics: {e}")
+
+# Athlete identity, kept in the URL so reconnects and bookmarks keep it
+if "athlete" not in st.session_state:
+    st.session_state.athlete = st.query_params.get("athlete", "")
+athlete = st.sidebar.text_input("Athlete", key="athlete", placeholder="Your name").strip()
+if athlete:
+    st.query_params["athlete"] = athlete
+elif "athlete" in st.query_params:
+    del st.query_params["athlete"]
+
+# Per-athlete maxes fall back to the shared Profile rows. Library, directory
+# and catalog are shared by every session; only this overlay is per athlete.
+df_profile = profile_for(shared_profile, athlete)
+
+if st.sidebar.toggle("Use logged maxes", key="use_logged_maxes",
+                     help="Guide weights from your best estimated 1RM over the last 12 weeks"):
+    df_profile = overlay_profile(df_profile, rollups.estimated_maxes(athlete))
 
 # ==========================================
 # 3. SESSION STATE
 # ==========================================
-if 'workout_queue' not in st.session_state:
-    st.session_state.workout_queue = []
-if 'builder_queue' not in st.session_state:
-    st.session_state.builder_queue = []
+today = date.today().isoformat()
+# Cheap after the first call of the day; a long-running process still drops yesterday's snapshots
+snapshots.prune(today)
 
-def copy_plan_to_actual(index, sets):
-    """Copy target values to actual inputs"""
-    ex = st.session_state.workout_queue[index]
-    guides = ex.get('Guide_List', [0] * sets)
-    reps = ex.get('Rep_List', ['5'] * sets)
-    
-    for s in range(sets):
-        # Get the target values for this set
-        target_weight = guides[s] if s < len(guides) else guides[-1] if guides else 0
-        target_reps = reps[s] if s < len(reps) else reps[-1] if reps else '5'
-        
-        # Convert target_reps to integer
-        try:
-            reps_int = int(str(target_reps).replace('+', '').strip())
-        except:
-            reps_int = 5
-        
-        # Set session state values
-        st.session_state[f"w_{index}_{s}"] = float(target_weight)
-        st.session_state[f"r_{index}_{s}"] = reps_int
-        st.session_state[f"rpe_{index}_{s}"] = 0.0
+if 'workout' not in st.session_state:
+    # New session or a reconnect: resume today's in-progress workout from the local snapshot.
+    # Anonymous sessions have nothing to tell them apart, so they are never snapshotted.
+    try:
+        snapshot = snapshots.load(athlete, today) if athlete else None
+    except Exception as e:
+        snapshot = None
+        st.warning(f"⚠️ Could not restore the last session: {e}")
+    (st.session_state.workout_queue, st.session_state.builder_queue,
+     st.session_state.workout) = restore(snapshot)
+
+def snapshot_session():
+    """Buffer the active plan and builder queue for the next snapshot write"""
+    if not athlete:
+        return
+    session = st.session_state.workout
+    snapshots.put_session(athlete, today, session.workout_id if session else None,
+                          st.session_state.workout_queue, st.session_state.builder_queue)
+
+def snapshot_exercise(i):
+    """Buffer one exercise's values; only edited exercises are written"""
+    if not athlete:
+        return
+    session = st.session_state.workout
+    snapshots.put_exercise(athlete, today, session.workout_id, i, session.logs[i])
+
+def current_workout():
+    """Per-exercise arrays for the queued plan, rebuilt when a new plan is queued"""
+    session = st.session_state.workout
+    if session is None or session.plan is not st.session_state.workout_queue:
+        session = st.session_state.workout = WorkoutSession(st.session_state.workout_queue)
+        snapshot_session()
+    return session
+
+def input_key(field, i, s=None):
+    """Widget key scoped to the workout and fill revision, so keys are never reused"""
+    session = st.session_state.workout
+    key = f"{field}_{session.workout_id[:8]}_{i}_{session.logs[i].rev}"
+    return key if s is None else f"{key}_{s}"
+
+def store_input(field, i, s, key):
+    """Write one edited input into its exercise array"""
+    getattr(st.session_state.workout.logs[i], field)[s] = st.session_state[key]
+    snapshot_exercise(i)
+
+def fill_exercise(i):
+    st.session_state.workout.logs[i].fill()
+    snapshot_exercise(i)
+
+def end_workout():
+    """Drop the active workout; its widget keys go stale and are cleaned up by Streamlit"""
+    st.session_state.workout_queue = []
+    st.session_state.workout = None
+    if athlete:
+        snapshots.discard(athlete, today)
 
 # ==========================================
 # 4. MAIN APP
@@ -247,8 +325,24 @@ def copy_plan_to_actual(index, sets):
 st.title("⚡ IronOS")
 st.markdown(f"**{date.today().strftime('%A, %b %d')}**")
 
+pending = journal.pending_count()
+stuck = journal.stuck_count()
+if stuck:
+    # Rows the backend rejected; they stay in the journal until the cause is fixed
+    st.error(f"❌ {stuck} sets could not be synced: {journal.stuck(limit=1)[0][2]}")
+    with st.expander("Unsynced sets"):
+        st.dataframe(pd.DataFrame([row for _, row, _ in journal.stuck()]), hide_index=True)
+        if st.button("Retry sync", key="retry_stuck"):
+            journal.retry_stuck()
+            if sync_worker is not None:
+                sync_worker.wake()
+            st.rerun()
+if pending > stuck:
+    error = journal.last_error()
+    st.caption(f"⏳ {pending - stuck} sets waiting to sync" + (f" (last error: {error})" if error else ""))
+
 if st.button("Reset Session", type="secondary"):
-    st.session_state.workout_queue = []
+    end_workout()
     st.session_state.builder_queue = []
     st.rerun()
 
@@ -258,13 +352,19 @@ st.markdown("---")
 # 5. WORKOUT BUILDER (when no active workout)
 # ==========================================
 if not st.session_state.workout_queue:
+    # The days after the athlete's last logged program day compile in the background
+    next_days = upcoming(lib_index, rollups.position(athlete))
+    if next_days:
+        prefetch(lib_index, df_profile, next_days)
+        template, week, day = next_days[0]
+        if st.button(f"▶️ Today's workout: {template} · Week {week} · Day {day}", type="primary"):
+            st.session_state.workout_queue = prefetched_workout(lib_index, df_profile, next_days[0])
+            st.rerun()
+
     st.markdown("### 📋 Select or Build Workout")
     
     # Get available templates
-    if not df_lib.empty and 'Template' in df_lib.columns:
-        templates = sorted(df_lib['Template'].dropna().unique().tolist())
-    else:
-        templates = []
+    templates = lib_index.templates
     
     # Add Custom Build option
     all_templates = ["Custom Build"] + templates
@@ -280,16 +380,11 @@ if not st.session_state.workout_queue:
     if selected_template == "Custom Build":
         st.markdown("#### 🛠️ Custom Workout Builder")
         
-        # Get all available exercises
-        all_exercises = []
-        if not df_profile.empty and 'Lift' in df_profile.columns:
-            all_exercises.extend(df_profile['Lift'].dropna().unique().tolist())
-        if not df_lib.empty and 'Exercise' in df_lib.columns:
-            all_exercises.extend(df_lib['Exercise'].dropna().unique().tolist())
-        if not df_dir.empty and 'Exercise' in df_dir.columns:
-            all_exercises.extend(df_dir['Exercise'].dropna().unique().tolist())
-        
-        all_exercises = sorted(list(set([str(ex) for ex in all_exercises if pd.notna(ex)])))
+        # Canonical exercise names, indexed once per data version
+        catalog = get_catalog(lib_index, shared_profile, load_directory())
+        query = st.text_input("Search exercises", key="builder_search",
+                              placeholder=f"{len(catalog)} exercises (prefix or approximate)")
+        all_exercises = catalog.search(query, limit=50) if query else catalog.options
         
         # Builder interface
         col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
@@ -317,6 +412,7 @@ if not st.session_state.workout_queue:
                         "Guide_List": guide_list,
                         "Meta": {"Template": "Custom"}
                     })
+                    snapshot_session()
                     st.rerun()
         
         # Show builder queue
@@ -329,6 +425,7 @@ if not st.session_state.workout_queue:
             with col1:
                 if st.button("Clear Queue", type="secondary"):
                     st.session_state.builder_queue = []
+                    snapshot_session()
                     st.rerun()
             with col2:
                 if st.button("🚀 Start Workout", type="primary"):
@@ -340,201 +437,228 @@ if not st.session_state.workout_queue:
     elif selected_template:
         st.markdown(f"#### 📁 {selected_template}")
         
+        with st.expander("Preview block", expanded=False):
+            st.dataframe(compile_library(lib_index, df_profile).block(selected_template),
+                         hide_index=True, use_container_width=True)
+        
         # Get weeks for this template
-        weeks = sorted(df_lib[df_lib['Template'] == selected_template]['Week'].dropna().unique())
+        weeks = lib_index.weeks(selected_template)
         selected_week = st.selectbox("Week", weeks, index=None)
         
         if selected_week:
             # Get days for this week
-            days = sorted(df_lib[(df_lib['Template'] == selected_template) & 
-                                (df_lib['Week'] == selected_week)]['Day'].dropna().unique())
+            days = lib_index.days(selected_template, selected_week)
             selected_day = st.selectbox("Day", days, index=None)
             
             if selected_day and st.button("🚀 Load Workout", type="primary"):
-                # Filter exercises for this template/week/day
-                workout_data = df_lib[(df_lib['Template'] == selected_template) &
-                                     (df_lib['Week'] == selected_week) &
-                                     (df_lib['Day'] == selected_day)]
-                
-                st.session_state.workout_queue = []
-                for _, row in workout_data.iterrows():
-                    base_max = get_profile_max(df_profile, row['Exercise'])
-                    
-                    try:
-                        n_sets = int(float(row['Sets']))
-                    except:
-                        n_sets = 3
-                    
-                    # Parse percentages
-                    pct_str = str(row['Pct']) if pd.notna(row['Pct']) else "0"
-                    pct_list = parse_multi_value(pct_str, n_sets, is_number=True)
-                    
-                    # Parse reps
-                    rep_str = str(row['Reps']) if pd.notna(row['Reps']) else "5"
-                    rep_list = parse_multi_value(rep_str, n_sets, is_number=False)
-                    
-                    # Calculate guide weights
-                    guide_list = []
-                    for p in pct_list:
-                        guide_weight = int((base_max * p) / 5) * 5 if p > 0 else 0
-                        guide_list.append(guide_weight)
-                    
-                    st.session_state.workout_queue.append({
-                        "Category": str(row.get('Category', 'Accessory')),
-                        "Exercise": row['Exercise'],
-                        "Sets": n_sets,
-                        "Rep_List": rep_list,
-                        "Guide_List": guide_list,
-                        "Meta": {
-                            "Template": selected_template,
-                            "Week": selected_week,
-                            "Day": selected_day
-                        }
-                    })
+                # Compiled prescriptions are cached per library/profile version
+                st.session_state.workout_queue = prefetched_workout(
+                    lib_index, df_profile, (selected_template, selected_week, selected_day))
                 st.rerun()
 
+    # PROGRESS DASHBOARD
+    with st.expander("📈 Progress"):
+        summary = rollups.summary(athlete)
+        if summary.empty:
+            st.caption("No logged sets yet.")
+        else:
+            st.dataframe(summary, use_container_width=True)
+            chosen = st.selectbox("Exercise", summary.index.tolist(), key="progress_exercise")
+            weekly = rollups.weekly_for(chosen, athlete)
+            st.markdown("**Weekly volume**")
+            st.bar_chart(weekly['Volume'])
+            st.markdown("**Top estimated 1RM**")
+            st.line_chart(weekly['Top_E1RM'])
+        
+        if isinstance(storage, PartitionedStorage):
+            st.markdown("**This month**")
+            st.dataframe(storage.recent().tail(20), hide_index=True, use_container_width=True)
+
 # ==========================================
 # 6. ACTIVE WORKOUT DISPLAY (HORIZONTAL LAYOUT)
 # ==========================================
-if st.session_state.workout_queue:
-    logs_to_save = []
+HEADER_HTML = """
+<div class="horizontal-layout">
+    <div class="horizontal-cell"><span class="header-label">SET</span></div>
+    <div class="horizontal-cell"><span class="header-label">TARGET</span></div>
+    <div class="horizontal-cell"><span class="header-label">REPS</span></div>
+    <div class="horizontal-cell"><span class="header-label">ACTUAL</span></div>
+    <div class="horizontal-cell"><span class="header-label">REPS</span></div>
+    <div class="horizontal-cell"><span class="header-label">RPE</span></div>
+</div>
+"""
+
+@st.fragment
+def render_exercise_card(i):
+    """One exercise card; edits inside it rerun only this fragment"""
+    start = time.perf_counter()
+    log = st.session_state.workout.logs[i]
     
-    for i, exercise in enumerate(st.session_state.workout_queue):
-        with st.expander(f"**{exercise['Exercise']}** • {exercise['Sets']} sets", expanded=True):
-            # Exercise header with fill button
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"*{exercise.get('Category', 'Exercise')}*")
-            with col2:
-                if st.button("📋 Fill", key=f"fill_{i}", use_container_width=True):
-                    copy_plan_to_actual(i, exercise['Sets'])
-                    st.rerun()
+    with st.expander(f"**{log.exercise}** • {log.sets} sets", expanded=True):
+        # Exercise header with fill button
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"*{log.category}*")
+        with col2:
+            st.button("📋 Fill", key=input_key("fill", i), use_container_width=True, on_click=fill_exercise, args=(i,))
+        
+        # HEADER ROW - All in one line
+        st.markdown(HEADER_HTML, unsafe_allow_html=True)
+        
+        # DATA ROWS - One horizontal row per set
+        for set_num in range(log.sets):
+            weight_key = input_key("weight", i, set_num)
+            reps_key = input_key("reps", i, set_num)
+            rpe_key = input_key("rpe", i, set_num)
             
-            # HEADER ROW - All in one line
-            header_html = """
-            <div class="horizontal-layout">
-                <div class="horizontal-cell"><span class="header-label">SET</span></div>
-                <div class="horizontal-cell"><span class="header-label">TARGET</span></div>
-                <div class="horizontal-cell"><span class="header-label">REPS</span></div>
-                <div class="horizontal-cell"><span class="header-label">ACTUAL</span></div>
-                <div class="horizontal-cell"><span class="header-label">REPS</span></div>
-                <div class="horizontal-cell"><span class="header-label">RPE</span></div>
-            </div>
-            """
-            st.markdown(header_html, unsafe_allow_html=True)
+            # Create a single row for this set using Streamlit columns
+            # This is the key to preventing stacking
+            row_cols = st.columns([0.08, 0.23, 0.23, 0.23, 0.115, 0.115])
             
-            # DATA ROWS - One horizontal row per set
-            for set_num in range(exercise['Sets']):
-                # Get target values for this set
-                target_weight = exercise['Guide_List'][set_num] if set_num < len(exercise['Guide_List']) else exercise['Guide_List'][-1]
-                target_reps = exercise['Rep_List'][set_num] if set_num < len(exercise['Rep_List']) else exercise['Rep_List'][-1]
-                
-                # Initialize session state if not exists
-                weight_key = f"w_{i}_{set_num}"
-                reps_key = f"r_{i}_{set_num}"
-                rpe_key = f"rpe_{i}_{set_num}"
-                
-                if weight_key not in st.session_state:
-                    st.session_state[weight_key] = 0.0
-                if reps_key not in st.session_state:
-                    st.session_state[reps_key] = 0
-                if rpe_key not in st.session_state:
-                    st.session_state[rpe_key] = 0.0
-                
-                # Create a single row for this set using Streamlit columns
-                # This is the key to preventing stacking
-                row_cols = st.columns([0.08, 0.23, 0.23, 0.23, 0.115, 0.115])
-                
-                with row_cols[0]:
-                    # Set number
-                    st.markdown(f"<div class='set-number'>{set_num+1}</div>", unsafe_allow_html=True)
-                
-                with row_cols[1]:
-                    # Target weight display
-                    st.markdown(f"<div class='target-box'>{int(target_weight)}</div>", unsafe_allow_html=True)
-                
-                with row_cols[2]:
-                    # Target reps display
-                    st.markdown(f"<div class='target-box reps-box'>{target_reps}</div>", unsafe_allow_html=True)
-                
-                with row_cols[3]:
-                    # Actual weight input
-                    actual_weight = st.number_input(
-                        "Weight",
-                        value=float(st.session_state[weight_key]),
-                        min_value=0.0,
-                        max_value=1000.0,
-                        step=5.0,
-                        key=weight_key,
-                        label_visibility="collapsed",
-                        format="%d"  # Display as integer
-                    )
-                    st.session_state[weight_key] = actual_weight
-                
-                with row_cols[4]:
-                    # Actual reps input
-                    actual_reps = st.number_input(
-                        "Reps",
-                        value=int(st.session_state[reps_key]),
-                        min_value=0,
-                        max_value=100,
-                        step=1,
-                        key=reps_key,
-                        label_visibility="collapsed"
-                    )
-                    st.session_state[reps_key] = actual_reps
-                
-                with row_cols[5]:
-                    # RPE input
-                    actual_rpe = st.number_input(
-                        "RPE",
-                        value=float(st.session_state[rpe_key]),
-                        min_value=0.0,
-                        max_value=10.0,
-                        step=0.5,
-                        key=rpe_key,
-                        label_visibility="collapsed",
-                        format="%.1f"
-                    )
-                    st.session_state[rpe_key] = actual_rpe
-                
-                # Store log entry
-                logs_to_save.append({
-                    "Date": date.today().strftime("%Y-%m-%d"),
-                    "Exercise": exercise['Exercise'],
-                    "Set": set_num + 1,
-                    "Weight": actual_weight,
-                    "Reps": actual_reps,
-                    "RPE": actual_rpe
-                })
-                
-                # Small spacer between sets
-                if set_num < exercise['Sets'] - 1:
-                    st.markdown("<div style='height: 8px;'></div>", unsafe_allow_html=True)
+            with row_cols[0]:
+                # Set number
+                st.markdown(f"<div class='set-number'>{set_num+1}</div>", unsafe_allow_html=True)
+            
+            with row_cols[1]:
+                # Target weight display
+                st.markdown(f"<div class='target-box'>{int(log.target_weight[set_num])}</div>", unsafe_allow_html=True)
+            
+            with row_cols[2]:
+                # Target reps display
+                st.markdown(f"<div class='target-box reps-box'>{log.target_reps[set_num]}</div>", unsafe_allow_html=True)
+            
+            with row_cols[3]:
+                # Actual weight input (value lives in the exercise's weight array)
+                st.number_input(
+                    "Weight",
+                    value=float(log.weight[set_num]),
+                    min_value=0.0,
+                    max_value=1000.0,
+                    step=5.0,
+                    key=weight_key,
+                    on_change=store_input,
+                    args=("weight", i, set_num, weight_key),
+                    label_visibility="collapsed",
+                    format="%d"  # Display as integer
+                )
+            
+            with row_cols[4]:
+                # Actual reps input
+                st.number_input(
+                    "Reps",
+                    value=int(log.reps[set_num]),
+                    min_value=0,
+                    max_value=100,
+                    step=1,
+                    key=reps_key,
+                    on_change=store_input,
+                    args=("reps", i, set_num, reps_key),
+                    label_visibility="collapsed"
+                )
+            
+            with row_cols[5]:
+                # RPE input
+                st.number_input(
+                    "RPE",
+                    value=float(log.rpe[set_num]),
+                    min_value=0.0,
+                    max_value=10.0,
+                    step=0.5,
+                    key=rpe_key,
+                    on_change=store_input,
+                    args=("rpe", i, set_num, rpe_key),
+                    label_visibility="collapsed",
+                    format="%.1f"
+                )
+            
+            # Small spacer between sets
+            if set_num < log.sets - 1:
+                st.markdown("<div style='height: 8px;'></div>", unsafe_allow_html=True)
+    
+    perf.record("render.card", time.perf_counter() - start, mode="inputs")
+
+GRID_FIELDS = {"Actual": "weight", "Reps": "reps", "RPE": "rpe"}
+
+def merge_grid_edits(i):
+    """Fold the editor's edited cells into the exercise arrays"""
+    log = st.session_state.workout.logs[i]
+    for row, changes in st.session_state[input_key("editor", i)].get("edited_rows", {}).items():
+        for col, value in changes.items():
+            getattr(log, GRID_FIELDS[col])[int(row)] = 0 if value is None else value
+    snapshot_exercise(i)
+
+@st.fragment
+def render_exercise_grid(i):
+    """One exercise as a single data_editor instead of 3 inputs per set"""
+    start = time.perf_counter()
+    log = st.session_state.workout.logs[i]
+    
+    with st.expander(f"**{log.exercise}** • {log.sets} sets", expanded=True):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"*{log.category}*")
+        with col2:
+            st.button("📋 Fill", key=input_key("fill", i), use_container_width=True, on_click=fill_exercise, args=(i,))
+        
+        st.data_editor(
+            log.frame(),
+            key=input_key("editor", i),
+            on_change=merge_grid_edits,
+            args=(i,),
+            hide_index=True,
+            use_container_width=True,
+            disabled=["Set", "Target", "Target Reps"],
+            column_config={
+                "Actual": st.column_config.NumberColumn(min_value=0.0, max_value=1000.0, step=5.0, format="%d"),
+                "Reps": st.column_config.NumberColumn(min_value=0, max_value=100, step=1),
+                "RPE": st.column_config.NumberColumn(min_value=0.0, max_value=10.0, step=0.5, format="%.1f"),
+            },
+        )
+    
+    perf.record("render.card", time.perf_counter() - start, mode="grid")
+
+if st.session_state.workout_queue:
+    workout = current_workout()
+    # Both modes read and write the same arrays, so switching needs no copying
+    st.toggle("Grid input", key="grid_mode",
+              help="One editable table per exercise instead of an input per set")
+    render = render_exercise_grid if st.session_state.grid_mode else render_exercise_card
+    with perf.timed("render.workout"):
+        for i in range(len(workout.logs)):
+            render(i)
     
     # Save button at the bottom
     st.markdown("---")
     if st.button("✅ Save Workout", type="primary", use_container_width=True):
-        # Filter out empty entries
-        valid_logs = [log for log in logs_to_save if log['Weight'] > 0]
+        # Only sets with a weight are logged. Directory names only matter if
+        # Custom Build loaded it, so saving never fetches it.
+        catalog = get_catalog(lib_index, shared_profile, loader.cached("Directory"))
+        new_logs_df = workout.logs_frame(date.today().strftime("%Y-%m-%d"), athlete, catalog=catalog)
         
-        if valid_logs:
+        if not new_logs_df.empty:
             try:
-                new_logs_df = pd.DataFrame(valid_logs)
+                # Journal locally first; the sync worker appends in the background
+                journal.enqueue("Logs", new_logs_df)
+                if sync_worker is not None:
+                    sync_worker.wake()
                 
-                # Read existing logs
-                current_logs = conn.read(worksheet="Logs", ttl=0, dtype=str)
-                if current_logs.empty:
-                    current_logs = pd.DataFrame(columns=new_logs_df.columns)
-                
-                # Combine and save
-                updated_logs = pd.concat([current_logs, new_logs_df], ignore_index=True)
-                conn.update(worksheet="Logs", data=updated_logs)
-                
-                st.success("✅ Workout saved successfully!")
-                st.session_state.workout_queue = []
+                st.success(f"✅ Workout saved successfully! ({len(new_logs_df)} sets)")
+                end_workout()
                 st.rerun()
             except Exception as e:
                 st.error(f"Error saving workout: {str(e)}")
         else:
-            st.warning("No data to save. Please log at least one set.")
\ No newline at end of file
+            st.warning("No data to save. Please log at least one set.")
+
+# ==========================================
+# 7. PERFORMANCE PANEL
+# ==========================================
+perf.record("rerun", time.perf_counter() - _rerun_started)
+perf.log_summary(rerun_perf)
+
+if _settings["debug"] or st.query_params.get("debug") == "1":
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.caption(f"This rerun: {rerun_perf.total_ms('rerun'):.0f} ms")
+        st.dataframe(pd.DataFrame(rerun_perf.rows()), hide_index=True, use_container_width=True)
+        st.markdown("**This session**")
+        st.dataframe(pd.DataFrame(session_perf.rows()), hide_index=True, use_container_width=True)
@@ -0,0 +1,54 @@
+"""Template picker lookups: boolean masks vs the precomputed library index.
+
+Run from the repo root:  python benchmarks/bench_library_index.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generators import make_library  # noqa: E402
+from ironos.library import build_library_index  # noqa: E402
+
+ROWS = 100_000
+LOOKUPS = 200
+
+
+def mask_lookup(df_lib, t, w, d):
+    weeks = sorted(df_lib[df_lib['Template'] == t]['Week'].dropna().unique())
+    days = sorted(df_lib[(df_lib['Template'] == t) & (df_lib['Week'] == w)]['Day'].dropna().unique())
+    rows = df_lib[(df_lib['Template'] == t) & (df_lib['Week'] == w) & (df_lib['Day'] == d)]
+    return weeks, days, rows
+
+
+def index_lookup(index, t, w, d):
+    return index.weeks(t), index.days(t, w), index.rows(t, w, d)
+
+
+def main():
+    df_lib = make_library(ROWS)
+    picks = df_lib.sample(LOOKUPS, random_state=0)[['Template', 'Week', 'Day']].values.tolist()
+
+    start = time.perf_counter()
+    index = build_library_index(df_lib)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for t, w, d in picks:
+        mask_lookup(df_lib, t, w, d)
+    mask_ms = (time.perf_counter() - start) * 1000 / LOOKUPS
+
+    start = time.perf_counter()
+    for t, w, d in picks:
+        index_lookup(index, t, w, d)
+    index_ms = (time.perf_counter() - start) * 1000 / LOOKUPS
+
+    print(f"library rows:       {ROWS}")
+    print(f"index build:        {build_ms:.1f} ms (once per load)")
+    print(f"mask lookup:        {mask_ms:.3f} ms per picker interaction")
+    print(f"index lookup:       {index_ms:.4f} ms per picker interaction")
+
+
+if __name__ == "__main__":
+    main()
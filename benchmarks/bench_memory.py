@@ -0,0 +1,98 @@
+"""Process memory for many concurrent sessions: shared library vs per-session copies.
+
+Simulates N sessions, each with its own athlete, loading the library,
+compiling one day and holding an active workout, the way Streamlit keeps
+them alive between reruns. "shared" uses the app's process-wide plan,
+catalog and sheet cache with a per-athlete overlay; "copied" gives every
+session its own frames, index, plan and catalog. Memory is measured with
+tracemalloc (numpy and pandas buffers included).
+
+Run from the repo root:  python benchmarks/bench_memory.py --sessions 200
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeConnection  # noqa: E402
+from benchmarks.generators import make_sheets  # noqa: E402
+from ironos.catalog import ExerciseCatalog, get_catalog  # noqa: E402
+from ironos.library import CompiledLibrary, LibraryIndex, LibraryPlan, build_library_index, compile_library  # noqa: E402
+from ironos.lifts import profile_for  # noqa: E402
+from ironos.loader import SheetLoader  # noqa: E402
+from ironos.storage import GSheetsStorage  # noqa: E402
+from ironos.workout import WorkoutSession  # noqa: E402
+
+
+def with_athletes(sheets, athletes, lifts_each=10, seed=0):
+    """Profile with shared rows plus a few personal maxes per athlete"""
+    rng = np.random.default_rng(seed)
+    shared = sheets['Profile'].assign(Athlete="")
+    own = [
+        shared.sample(min(lifts_each, len(shared)), random_state=i).assign(
+            Athlete=f"athlete{i}", Max=(rng.integers(20, 120, min(lifts_each, len(shared))) * 5).astype(str))
+        for i in range(athletes)
+    ]
+    return dict(sheets, Profile=pd.concat([shared] + own, ignore_index=True))
+
+
+def shared_session(loader, athlete, pick):
+    sheets = loader.load(["Master", "Profile"])
+    index = build_library_index(sheets["Master"].frame, sheets["Master"].version)
+    catalog = get_catalog(index, sheets["Profile"].frame, loader.get("Directory").frame)
+    profile = profile_for(sheets["Profile"].frame, athlete)
+    compiled = compile_library(index, profile)
+    return {"profile": profile, "compiled": compiled, "catalog": catalog,
+            "workout": WorkoutSession(compiled.workout(*pick))}
+
+
+def copied_session(loader, athlete, pick):
+    sheets = loader.load(["Master", "Profile"])
+    master = sheets["Master"].frame.copy(deep=True)
+    directory = loader.get("Directory").frame.copy(deep=True)
+    index = LibraryIndex(master)
+    catalog = ExerciseCatalog(directory['Exercise'].tolist() + master['Exercise'].dropna().tolist())
+    profile = profile_for(sheets["Profile"].frame, athlete).copy(deep=True)
+    compiled = CompiledLibrary(LibraryPlan(index), profile)
+    return {"frames": (master, directory), "profile": profile, "compiled": compiled, "catalog": catalog,
+            "workout": WorkoutSession(compiled.workout(*pick))}
+
+
+def measure(sheets, sessions, build):
+    loader = SheetLoader(GSheetsStorage(FakeConnection(sheets)))
+    loader.load(["Master", "Profile", "Directory"])
+    index = build_library_index(loader.get("Master").frame, loader.get("Master").version)
+    picks = index.frame[['Template', 'Week', 'Day']].drop_duplicates().values.tolist()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    alive = [build(loader, f"athlete{i}", picks[i % len(picks)]) for i in range(sessions)]
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del alive
+    return (current - before) / 2 ** 20, (peak - before) / 2 ** 20, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=["realistic", "extreme"], default="realistic")
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    sheets = with_athletes(make_sheets(args.size), args.sessions)
+    print(f"{'mode':>8} {'held MB':>9} {'peak MB':>9} {'KB/session':>11} {'seconds':>8}")
+    for name, build in (("shared", shared_session), ("copied", copied_session)):
+        held, peak, elapsed = measure(sheets, args.sessions, build)
+        print(f"{name:>8} {held:>9.1f} {peak:>9.1f} {held * 1024 / args.sessions:>11.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
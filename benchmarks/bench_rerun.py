@@ -0,0 +1,62 @@
+"""Rerun cost of one RPE edit: whole page vs the edited exercise's fragment.
+
+Drives app.py headlessly with Streamlit's AppTest on the in-memory backend,
+with an 8 exercise x 5 set workout loaded. A full script run is what every
+keystroke cost before the cards became fragments; the card's own render
+time (the render.card timing) is what a fragment rerun executes now.
+
+Run from the repo root:  python benchmarks/bench_rerun.py
+"""
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+EXERCISES = 8
+SETS = 5
+REPEATS = 20
+
+
+def make_workout():
+    return [{
+        "Category": "Main",
+        "Exercise": f"Exercise {i + 1}",
+        "Sets": SETS,
+        "Rep_List": ["5"] * SETS,
+        "Guide_List": [100 + 5 * s for s in range(SETS)],
+        "Meta": {"Template": "Bench", "Week": "1", "Day": "1"},
+    } for i in range(EXERCISES)]
+
+
+def input_key(session, field, i, s):
+    """Same widget key scheme as app.input_key"""
+    return f"{field}_{session.workout_id[:8]}_{i}_{session.logs[i].rev}_{s}"
+
+
+def main():
+    os.environ["IRONOS_STORAGE"] = "memory"
+    at = AppTest.from_file(APP, default_timeout=60)
+    # The first run restores (or clears) the session from its snapshot; queue the workout after it
+    at.run()
+    at.session_state.workout_queue = make_workout()
+    at.run()
+    session = at.session_state.workout
+
+    full_ms, card_ms = [], []
+    for n in range(REPEATS):
+        at.session_state["perf_session"].clear()
+        at.number_input(key=input_key(session, "rpe", 0, 0)).set_value(float(n % 10))
+        start = time.perf_counter()
+        at.run()
+        full_ms.append((time.perf_counter() - start) * 1000)
+        card_ms.append(max(r["max_ms"] for r in at.session_state["perf_session"].rows() if r["name"] == "render.card"))
+    assert session.logs[0].rpe[0] == float((REPEATS - 1) % 10), "the edit did not reach the workout"
+
+    print(f"workout:                    {EXERCISES} exercises x {SETS} sets")
+    print(f"full-page rerun (before):   {statistics.median(full_ms):.1f} ms median")
+    print(f"single card fragment (now): {statistics.median(card_ms):.1f} ms median (worst card per rerun)")
+
+if __name__ == "__main__":
+    main()
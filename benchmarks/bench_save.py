@@ -0,0 +1,47 @@
+"""Save Workout latency as Logs grows: full rewrite vs append-only.
+
+Run from the repo root:  python benchmarks/bench_save.py
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeConnection  # noqa: E402
+from benchmarks.generators import make_logs  # noqa: E402
+from ironos.storage import LOG_COLUMNS, GSheetsStorage  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+REPEATS = 5
+
+
+def new_workout():
+    return pd.DataFrame([
+        {'Date': '2026-01-01', 'Exercise': 'Squat', 'Set': s + 1, 'Weight': 100.0, 'Reps': 5, 'RPE': 8.0}
+        for s in range(20)
+    ], columns=LOG_COLUMNS)
+
+
+def timed(fn, df):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn("Logs", df)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print(f"{'rows':>10} {'rewrite ms':>12} {'append ms':>12}")
+    for n in SIZES:
+        history = make_logs(n)
+        rewrite_ms = timed(GSheetsStorage(FakeConnection({'Logs': history})).rewrite, new_workout())
+        append_ms = timed(GSheetsStorage(FakeConnection({'Logs': history})).append, new_workout())
+        print(f"{n:>10} {rewrite_ms:>12.2f} {append_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Static-sheet loads through the Sheets API client against the local fake server.
+
+Every simulated session loads Master, Profile, Directory and Logs, either
+with one request per worksheet or with one batched read, while many
+sessions run at once. Reports requests sent, peak concurrency at the
+server, throughput and per-load latency. Needs httpx.
+
+Run from the repo root:  python benchmarks/bench_sheets_api.py --sessions 50 --latency 0.08
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_sheets_api import FakeSheetsServer  # noqa: E402
+from benchmarks.generators import make_sheets  # noqa: E402
+from ironos.sheets_api import SheetsAPIStorage, SheetsClient  # noqa: E402
+
+WORKSHEETS = ["Master", "Profile", "Directory", "Logs"]
+
+
+def run(server, sessions, loads, batched, max_concurrency):
+    client = SheetsClient("fake", base_url=server.url, drive_url=server.url,
+                          max_concurrency=max_concurrency, batch_window=0.005 if batched else 0.0)
+    storage = SheetsAPIStorage(client)
+    server.reset_stats()
+    latencies = []
+
+    def session(_):
+        for _ in range(loads):
+            start = time.perf_counter()
+            if batched:
+                storage.read_many(WORKSHEETS)
+            else:
+                for worksheet in WORKSHEETS:
+                    storage.read(worksheet)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(session, range(sessions)))
+    elapsed = time.perf_counter() - start
+    client.close()
+
+    stats = server.stats()
+    latencies.sort()
+    return {
+        "mode": "batched" if batched else "per-sheet",
+        "requests": stats["total"],
+        "peak_in_flight": stats["peak_in_flight"],
+        "loads_per_s": round(sessions * loads / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=["realistic", "extreme"], default="realistic")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--loads", type=int, default=3, help="loads per session")
+    parser.add_argument("--latency", type=float, default=0.08, help="seconds added to every request")
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    sheets = make_sheets(args.size)
+    server = FakeSheetsServer({ws: sheets[ws] for ws in WORKSHEETS}, latency=args.latency).start()
+    try:
+        print(f"{'mode':>10} {'requests':>9} {'peak':>5} {'loads/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for batched in (False, True):
+            r = run(server, args.sessions, args.loads, batched, args.max_concurrency)
+            print(f"{r['mode']:>10} {r['requests']:>9} {r['peak_in_flight']:>5} "
+                  f"{r['loads_per_s']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
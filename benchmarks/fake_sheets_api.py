@@ -0,0 +1,169 @@
+"""Local stand-in for the Google Sheets v4 REST API (plus Drive modifiedTime).
+
+Serves the endpoints SheetsClient uses from in-memory worksheets, with an
+optional per-request latency, and counts requests and peak concurrency so
+benchmarks can compare batched and unbatched access offline.
+
+    server = FakeSheetsServer(make_sheets("realistic"), latency=0.05)
+    server.start()
+    client = SheetsClient("fake", base_url=server.url, drive_url=server.url)
+"""
+import json
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+_CELL = re.compile(r"([A-Z]*)(\d*)")
+
+
+def parse_range(name):
+    """('Sheet', first_row, last_row) from A1 notation; rows are 1-based and None when open"""
+    sheet, _, cells = name.partition("!")
+    if sheet.startswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    if not cells:
+        return sheet, 1, None
+    start, _, stop = cells.partition(":")
+    first = _CELL.fullmatch(start).group(2)
+    last = _CELL.fullmatch(stop).group(2) if stop else first
+    return sheet, int(first) if first else 1, int(last) if last else None
+
+
+class FakeSheetsServer:
+    """Threaded HTTP server holding worksheets as lists of string rows"""
+
+    def __init__(self, frames=None, latency=0.0, host="127.0.0.1", port=0):
+        self.sheets = {
+            name: [list(map(str, df.columns))] + df.astype(str).where(df.notna(), "").values.tolist()
+            for name, df in (frames or {}).items()
+        }
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.in_flight = 0
+        self.peak = 0
+        self.modified = time.time()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, name="fake-sheets-api", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self):
+        with self.lock:
+            return {"requests": dict(self.requests), "total": sum(self.requests.values()), "peak_in_flight": self.peak}
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.peak = 0
+
+    # ==========================================
+    # OPERATIONS
+    # ==========================================
+    def get(self, name):
+        sheet, first, last = parse_range(name)
+        if sheet not in self.sheets:
+            raise KeyError(f"Unable to parse range: {name}")
+        rows = self.sheets[sheet]
+        return {"range": name, "majorDimension": "ROWS",
+                "values": rows[first - 1:last] if last is not None else rows[first - 1:]}
+
+    def append(self, name, values):
+        sheet, _, _ = parse_range(name)
+        if sheet not in self.sheets:
+            raise KeyError(f"Unable to parse range: {name}")
+        self.sheets[sheet].extend([list(map(str, row)) for row in values])
+        self.modified = time.time()
+        return {"updates": {"updatedRows": len(values)}}
+
+    def clear(self, name):
+        sheet, _, _ = parse_range(name)
+        self.sheets[sheet] = []
+        self.modified = time.time()
+        return {}
+
+    def put(self, name, values):
+        sheet, _, _ = parse_range(name)
+        self.sheets[sheet] = [list(map(str, row)) for row in values]
+        self.modified = time.time()
+        return {"updatedRows": len(values)}
+
+    def batch_update(self, body):
+        for request in body.get("requests", []):
+            title = request.get("addSheet", {}).get("properties", {}).get("title")
+            if title:
+                self.sheets.setdefault(title, [])
+        self.modified = time.time()
+        return {}
+
+    def modified_time(self):
+        return {"modifiedTime": datetime.fromtimestamp(self.modified, timezone.utc).isoformat()}
+
+    def dispatch(self, method, path, query, body):
+        """(kind, response) for one API call"""
+        if path.startswith("/drive/v3/files/"):
+            return "drive", self.modified_time()
+        if path.endswith("/values:batchGet"):
+            return "batchGet", {"valueRanges": [self.get(name) for name in query.get("ranges", [])]}
+        if path.endswith(":batchUpdate"):
+            return "batchUpdate", self.batch_update(body)
+        name = unquote(path.split("/values/", 1)[1])
+        if method == "POST" and name.endswith(":append"):
+            return "append", self.append(name[:-len(":append")], body.get("values", []))
+        if method == "POST" and name.endswith(":clear"):
+            return "clear", self.clear(name[:-len(":clear")])
+        if method == "PUT":
+            return "update", self.put(name, body.get("values", []))
+        if method == "GET":
+            return "get", self.get(name)
+        raise KeyError(path)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def _serve(self):
+                with server.lock:
+                    server.in_flight += 1
+                    server.peak = max(server.peak, server.in_flight)
+                try:
+                    if server.latency:
+                        time.sleep(server.latency)
+                    url = urlsplit(self.path)
+                    length = int(self.headers.get("Content-Length") or 0)
+                    body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                    with server.lock:
+                        kind, payload = server.dispatch(self.command, url.path, parse_qs(url.query), body)
+                        server.requests[kind] += 1
+                    status = 200
+                except (KeyError, ValueError) as e:
+                    status, payload = 400, {"error": {"code": 400, "message": str(e)}}
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
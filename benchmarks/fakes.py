@@ -0,0 +1,74 @@
+"""In-memory stand-in for GSheetsConnection and its gspread client"""
+import time
+
+import pandas as pd
+
+
+class FakeWorksheet:
+    """gspread-like worksheet holding rows as lists"""
+
+    def __init__(self, title, frame=None, spreadsheet=None):
+        self.title = title
+        self.spreadsheet = spreadsheet
+        self.rows = [list(frame.columns)] + frame.values.tolist() if frame is not None else []
+
+    def row_values(self, n):
+        return list(self.rows[n - 1]) if len(self.rows) >= n else []
+
+    def get_values(self, range_name):
+        start = int(''.join(ch for ch in range_name.split(':')[0] if ch.isdigit()))
+        return [list(map(str, row)) for row in self.rows[start - 1:]]
+
+    def append_rows(self, values, value_input_option=None):
+        self.rows.extend(values)
+        if self.spreadsheet is not None:
+            self.spreadsheet.updated = time.time()
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheets):
+        self.sheets = sheets
+        self.updated = time.time()
+        for ws in sheets.values():
+            ws.spreadsheet = self
+
+    def worksheet(self, title):
+        if title not in self.sheets:
+            raise WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title, rows=1000, cols=26):
+        self.sheets[title] = FakeWorksheet(title, spreadsheet=self)
+        return self.sheets[title]
+
+    def get_lastUpdateTime(self):
+        return self.updated
+
+
+class WorksheetNotFound(Exception):
+    pass
+
+
+class FakeConnection:
+    """Mimics GSheetsConnection: read/update move the whole sheet, like the API does"""
+
+    def __init__(self, frames, latency=0.0):
+        self.latency = latency
+        self.spreadsheet = FakeSpreadsheet({name: FakeWorksheet(name, df) for name, df in frames.items()})
+        self.client = self
+
+    def _open_spreadsheet(self):
+        time.sleep(self.latency)
+        return self.spreadsheet
+
+    def read(self, worksheet, ttl=0, dtype=None):
+        time.sleep(self.latency)
+        rows = self.spreadsheet.worksheet(worksheet).rows
+        df = pd.DataFrame(rows[1:], columns=rows[0] if rows else [])
+        return df.astype(str) if dtype is str else df
+
+    def update(self, worksheet, data):
+        time.sleep(self.latency)
+        ws = self.spreadsheet.sheets.setdefault(worksheet, FakeWorksheet(worksheet, spreadsheet=self.spreadsheet))
+        ws.rows = [list(data.columns)] + data.values.tolist()
+        self.spreadsheet.updated = time.time()
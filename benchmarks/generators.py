@@ -0,0 +1,83 @@
+"""Synthetic Master, Profile, Directory and Logs sheets for benchmarks.
+
+Frames come back as strings, the way the sheets are read with dtype=str.
+"""
+import numpy as np
+import pandas as pd
+
+from ironos.catalog import normalize_name
+from ironos.storage import LOG_COLUMNS, WORKSHEETS
+
+LIFTS = ['Squat', 'Bench Press', 'Deadlift', 'Overhead Press', 'Row', 'Front Squat',
+         'Close Grip Bench Press', 'Romanian Deadlift', 'Pull Up', 'Dip']
+VARIANTS = ['', 'Paused ', 'Tempo ', 'Pin ', 'Deficit ', 'Box ', 'Banded ', 'Single Arm ']
+
+SIZES = {
+    'realistic': {'library': 5_000, 'profile': 40, 'directory': 500, 'logs': 50_000},
+    'extreme': {'library': 100_000, 'profile': 400, 'directory': 20_000, 'logs': 1_000_000},
+}
+
+
+def exercise_names(n, seed=0):
+    rng = np.random.default_rng(seed)
+    base = [v + lift for v in VARIANTS for lift in LIFTS]
+    extra = [f"{rng.choice(VARIANTS)}{rng.choice(LIFTS)} {i}" for i in range(max(n - len(base), 0))]
+    return (base + extra)[:n]
+
+
+def make_library(n, templates=None, seed=0):
+    """Programs of 12 weeks x 4 days with ~6 exercises per day"""
+    rng = np.random.default_rng(seed)
+    templates = templates or max(n // (12 * 4 * 6), 1)
+    names = exercise_names(200, seed)
+    sets = rng.integers(3, 6, n)
+    pct = np.round(rng.uniform(0.6, 0.9, n), 2)
+    return pd.DataFrame({
+        'Template': [f"Program {t}" for t in rng.integers(0, templates, n)],
+        'Week': rng.integers(1, 13, n).astype(str),
+        'Day': rng.integers(1, 5, n).astype(str),
+        'Exercise': rng.choice(names, n),
+        'Sets': sets.astype(str),
+        'Reps': np.where(rng.random(n) < 0.5, "5", "5,5,3,3,1,1"),
+        'Pct': [f"{p},{p + 0.05:.2f},{p + 0.1:.2f}" for p in pct],
+        'Category': rng.choice(['Main', 'Secondary', 'Accessory'], n),
+    }, columns=WORKSHEETS['Master'])
+
+
+def make_profile(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Lift': exercise_names(n, seed),
+        'Max': (rng.integers(20, 120, n) * 5).astype(str),
+    }, columns=WORKSHEETS['Profile'])
+
+
+def make_directory(n, seed=0):
+    return pd.DataFrame({'Exercise': exercise_names(n, seed)}, columns=WORKSHEETS['Directory'])
+
+
+def make_logs(n, seed=0, end="2026-10-01"):
+    """n logged sets spread over roughly five years, oldest first"""
+    rng = np.random.default_rng(seed)
+    dates = pd.to_datetime(end) - pd.to_timedelta(np.sort(rng.integers(0, 5 * 365, n))[::-1], unit='D')
+    exercise = pd.Series(rng.choice(LIFTS, n))
+    return pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Exercise': exercise,
+        'ExerciseId': exercise.map(normalize_name),
+        'Set': rng.integers(1, 6, n).astype(str),
+        'Weight': (rng.integers(20, 200, n) * 5.0).astype(str),
+        'Reps': rng.integers(1, 12, n).astype(str),
+        'RPE': (rng.integers(12, 20, n) / 2).astype(str),
+        'Key': [f"{i:016x}" for i in range(n)],
+    }, columns=LOG_COLUMNS)
+
+
+def make_sheets(size='realistic', seed=0):
+    n = SIZES[size]
+    return {
+        'Master': make_library(n['library'], seed=seed),
+        'Profile': make_profile(n['profile'], seed),
+        'Directory': make_directory(n['directory'], seed),
+        'Logs': make_logs(n['logs'], seed),
+    }
@@ -0,0 +1,155 @@
+"""Concurrent Save Workout load test: every logged set must arrive exactly once.
+
+Runs P processes x T sessions. Each process has one journal and one sync
+worker, as the app does per Streamlit server. Every session saves W
+workouts of 8 exercises x 5 sets for its own athlete. The sessions write
+to one shared local SQLite backend (or, with --backend gsheets and a
+single process, the in-memory Google Sheets stand-in). --fail-rate makes
+appends fail before or after writing, so idempotent retries are tested
+too.
+
+    python benchmarks/load_test.py --processes 4 --sessions 12 --workouts 5 --fail-rate 0.2
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeConnection  # noqa: E402
+from ironos.storage import LOG_COLUMNS, GSheetsStorage, SQLiteStorage, Storage  # noqa: E402
+from ironos.sync import SaveJournal, SyncWorker, set_key  # noqa: E402
+
+EXERCISES = 8
+SETS = 5
+
+
+class FlakyStorage(Storage):
+    """Fails a share of appends, half of them after the rows already landed"""
+
+    def __init__(self, inner, fail_rate, seed):
+        self.inner = inner
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def read(self, worksheet):
+        return self.inner.read(worksheet)
+
+    def query(self, worksheet, **filters):
+        return self.inner.query(worksheet, **filters)
+
+    def append(self, worksheet, data):
+        with self.lock:
+            roll = self.rng.random()
+        if roll < self.fail_rate / 2:
+            raise ConnectionError("injected failure before write")
+        written = self.inner.append(worksheet, data)
+        if roll < self.fail_rate:
+            raise ConnectionError("injected failure after write")
+        return written
+
+
+def workout_rows(athlete):
+    workout_id = uuid.uuid4().hex
+    return pd.DataFrame([{
+        "Date": time.strftime("%Y-%m-%d"),
+        "Athlete": athlete,
+        "Exercise": f"Exercise {e}",
+        "Set": s + 1,
+        "Weight": 100.0 + s * 5,
+        "Reps": 5,
+        "RPE": 8.0,
+        "Key": set_key(workout_id, f"{e}:Exercise {e}", s + 1),
+    } for e in range(EXERCISES) for s in range(SETS)], columns=LOG_COLUMNS)
+
+
+def run_process(proc, storage, args, tmp):
+    """One server process: shared journal + worker, T concurrent sessions"""
+    journal = SaveJournal(os.path.join(tmp, f"journal_{proc}.db"))
+    if args.fail_rate:
+        storage = FlakyStorage(storage, args.fail_rate, seed=proc)
+    worker = SyncWorker(journal, storage, base_delay=0.05, max_delay=1.0, poll=0.05)
+    worker.start()
+
+    def session(t):
+        for _ in range(args.workouts):
+            rows = workout_rows(f"athlete-{proc}-{t}")
+            journal.enqueue("Logs", rows)
+            worker.wake()
+
+    threads = [threading.Thread(target=session, args=(t,)) for t in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    deadline = time.monotonic() + args.timeout
+    while journal.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    worker.stop()
+    return journal.pending_count()
+
+
+def sqlite_process(proc, path, args, tmp, results):
+    results.put(run_process(proc, SQLiteStorage(path), args, tmp))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["sqlite", "gsheets"], default="sqlite")
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--workouts", type=int, default=3)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args(argv)
+
+    total = args.processes * args.sessions * args.workouts * EXERCISES * SETS
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.backend == "gsheets":
+            if args.processes != 1:
+                parser.error("the Google Sheets stand-in lives in memory; use --processes 1")
+            conn = FakeConnection({"Logs": pd.DataFrame(columns=LOG_COLUMNS)})
+            pending = run_process(0, GSheetsStorage(conn), args, tmp)
+            logs = conn.read(worksheet="Logs")
+        else:
+            path = os.path.join(tmp, "ironos.db")
+            SQLiteStorage(path)
+            results = multiprocessing.Queue()
+            procs = [
+                multiprocessing.Process(target=sqlite_process, args=(p, path, args, tmp, results))
+                for p in range(args.processes)
+            ]
+            for proc in procs:
+                proc.start()
+            pending = sum(results.get() for _ in procs)
+            for proc in procs:
+                proc.join()
+            logs = SQLiteStorage(path).read("Logs")
+    elapsed = time.perf_counter() - start
+
+    keys = logs["Key"]
+    duplicates = int(keys.duplicated().sum())
+    print(f"backend:     {args.backend}")
+    print(f"sessions:    {args.processes} processes x {args.sessions} sessions x {args.workouts} workouts")
+    print(f"expected:    {total} sets")
+    print(f"arrived:     {keys.nunique()} unique sets, {duplicates} duplicates, {pending} still pending")
+    print(f"elapsed:     {elapsed:.2f} s ({total / elapsed:.0f} sets/s)")
+
+    ok = keys.nunique() == total and duplicates == 0 and pending == 0
+    print("OK" if ok else "FAILED: lost or duplicated rows")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
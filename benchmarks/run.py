@@ -0,0 +1,264 @@
+"""Headless benchmark suite for the IronOS hot paths.
+
+Builds synthetic sheets, serves them through an in-memory stand-in for
+GSheetsConnection, and times each hot path. Results are printed as JSON;
+with --check the run fails when a timing exceeds its threshold in
+benchmarks/thresholds.json.
+
+    python benchmarks/run.py --size realistic --check
+    python benchmarks/run.py --size extreme --output bench.json
+    python benchmarks/run.py --size realistic --update-thresholds
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fakes import FakeConnection  # noqa: E402
+from benchmarks.generators import make_sheets  # noqa: E402
+from ironos.library import CompiledLibrary, LibraryIndex, LibraryPlan, build_library_index  # noqa: E402
+from ironos.lifts import LiftResolver  # noqa: E402
+from ironos.loader import PREPARE, SheetLoader  # noqa: E402
+from ironos.prefetch import prefetch, prefetched_workout  # noqa: E402
+from ironos.snapshots import SnapshotStore  # noqa: E402
+from ironos.storage import LOG_COLUMNS, GSheetsStorage  # noqa: E402
+from ironos.sync import SaveJournal, SyncWorker, set_key  # noqa: E402
+from ironos.workout import WorkoutSession, parse_multi_value  # noqa: E402
+
+THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+BENCHMARKS = []
+
+
+def benchmark(fn):
+    BENCHMARKS.append(fn)
+    return fn
+
+
+def best_of(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+class Context:
+    """Sheets, fake connection and derived structures shared by the benchmarks"""
+
+    def __init__(self, size, repeats):
+        self.size = size
+        self.repeats = repeats
+        self.sheets = make_sheets(size)
+        self.df_lib, _ = PREPARE['Master'](self.sheets['Master'])
+        self.df_profile, _ = PREPARE['Profile'](self.sheets['Profile'])
+        self.index = build_library_index(self.df_lib)
+        picks = self.index.frame[['Template', 'Week', 'Day']].drop_duplicates()
+        self.picks = picks.sample(min(50, len(picks)), random_state=0).values.tolist()
+        self.conn = FakeConnection(self.sheets)
+
+    def storage(self):
+        return GSheetsStorage(self.conn)
+
+
+# ==========================================
+# BENCHMARKS
+# ==========================================
+@benchmark
+def load_static_data_cold(ctx):
+    def run():
+        loader = SheetLoader(ctx.storage())
+        sheets = loader.load(["Master", "Profile"])
+        LibraryIndex(sheets["Master"].frame, sheets["Master"].version)
+    return best_of(run, ctx.repeats)
+
+
+@benchmark
+def load_static_data_warm(ctx):
+    loader = SheetLoader(ctx.storage(), check_interval=0)
+    loader.load(["Master", "Profile"])
+    return best_of(lambda: loader.load(["Master", "Profile"]), ctx.repeats)
+
+
+@benchmark
+def coerce_master(ctx):
+    return best_of(lambda: PREPARE['Master'](ctx.sheets['Master']), ctx.repeats)
+
+
+@benchmark
+def template_filter_mask(ctx):
+    df = ctx.df_lib
+
+    def run():
+        for t, w, d in ctx.picks:
+            sorted(df[df['Template'] == t]['Week'].dropna().unique())
+            sorted(df[(df['Template'] == t) & (df['Week'] == w)]['Day'].dropna().unique())
+            df[(df['Template'] == t) & (df['Week'] == w) & (df['Day'] == d)]
+    return best_of(run, ctx.repeats) / len(ctx.picks)
+
+
+@benchmark
+def template_filter_index(ctx):
+    def run():
+        for t, w, d in ctx.picks:
+            ctx.index.weeks(t)
+            ctx.index.days(t, w)
+            ctx.index.rows(t, w, d)
+    return best_of(run, ctx.repeats) / len(ctx.picks)
+
+
+@benchmark
+def get_profile_max(ctx):
+    names = ctx.df_lib['Exercise'].dropna().unique().tolist()
+
+    def run():
+        resolver = LiftResolver(ctx.df_profile)
+        for name in names:
+            resolver.max_for(name)
+    return best_of(run, ctx.repeats)
+
+
+@benchmark
+def parse_multi_value_rows(ctx):
+    rows = ctx.df_lib[['Sets', 'Reps', 'Pct']].head(5_000).values.tolist()
+
+    def run():
+        for sets, reps, pct in rows:
+            n = int(float(sets))
+            parse_multi_value(pct, n, is_number=True)
+            parse_multi_value(reps, n, is_number=False)
+    return best_of(run, ctx.repeats) * len(ctx.df_lib) / len(rows)
+
+
+@benchmark
+def compile_library(ctx):
+    return best_of(lambda: LibraryPlan(ctx.index), ctx.repeats)
+
+
+@benchmark
+def athlete_overlay(ctx):
+    plan = LibraryPlan(ctx.index)
+    return best_of(lambda: CompiledLibrary(plan, ctx.df_profile), ctx.repeats)
+
+
+@benchmark
+def load_workout_prefetched(ctx):
+    prefetch(ctx.index, ctx.df_profile, ctx.picks)
+    prefetched_workout(ctx.index, ctx.df_profile, ctx.picks[-1])
+
+    def run():
+        for pick in ctx.picks:
+            prefetched_workout(ctx.index, ctx.df_profile, pick)
+    return best_of(run, ctx.repeats) / len(ctx.picks)
+
+
+@benchmark
+def fill_and_collect(ctx):
+    session = WorkoutSession(CompiledLibrary(LibraryPlan(ctx.index), ctx.df_profile).workout(*ctx.picks[0]))
+
+    def run():
+        session.fill()
+        session.logs_frame("2026-10-01")
+    return best_of(run, ctx.repeats)
+
+
+@benchmark
+def snapshot_edit(ctx):
+    session = WorkoutSession(CompiledLibrary(LibraryPlan(ctx.index), ctx.df_profile).workout(*ctx.picks[0]))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SnapshotStore(os.path.join(tmp, "snapshots.db"))
+        store.put_session("bench", "2026-10-01", session.workout_id, session.plan, [])
+
+        def run():
+            # One input change per set, flushed together as the writer thread would
+            for i, log in enumerate(session.logs):
+                for _ in range(log.sets):
+                    store.put_exercise("bench", "2026-10-01", session.workout_id, i, log)
+            store.flush()
+        edits = sum(log.sets for log in session.logs) or 1
+        return best_of(run, ctx.repeats) / edits
+
+
+@benchmark
+def save_workout(ctx):
+    storage = ctx.storage()
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SaveJournal(os.path.join(tmp, "journal.db"))
+        worker = SyncWorker(journal, storage)
+        counter = iter(range(10 ** 9))
+
+        def run():
+            workout_id = next(counter)
+            logs = pd.DataFrame([{
+                "Date": "2026-10-01", "Exercise": f"Exercise {e}", "Set": s + 1,
+                "Weight": 100.0, "Reps": 5, "RPE": 8.0,
+                "Key": set_key(workout_id, e, s + 1),
+            } for e in range(8) for s in range(5)], columns=LOG_COLUMNS)
+            journal.enqueue("Logs", logs)
+            worker.flush_once()
+        return best_of(run, ctx.repeats)
+
+
+# ==========================================
+# RUNNER
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=["realistic", "extreme"], default="realistic")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any threshold is exceeded")
+    parser.add_argument("--update-thresholds", action="store_true",
+                        help="record 1.5x the current timings as the thresholds for this size")
+    args = parser.parse_args(argv)
+
+    ctx = Context(args.size, args.repeats)
+    try:
+        with open(THRESHOLDS) as f:
+            thresholds = json.load(f)
+    except (OSError, ValueError):
+        thresholds = {}
+    limits = thresholds.get(args.size, {})
+
+    results = []
+    for fn in BENCHMARKS:
+        ms = fn(ctx)
+        limit = limits.get(fn.__name__)
+        results.append({
+            "name": fn.__name__,
+            "size": args.size,
+            "ms": round(ms, 3),
+            "threshold_ms": limit,
+            "ok": limit is None or ms <= limit,
+        })
+        print(f"{fn.__name__:<28} {ms:>10.3f} ms", file=sys.stderr)
+
+    report = json.dumps({"size": args.size, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    else:
+        print(report)
+
+    if args.update_thresholds:
+        thresholds[args.size] = {r["name"]: round(r["ms"] * 1.5, 3) for r in results}
+        with open(THRESHOLDS, "w") as f:
+            json.dump(thresholds, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    failed = [r["name"] for r in results if not r["ok"]]
+    if args.check and failed:
+        print(f"Regressions: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
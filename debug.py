@@ -1,15 +1,19 @@
 import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 
+from ironos import perf
+
 st.title("🔌 Connection Test")
 
 try:
-    conn = st.connection("gsheets", type=GSheetsConnection)
+    with perf.timed("connect"):
+        conn = st.connection("gsheets", type=GSheetsConnection)
     st.write("✅ Connection Object Created")
     
     # Try to read just one tab (Library)
     st.write("⏳ Attempting to read 'Library' tab...")
-    df = conn.read(worksheet="Library")
+    with perf.timed("conn.read", worksheet="Library"):
+        df = conn.read(worksheet="Library")
     
     st.success("🎉 Success! Data found:")
     st.dataframe(df)
@@ -18,3 +22,10 @@ except Exception as e:
     st.error(f"❌ Failed: {e}")
     st.write("Check your secrets.toml formatting.")
     st.code(st.secrets.to_dict()) # This helps debug what Streamlit actually sees
+
+# Timings from this run (and anything else this process has measured)
+with st.sidebar:
+    st.markdown("### ⏱️ Timings")
+    st.dataframe(perf.PROCESS.rows(), hide_index=True)
+    with st.expander("Prometheus text"):
+        st.code(perf.render_prometheus(), language="text")
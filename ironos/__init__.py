@@ -0,0 +1,35 @@
+"""IronOS core: data access and workout logic shared by the Streamlit app and the CLI.
+
+Importing the package is cheap: submodules (and pandas) load the first
+time one of the names below is used.
+"""
+import importlib
+
+_EXPORTS = {
+    'Rollups': 'ironos.analytics',
+    'ExerciseCatalog': 'ironos.catalog',
+    'normalize_name': 'ironos.catalog',
+    'build_storage': 'ironos.config',
+    'storage_settings': 'ironos.config',
+    'build_library_index': 'ironos.library',
+    'compile_library': 'ironos.library',
+    'get_resolver': 'ironos.lifts',
+    'profile_for': 'ironos.lifts',
+    'SheetLoader': 'ironos.loader',
+    'open_storage': 'ironos.storage',
+    'SaveJournal': 'ironos.sync',
+    'SyncWorker': 'ironos.sync',
+    'WorkoutSession': 'ironos.workout',
+    'parse_multi_value': 'ironos.workout',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'ironos' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,3 @@
+from ironos.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,265 @@
+"""Training analytics: per-athlete, per-exercise rollups kept up to date incrementally.
+
+Only additive or max-style aggregates (and each athlete's latest program
+day) are stored, so a batch of newly appended Logs rows can be folded in
+without revisiting history. Rows without an Athlete are rolled up under "".
+Exercises are keyed by canonical ID (``ExerciseId``, or the normalized
+name for rows logged without one), so "Bench Press" and "bench press"
+are one lift; the latest spelling is kept for display.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from ironos.catalog import normalize_name
+
+EXERCISE_COLUMNS = ['Exercise', 'Sets', 'Tonnage', 'Best_E1RM', 'Best_Weight', 'Best_Reps', 'Best_Date', 'Last_Date']
+WEEKLY_COLUMNS = ['Volume', 'Sets', 'Top_E1RM', 'RPE_Sum', 'RPE_Count']
+POSITION_COLUMNS = ['Date', 'Template', 'Week', 'Day']
+KEYS = ['Athlete', 'ExerciseId']
+FORMAT = 5
+
+
+def estimate_1rm(weight, reps):
+    """Epley estimate; a single is its own max"""
+    weight = np.asarray(weight, dtype=float)
+    reps = np.asarray(reps, dtype=float)
+    return np.where(reps > 1, weight * (1 + reps / 30.0), np.where(reps == 1, weight, 0.0))
+
+
+def _text(column):
+    """Stripped strings from a raw or categorical column, blanks for missing"""
+    return column.astype(object).fillna("").astype(str).str.strip()
+
+
+def _typed(logs):
+    """Numeric view of raw Logs rows (which are read as strings)"""
+    if logs.empty or not {'Date', 'Exercise', 'Weight', 'Reps'} <= set(logs.columns):
+        return pd.DataFrame(columns=['Date', 'Athlete', 'Exercise', 'ExerciseId', 'Weight', 'Reps', 'RPE'])
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(logs['Date'], errors='coerce'),
+        'Athlete': _text(logs['Athlete']) if 'Athlete' in logs.columns else "",
+        'Exercise': logs['Exercise'],
+        'ExerciseId': _text(logs['ExerciseId']) if 'ExerciseId' in logs.columns else "",
+        'Weight': pd.to_numeric(logs['Weight'], errors='coerce').fillna(0.0),
+        'Reps': pd.to_numeric(logs['Reps'], errors='coerce').fillna(0.0),
+        'RPE': pd.to_numeric(logs['RPE'], errors='coerce').fillna(0.0) if 'RPE' in logs.columns else 0.0,
+    })
+    df = df.dropna(subset=['Date', 'Exercise']).reset_index(drop=True)
+    df['Exercise'] = df['Exercise'].astype(str).str.strip()
+    # Rows logged before the ExerciseId column existed get their ID from the name
+    df['ExerciseId'] = df['ExerciseId'].where(df['ExerciseId'] != "", df['Exercise'].map(normalize_name))
+    df['E1RM'] = estimate_1rm(df['Weight'], df['Reps'])
+    df['Tonnage'] = df['Weight'] * df['Reps']
+    df['Week'] = df['Date'].dt.normalize() - pd.to_timedelta(df['Date'].dt.weekday, unit='D')
+    df['RPE_Logged'] = (df['RPE'] > 0).astype(int)
+    return df
+
+
+def _positions(logs):
+    """Last program day (Template/Week/Day) logged by each athlete in a batch of raw rows"""
+    if logs.empty or not set(POSITION_COLUMNS) <= set(logs.columns):
+        return pd.DataFrame(columns=POSITION_COLUMNS, index=pd.Index([], name='Athlete'))
+    df = pd.DataFrame({
+        'Athlete': _text(logs['Athlete']) if 'Athlete' in logs.columns else "",
+        'Date': pd.to_datetime(logs['Date'], errors='coerce'),
+        'Template': _text(logs['Template']),
+        'Week': _text(logs['Week']),
+        'Day': _text(logs['Day']),
+    })
+    # Custom workouts have no place in a program
+    df = df[df['Date'].notna() & ~df['Template'].isin(["", "Custom"])]
+    return _latest(df.set_index('Athlete'))
+
+
+def _latest(positions):
+    """One row per athlete: the latest date, later rows winning ties"""
+    ordered = positions.sort_values('Date', kind='mergesort')
+    return ordered[~ordered.index.duplicated(keep='last')][POSITION_COLUMNS]
+
+
+def _merge_exercises(old, new):
+    if old.empty:
+        return new
+    both = pd.concat([old, new])
+    totals = both.groupby(level=[0, 1]).agg(
+        Exercise=('Exercise', 'last'), Sets=('Sets', 'sum'), Tonnage=('Tonnage', 'sum'),
+        Last_Date=('Last_Date', 'max'),
+    )
+    best = both.sort_values('Best_E1RM', kind='mergesort').groupby(level=[0, 1]).tail(1)
+    return totals.join(best[['Best_E1RM', 'Best_Weight', 'Best_Reps', 'Best_Date']])[EXERCISE_COLUMNS]
+
+
+def _merge_weekly(old, new):
+    if old.empty:
+        return new
+    both = pd.concat([old, new])
+    return both.groupby(level=[0, 1, 2]).agg(
+        Volume=('Volume', 'sum'), Sets=('Sets', 'sum'), Top_E1RM=('Top_E1RM', 'max'),
+        RPE_Sum=('RPE_Sum', 'sum'), RPE_Count=('RPE_Count', 'sum'),
+    )
+
+
+class Rollups:
+    """Per-(athlete, exercise) and per-(athlete, exercise, week) aggregates over Logs.
+
+    ``cursor`` marks the Logs rows already folded in (see
+    ``Storage.changes``); since Logs is append-only, ``refresh`` only asks
+    the backend for rows added after it.
+    """
+
+    def __init__(self):
+        self.exercises = pd.DataFrame(columns=EXERCISE_COLUMNS)
+        self.weekly = pd.DataFrame(columns=WEEKLY_COLUMNS)
+        self.positions = pd.DataFrame(columns=POSITION_COLUMNS, index=pd.Index([], name='Athlete'))
+        self.cursor = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def fold(self, logs):
+        """Merge a batch of new raw log rows into the rollups"""
+        df = _typed(logs)
+        df = df[df['Weight'] > 0].reset_index(drop=True)
+        if not df.empty:
+            g = df.groupby(KEYS, sort=False)
+            batch = pd.DataFrame({
+                'Exercise': g['Exercise'].last(),
+                'Sets': g.size(),
+                'Tonnage': g['Tonnage'].sum(),
+                'Last_Date': g['Date'].max(),
+            })
+            best = df.loc[g['E1RM'].idxmax()].set_index(KEYS)
+            batch['Best_E1RM'] = best['E1RM']
+            batch['Best_Weight'] = best['Weight']
+            batch['Best_Reps'] = best['Reps']
+            batch['Best_Date'] = best['Date']
+            self.exercises = _merge_exercises(self.exercises, batch[EXERCISE_COLUMNS])
+
+            df['RPE_Sum'] = df['RPE'].where(df['RPE'] > 0, 0.0)
+            weekly = df.groupby(KEYS + ['Week']).agg(
+                Volume=('Tonnage', 'sum'), Sets=('Tonnage', 'size'), Top_E1RM=('E1RM', 'max'),
+                RPE_Sum=('RPE_Sum', 'sum'), RPE_Count=('RPE_Logged', 'sum'),
+            )
+            self.weekly = _merge_weekly(self.weekly, weekly)
+
+        positions = _positions(logs)
+        if not positions.empty:
+            self.positions = positions if self.positions.empty else _latest(pd.concat([self.positions, positions]))
+
+    def refresh(self, storage, worksheet="Logs", min_interval=60):
+        """Fold in rows appended since the last refresh; True if anything changed"""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.checked_at < min_interval:
+                return False
+            self.checked_at = now
+            new_rows, cursor = storage.changes(worksheet, self.cursor)
+            if new_rows.empty:
+                return False
+            self.fold(new_rows)
+            self.cursor = cursor
+            return True
+
+    # ==========================================
+    # QUERIES
+    # ==========================================
+    def _athlete(self, frame, athlete):
+        """Rows of one athlete with the Athlete level dropped"""
+        if frame.empty or athlete not in frame.index.get_level_values(0):
+            return frame.iloc[0:0]
+        return frame.xs(athlete, level=0)
+
+    def summary(self, athlete="", recent_weeks=4):
+        """One row per exercise, with average RPE over its latest logged weeks"""
+        df = self._athlete(self.exercises, athlete).copy()
+        if df.empty:
+            return pd.DataFrame(columns=EXERCISE_COLUMNS + ['RPE_Recent'])
+        weekly = self._athlete(self.weekly, athlete)
+        rated = weekly[weekly['RPE_Count'] > 0]
+        recent = rated.groupby(level=0, group_keys=False).tail(recent_weeks)
+        sums = recent.groupby(level=0)[['RPE_Sum', 'RPE_Count']].sum()
+        df['RPE_Recent'] = (sums['RPE_Sum'] / sums['RPE_Count']).round(1)
+        df['Best_E1RM'] = df['Best_E1RM'].astype(float).round(1)
+        return df.set_index('Exercise').sort_values('Last_Date', ascending=False)
+
+    def _exercise_id(self, exercise, athlete):
+        """ID for a display name from ``summary`` (or any spelling of the exercise)"""
+        names = self._athlete(self.exercises, athlete)['Exercise']
+        match = names.index[names == exercise]
+        return match[0] if len(match) else normalize_name(exercise)
+
+    def weekly_for(self, exercise, athlete=""):
+        """Weekly volume, top e1RM and average RPE for one exercise"""
+        weekly = self._athlete(self.weekly, athlete)
+        exercise_id = self._exercise_id(exercise, athlete)
+        if weekly.empty or exercise_id not in weekly.index.get_level_values(0):
+            return pd.DataFrame(columns=['Volume', 'Top_E1RM', 'RPE'])
+        df = weekly.xs(exercise_id, level=0).sort_index()
+        rpe = (df['RPE_Sum'] / df['RPE_Count'].replace(0, np.nan)).round(1)
+        return pd.DataFrame({'Volume': df['Volume'], 'Top_E1RM': df['Top_E1RM'].round(1), 'RPE': rpe})
+
+    def position(self, athlete=""):
+        """(template, week, day) of the athlete's latest logged program day, or None"""
+        if athlete not in self.positions.index:
+            return None
+        row = self.positions.loc[athlete]
+        return row['Template'], row['Week'], row['Day']
+
+    def estimated_maxes(self, athlete="", weeks=12, as_of=None):
+        """Best e1RM per exercise over the last ``weeks`` weeks, as Lift/Max rows"""
+        weekly = self._athlete(self.weekly, athlete)
+        if weekly.empty:
+            return pd.DataFrame(columns=['Lift', 'Max'])
+        as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.today()
+        since = as_of.normalize() - pd.Timedelta(weeks=weeks)
+        week_starts = weekly.index.get_level_values(1)
+        recent = weekly[week_starts >= since]
+        top = recent.groupby(level=0)['Top_E1RM'].max().round(1)
+        names = self._athlete(self.exercises, athlete)['Exercise']
+        return pd.DataFrame({'Lift': [names.get(i, i) for i in top.index], 'Max': top.to_numpy()})
+
+    # ==========================================
+    # PERSISTENCE
+    # ==========================================
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.exercises.to_parquet(os.path.join(directory, "exercises.parquet"))
+        self.weekly.to_parquet(os.path.join(directory, "weekly.parquet"))
+        self.positions.to_parquet(os.path.join(directory, "positions.parquet"))
+        with open(os.path.join(directory, "state.json"), "w") as f:
+            json.dump({"cursor": self.cursor, "format": FORMAT}, f)
+
+    @classmethod
+    def load(cls, directory):
+        """Rollups saved by ``save``, or empty ones if there are none"""
+        rollups = cls()
+        try:
+            with open(os.path.join(directory, "state.json")) as f:
+                state = json.load(f)
+            if state.get("format") != FORMAT:
+                # Older layout; rebuild from the start of Logs
+                return cls()
+            cursor = state["cursor"]
+            rollups.exercises = pd.read_parquet(os.path.join(directory, "exercises.parquet"))
+            rollups.weekly = pd.read_parquet(os.path.join(directory, "weekly.parquet"))
+            rollups.positions = pd.read_parquet(os.path.join(directory, "positions.parquet"))
+            rollups.cursor = cursor
+        except Exception:
+            return cls()
+        return rollups
+
+
+def overlay_profile(df_profile, maxes):
+    """Profile with maxes replaced (or added) from logged performance"""
+    if maxes.empty:
+        return df_profile
+    estimated = dict(zip(maxes['Lift'].map(normalize_name), maxes['Max']))
+    profile = df_profile.copy()
+    lifts = profile['Lift'].map(normalize_name)
+    profile['Max'] = lifts.map(estimated).fillna(profile['Max'])
+    extra = maxes[~maxes['Lift'].map(normalize_name).isin(set(lifts))]
+    return pd.concat([profile, extra], ignore_index=True)
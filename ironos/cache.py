@@ -0,0 +1,56 @@
+"""Content versions for worksheet frames and a small cache keyed by them"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from ironos import perf
+
+
+def frame_version(df):
+    """Stable content hash of a frame; changes whenever the sheet data does"""
+    if df is None:
+        return "none"
+    import pandas as pd  # deferred so importing the cache doesn't load pandas
+    digest = hashlib.sha1(repr(list(df.columns)).encode())
+    if not df.empty:
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+class VersionedCache:
+    """Thread-safe LRU of values built from versioned inputs.
+
+    Keys are tuples of versions (e.g. library and profile), so a changed
+    sheet simply misses and the stale entry ages out.
+    """
+
+    def __init__(self, maxsize=8, name="cache"):
+        self.maxsize = maxsize
+        self.name = name
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, build):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                perf.count("cache.hit", cache=self.name)
+                return self.entries[key]
+        perf.count("cache.miss", cache=self.name)
+        value = build()
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return value
+
+    def discard(self, key, value=None):
+        """Drop ``key`` (only if it still holds ``value``, when given)"""
+        with self.lock:
+            if key in self.entries and (value is None or self.entries[key] is value):
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,152 @@
+"""Normalized exercise catalog with prefix and fuzzy search"""
+import bisect
+import difflib
+import re
+import unicodedata
+from collections import Counter
+
+from ironos.cache import VersionedCache, frame_version
+
+_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+
+def _missing(value):
+    try:
+        return value is None or bool(value != value)
+    except TypeError:  # pd.NA refuses comparison
+        return True
+
+
+def normalize_name(name):
+    """Canonical ID for an exercise name: casefolded words joined by single spaces.
+
+    "Bench Press", " bench  press " and "Bench-Press" all map to "bench press".
+    """
+    if _missing(name):
+        return ""
+    text = unicodedata.normalize("NFKC", str(name)).casefold()
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ExerciseCatalog:
+    """Every known exercise, keyed by canonical ID.
+
+    Sources are searched in order and the first spelling seen for an ID
+    becomes its display name. Aliases (e.g. "BP" -> "Bench Press") resolve
+    to the same ID. Search uses a sorted key list for prefixes and a
+    trigram index for typos, so it stays interactive for large catalogs.
+    """
+
+    def __init__(self, names, aliases=None):
+        self.display = {}
+        for name in names:
+            key = normalize_name(name)
+            if key and key not in self.display:
+                self.display[key] = str(name).strip()
+
+        self.lookup = {key: key for key in self.display}
+        for alias, target in (aliases or {}).items():
+            alias_key, target_key = normalize_name(alias), normalize_name(target)
+            if alias_key and target_key in self.display:
+                self.lookup.setdefault(alias_key, target_key)
+
+        self.options = sorted(self.display.values(), key=str.casefold)
+
+        # Prefix search runs over whole keys and over each word of a key
+        self.prefixes = sorted(
+            {(key, target) for key, target in self.lookup.items()}
+            | {(word, target) for key, target in self.lookup.items() for word in key.split()[1:]}
+        )
+        self.prefix_keys = [key for key, _ in self.prefixes]
+
+        self.grams = {}
+        for key, target in self.lookup.items():
+            for gram in _trigrams(key):
+                self.grams.setdefault(gram, set()).add(target)
+
+    def __len__(self):
+        return len(self.display)
+
+    def canonical(self, name):
+        """Canonical ID for a name or alias; unknown names normalize to themselves"""
+        key = normalize_name(name)
+        return self.lookup.get(key, key)
+
+    def name_for(self, name):
+        """Display name for a name or alias, or the name itself if unknown"""
+        return self.display.get(self.canonical(name), str(name).strip())
+
+    def prefix(self, query, limit=20):
+        """IDs with a key or word starting with the query, shortest first"""
+        query = normalize_name(query)
+        if not query:
+            return []
+        start = bisect.bisect_left(self.prefix_keys, query)
+        found = {}
+        for key, target in self.prefixes[start:]:
+            if not key.startswith(query):
+                break
+            found.setdefault(target, len(self.display[target]))
+        return sorted(found, key=lambda t: (found[t], t))[:limit]
+
+    def fuzzy(self, query, limit=20, cutoff=0.5):
+        """IDs ranked by similarity, for typos the prefix search misses"""
+        query = normalize_name(query)
+        if not query:
+            return []
+        counts = Counter()
+        for gram in _trigrams(query):
+            counts.update(self.grams.get(gram, ()))
+        candidates = [target for target, _ in counts.most_common(limit * 5)]
+        scored = [(difflib.SequenceMatcher(None, query, target).ratio(), target) for target in candidates]
+        return [target for score, target in sorted(scored, key=lambda s: (-s[0], s[1])) if score >= cutoff][:limit]
+
+    def search(self, query, limit=20):
+        """Display names matching the query: prefix hits first, then fuzzy ones"""
+        hits = self.prefix(query, limit)
+        if len(hits) < limit:
+            hits += [t for t in self.fuzzy(query, limit) if t not in hits][:limit - len(hits)]
+        return [self.display[t] for t in hits]
+
+
+def _aliases(df_dir):
+    """Alias -> exercise pairs from an optional comma-separated Directory 'Aliases' column"""
+    if df_dir is None or df_dir.empty or not {'Exercise', 'Aliases'} <= set(df_dir.columns):
+        return {}
+    pairs = {}
+    for exercise, aliases in zip(df_dir['Exercise'], df_dir['Aliases']):
+        if _missing(exercise) or _missing(aliases):
+            continue
+        for alias in str(aliases).split(','):
+            pairs.setdefault(alias, exercise)
+    return pairs
+
+
+def _names(df, column):
+    if df is None or df.empty or column not in df.columns:
+        return []
+    return df[column].dropna().unique().tolist()
+
+
+_catalogs = VersionedCache(maxsize=4, name="exercise_catalog")
+
+
+def get_catalog(lib_index, df_profile, df_dir):
+    """Catalog over Master, Profile and Directory names, rebuilt only when one of them changes.
+
+    Master and Profile are always loaded while Directory may not be, so
+    their spellings come first: a lift's display name is the same whether
+    or not Directory is available. Directory only adds the names (and
+    aliases) it alone knows.
+    """
+    key = (lib_index.version, frame_version(df_profile), frame_version(df_dir))
+
+    def build():
+        names = _names(lib_index.frame, 'Exercise') + _names(df_profile, 'Lift') + _names(df_dir, 'Exercise')
+        return ExerciseCatalog(names, _aliases(df_dir))
+    return _catalogs.get(key, build)
@@ -0,0 +1,211 @@
+"""Headless IronOS commands for scripts and cron.
+
+    python -m ironos compile "5/3/1" 1 A --athlete sam
+    python -m ironos import-logs history.csv --athlete sam
+    python -m ironos recompute-maxes --athlete sam --write-profile
+
+Settings come from the same IRONOS_* environment variables and
+.streamlit/secrets.toml as the app. The backend is the configured one
+(--backend, IRONOS_STORAGE or [storage] backend), else SQLite. A running
+Streamlit app is needed for a gsheets connection, so headless commands
+reach the same spreadsheet through the sheets_api backend with the
+service account under [connections.gsheets].
+Heavy modules are imported inside the commands to keep --help instant.
+"""
+import argparse
+import json
+import os
+import sys
+
+from ironos.config import build_storage, read_secrets, sheets_api_options, storage_settings
+
+BACKENDS = ["sqlite", "sheets_api", "memory"]
+
+
+def _storage(args):
+    api = None
+    if args.backend == "sheets_api":
+        api = sheets_api_options(args.settings, args.secrets.get("connections", {}).get("gsheets"))
+    return build_storage(args.backend, args.db, args.archive, api=api)
+
+
+def _load(storage, worksheets):
+    """Typed frames for the given worksheets, prepared like the app's loader"""
+    from ironos.loader import SheetLoader
+
+    sheets = SheetLoader(storage).load(worksheets)
+    for name, sheet in sheets.items():
+        if sheet.error:
+            raise SystemExit(f"Could not load {name}: {sheet.error}")
+        for issue in sheet.issues:
+            print(f"warning: {issue}", file=sys.stderr)
+    return sheets
+
+
+# ==========================================
+# COMMANDS
+# ==========================================
+def compile_day(args):
+    """Print one day's workout with guide weights for an athlete"""
+    import pandas as pd
+
+    from ironos.library import build_library_index, compile_library
+    from ironos.lifts import profile_for
+
+    sheets = _load(_storage(args), ["Master", "Profile"])
+    index = build_library_index(sheets["Master"].frame, sheets["Master"].version)
+    profile = profile_for(sheets["Profile"].frame, args.athlete)
+    queue = compile_library(index, profile).workout(args.template, args.week, args.day)
+    if not queue:
+        raise SystemExit(f"No workout for {args.template} / {args.week} / {args.day}")
+
+    if args.format == "json":
+        print(json.dumps(queue, indent=2, default=str))
+        return 0
+    rows = pd.DataFrame([
+        {"Exercise": entry["Exercise"], "Set": s + 1, "Reps": reps, "Guide": guide}
+        for entry in queue
+        for s, (reps, guide) in enumerate(zip(entry["Rep_List"], entry["Guide_List"]))
+    ])
+    print(rows.to_csv(index=False) if args.format == "csv" else rows.to_string(index=False))
+    return 0
+
+
+def import_logs(args):
+    """Append logged sets from a CSV through the journal, skipping rows already imported"""
+    import pandas as pd
+
+    from ironos.catalog import normalize_name
+    from ironos.schema import coerce
+    from ironos.storage import LOG_COLUMNS
+    from ironos.sync import SaveJournal, SyncWorker, set_key
+
+    df = pd.read_csv(args.csv, dtype=str, keep_default_na=False)
+    missing = {'Date', 'Exercise', 'Weight', 'Reps'} - set(df.columns)
+    if missing:
+        raise SystemExit(f"{args.csv} is missing columns: {', '.join(sorted(missing))}")
+    df = df.reindex(columns=LOG_COLUMNS, fill_value="")
+    if args.athlete:
+        df['Athlete'] = df['Athlete'].where(df['Athlete'].str.strip() != "", args.athlete)
+
+    # Drop rows that fail the Logs schema rather than importing bad values
+    _, issues = coerce(df, 'Logs')
+    for issue in issues:
+        print(f"skipped: {str(issue).replace('Logs row', 'line')}", file=sys.stderr)
+    df = df.drop(index=sorted({issue.row - 2 for issue in issues}))
+
+    df['ExerciseId'] = df['Exercise'].map(normalize_name)
+    blank_set = df['Set'].str.strip() == ""
+    numbered = df.groupby(['Date', 'Athlete', 'ExerciseId']).cumcount() + 1
+    df['Set'] = df['Set'].where(~blank_set, numbered.astype(str))
+    # Keys derived from the row itself make re-running an import harmless. The
+    # same lift and set can appear twice on one day, so repeats get an ordinal
+    # (the first keeps the plain key of earlier imports).
+    blank_key = df['Key'].str.strip() == ""
+    fields = ['Date', 'Athlete', 'ExerciseId', 'Set']
+    repeat = df[blank_key].groupby(fields).cumcount()
+    df.loc[blank_key, 'Key'] = [
+        set_key(f"import:{d}:{a}" + (f"#{n}" if n else ""), e, s)
+        for (d, a, e, s), n in zip(df.loc[blank_key, fields].itertuples(index=False), repeat)
+    ]
+    read = len(df)
+    duplicate = df['Key'].duplicated()
+    if duplicate.any():
+        print(f"skipped {int(duplicate.sum())} rows repeating a Key given earlier in the file", file=sys.stderr)
+    df = df[~duplicate]
+
+    # The journal forgets rows once delivered, so ask the backend which Keys already landed
+    storage = _storage(args)
+    landed = storage.existing_keys("Logs", df['Key'], dates=df['Date'])
+    present = df['Key'].isin(landed)
+    df = df[~present]
+
+    journal = SaveJournal(args.journal)
+    queued = journal.enqueue("Logs", df)
+    worker = SyncWorker(journal, storage)
+    delivered = 0
+    while journal.due(limit=1):
+        sent = worker.flush_once()
+        if not sent:
+            break
+        delivered += sent
+    print(f"{read} rows read, {int(duplicate.sum())} duplicates, {int(present.sum())} already imported, "
+          f"{queued} new, {len(df) - queued} already queued, {delivered} delivered, "
+          f"{journal.pending_count()} pending")
+    return 0 if not journal.pending_count() else 1
+
+
+def recompute_maxes(args):
+    """Rebuild the analytics rollups from all Logs and print estimated maxes"""
+    from ironos.analytics import Rollups
+    from ironos.catalog import normalize_name
+
+    storage = _storage(args)
+    rollups = Rollups()
+    rollups.refresh(storage, min_interval=0)
+    if args.analytics:
+        rollups.save(args.analytics)
+    maxes = rollups.estimated_maxes(args.athlete, weeks=args.weeks)
+    print(maxes.to_string(index=False) if not maxes.empty else "No logged sets in range")
+
+    if args.write_profile and not maxes.empty:
+        profile = storage.read("Profile")
+        owner = profile['Athlete'].fillna("").astype(str).str.strip() if 'Athlete' in profile.columns else ""
+        estimated = dict(zip(maxes['Lift'].map(normalize_name), maxes['Max']))
+        lifts = profile['Lift'].map(normalize_name)
+        mask = (owner == args.athlete) & lifts.isin(set(estimated))
+        profile.loc[mask, 'Max'] = lifts[mask].map(estimated).astype(str)
+        storage.update("Profile", profile)
+        print(f"Updated {int(mask.sum())} Profile rows")
+    return 0
+
+
+# ==========================================
+# ENTRY POINT
+# ==========================================
+def build_parser():
+    secrets = read_secrets()
+    settings = storage_settings(secrets.get("storage"))
+    # The settings default to gsheets even when nothing is configured; headless, that means SQLite
+    configured = os.environ.get("IRONOS_STORAGE") or (secrets.get("storage") or {}).get("backend")
+    backend = {"gsheets": "sheets_api"}.get(configured, configured) or "sqlite"
+    parser = argparse.ArgumentParser(prog="ironos", description=__doc__.splitlines()[0])
+    parser.set_defaults(settings=settings, secrets=secrets)
+    parser.add_argument("--backend", choices=BACKENDS, default=backend,
+                        help="storage backend (gsheets is reached through sheets_api)")
+    parser.add_argument("--db", default=settings["path"], help="SQLite database path")
+    parser.add_argument("--archive", default=settings["archive"], help="Logs partition archive directory")
+    parser.add_argument("--journal", default=settings["journal"])
+    parser.add_argument("--analytics", default=None,
+                        help="save rebuilt rollups here (never the app's directory by default)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("compile", help=compile_day.__doc__)
+    cmd.add_argument("template")
+    cmd.add_argument("week")
+    cmd.add_argument("day")
+    cmd.add_argument("--athlete", default="")
+    cmd.add_argument("--format", choices=["table", "csv", "json"], default="table")
+    cmd.set_defaults(func=compile_day)
+
+    cmd = commands.add_parser("import-logs", help=import_logs.__doc__)
+    cmd.add_argument("csv", help="CSV with Date, Exercise, Weight, Reps (and optionally Athlete, Set, RPE, Key)")
+    cmd.add_argument("--athlete", default="", help="athlete for rows without one")
+    cmd.set_defaults(func=import_logs)
+
+    cmd = commands.add_parser("recompute-maxes", help=recompute_maxes.__doc__)
+    cmd.add_argument("--athlete", default="")
+    cmd.add_argument("--weeks", type=int, default=12)
+    cmd.add_argument("--write-profile", action="store_true",
+                     help="store the estimates as the athlete's Profile maxes")
+    cmd.set_defaults(func=recompute_maxes)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
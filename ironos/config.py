@@ -0,0 +1,108 @@
+"""Storage settings and backend wiring shared by the Streamlit app and the CLI"""
+import os
+import re
+import threading
+
+# setting -> (environment variable, default)
+ENVIRONMENT = {
+    'backend': ('IRONOS_STORAGE', 'gsheets'),
+    'path': ('IRONOS_DB', 'ironos.db'),
+    'journal': ('IRONOS_JOURNAL', 'ironos_journal.db'),
+    'snapshots': ('IRONOS_SNAPSHOTS', 'ironos_snapshots.db'),
+    'analytics': ('IRONOS_ANALYTICS', 'ironos_analytics'),
+    'archive': ('IRONOS_ARCHIVE', None),
+    'metrics_port': ('IRONOS_METRICS_PORT', None),
+    'spreadsheet': ('IRONOS_SPREADSHEET', None),
+    'token': ('IRONOS_TOKEN', None),
+}
+
+
+def read_secrets(path=os.path.join(".streamlit", "secrets.toml")):
+    """The app's secrets.toml as a dict for headless callers ({} if missing)"""
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        return {}
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except OSError:
+        return {}
+
+
+def storage_settings(overrides=None):
+    """Settings from ``overrides`` (e.g. [storage] in secrets.toml), else IRONOS_* variables"""
+    settings = dict(overrides or {})
+    for name, (variable, default) in ENVIRONMENT.items():
+        settings.setdefault(name, os.environ.get(variable, default))
+    settings.setdefault("debug", os.environ.get("IRONOS_DEBUG") == "1")
+    return settings
+
+
+def service_account_token(info):
+    """Callable returning a fresh OAuth token for a service account (needs google-auth)"""
+    from google.auth.transport.requests import Request
+    from google.oauth2 import service_account
+
+    scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive.metadata.readonly"]
+    credentials = service_account.Credentials.from_service_account_info(info, scopes=scopes)
+    lock = threading.Lock()
+
+    def token():
+        with lock:
+            if not credentials.valid:
+                credentials.refresh(Request())
+            return credentials.token
+    return token
+
+
+def sheets_api_options(settings, service_account=None):
+    """SheetsClient arguments from [storage] settings.
+
+    ``spreadsheet`` is the spreadsheet id or URL (by default the one in the
+    service account's connection settings). Auth is a static ``token`` or
+    the service account.
+    """
+    service_account = dict(service_account or {})
+    spreadsheet = str(settings.get("spreadsheet") or service_account.pop("spreadsheet", ""))
+    match = re.search(r"/d/([\w-]+)", spreadsheet)
+    options = {"spreadsheet_id": match.group(1) if match else spreadsheet}
+    for name in ("base_url", "drive_url", "max_concurrency"):
+        if settings.get(name):
+            options[name] = settings[name]
+    if settings.get("token"):
+        options["token"] = settings["token"]
+    elif service_account:
+        options["token"] = service_account_token(service_account)
+    return options
+
+
+def build_storage(backend, path, archive=None, connection=None, api=None):
+    """Backend by name, wrapped in monthly Logs partitions when ``archive`` is set.
+
+    The gsheets backend needs a GSheetsConnection, which only a running
+    Streamlit app can create; headless callers use sqlite. The sheets_api
+    backend takes SheetsClient arguments in ``api``.
+    """
+    # Imported here so the CLI can parse arguments without loading pandas
+    from ironos.partitions import PartitionedStorage
+    from ironos.storage import GSheetsStorage, open_storage
+
+    if backend == "gsheets":
+        if connection is None:
+            raise ValueError("The gsheets backend needs a Streamlit connection; use sqlite outside the app")
+        inner = GSheetsStorage(connection)
+    elif backend == "sheets_api":
+        from ironos.sheets_api import SheetsAPIStorage, SheetsClient
+        inner = SheetsAPIStorage(SheetsClient(**(api or {})))
+    elif backend == "sqlite":
+        inner = open_storage(backend, path=path)
+    else:
+        inner = open_storage(backend)
+    if not archive:
+        return inner
+    # Monthly Logs partitions; migrate the old single sheet and archive cold months once per process
+    partitioned = PartitionedStorage(inner, archive_dir=archive)
+    partitioned.split_legacy()
+    partitioned.compact()
+    return partitioned
@@ -0,0 +1,240 @@
+"""Program library (Master worksheet) lookups and workout compilation"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from ironos import perf
+from ironos.cache import VersionedCache, frame_version
+from ironos.lifts import get_resolver
+
+KEY_COLUMNS = ['Template', 'Week', 'Day']
+
+
+def natural_key(value):
+    """Sort key that orders embedded numbers by value, so week 2 comes before week 10"""
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part.lower())
+            for part in re.split(r'(\d+)', str(value)) if part]
+
+
+class LibraryIndex:
+    """Hierarchical template -> week -> day index over a library frame.
+
+    The frame is stably sorted by (Template, Week, Day) once, so every day
+    is a contiguous row slice and the sheet's exercise order is kept.
+    Template, week and day lists are sorted naturally (week 2 before week
+    10) ahead of time, so picker lookups are plain dict reads.
+    """
+
+    def __init__(self, df_lib, version=None):
+        self.version = version if version is not None else frame_version(df_lib)
+        keys = [c for c in KEY_COLUMNS if c in df_lib.columns]
+        if len(keys) == len(KEY_COLUMNS) and not df_lib.empty:
+            df = df_lib.dropna(subset=KEY_COLUMNS)
+            df = df.sort_values(KEY_COLUMNS, kind='mergesort').reset_index(drop=True)
+        else:
+            df = df_lib.iloc[0:0].reset_index(drop=True)
+        self.frame = df
+        self.tree = {}
+        self.templates = []
+        self._weeks = {}
+        self._days = {}
+        if df.empty:
+            return
+
+        # Boundaries where any key changes give the day slices
+        key_frame = df[KEY_COLUMNS]
+        changed = (key_frame != key_frame.shift()).any(axis=1).to_numpy()
+        starts = changed.nonzero()[0].tolist()
+        stops = starts[1:] + [len(df)]
+        day_keys = key_frame.iloc[starts].itertuples(index=False, name=None)
+        for start, stop, (template, week, day) in zip(starts, stops, day_keys):
+            self.tree.setdefault(template, {}).setdefault(week, {})[day] = slice(start, stop)
+
+        self.templates = sorted(self.tree, key=natural_key)
+        self._weeks = {t: sorted(weeks, key=natural_key) for t, weeks in self.tree.items()}
+        self._days = {
+            (t, w): sorted(days, key=natural_key) for t, weeks in self.tree.items() for w, days in weeks.items()
+        }
+
+    def weeks(self, template):
+        return self._weeks.get(template, [])
+
+    def days(self, template, week):
+        return self._days.get((template, week), [])
+
+    def rows(self, template, week, day):
+        """Library rows for one training day, in sheet order"""
+        span = self.tree.get(template, {}).get(week, {}).get(day)
+        if span is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[span]
+
+
+_indexes = VersionedCache(maxsize=4, name="library_index")
+
+
+def build_library_index(df_lib, version=None):
+    """Index for this library content, built once per version"""
+    df_lib = df_lib if df_lib is not None else pd.DataFrame()
+    version = version if version is not None else frame_version(df_lib)
+    return _indexes.get(version, lambda: LibraryIndex(df_lib, version))
+
+
+# ==========================================
+# WORKOUT COMPILATION
+# ==========================================
+def _expand_multi(text, n_sets, default):
+    """Vectorized parse_multi_value over a whole column.
+
+    Returns one value per (row, set): the set's comma-separated part, the
+    last part repeating when there are fewer parts than sets, and
+    ``default`` for blank cells.
+    """
+    text = text.astype(object).fillna("").astype(str).str.replace(" ", "", regex=False).str.strip()
+    empty = text.eq("").to_numpy()
+    parts = text.str.split(",")
+    lens = parts.str.len().to_numpy(dtype=np.int64)
+    flat = parts.explode().to_numpy(dtype=object)
+    offsets = np.cumsum(lens) - lens
+
+    row = np.repeat(np.arange(len(text)), n_sets)
+    set_idx = np.arange(len(row)) - np.repeat(np.cumsum(n_sets) - n_sets, n_sets)
+    picked = flat[offsets[row] + np.minimum(set_idx, lens[row] - 1)]
+    return np.where(empty[row], default, picked), row, set_idx
+
+
+def _frozen(array):
+    """Mark an array read-only; shared structures must never be edited in place"""
+    array.flags.writeable = False
+    return array
+
+
+class LibraryPlan:
+    """Athlete-independent prescriptions for every template, week and day.
+
+    Compiled once per library version and shared read-only by every
+    session. Sets are stored column-wise (``row``, ``set_no``, ``reps``,
+    ``pct``), one entry per prescribed set; each library row's sets are
+    contiguous between ``bounds[row]`` and ``bounds[row + 1]``. Exercises
+    are stored as codes into ``exercises`` so an athlete overlay only
+    needs one max per distinct exercise.
+    """
+
+    def __init__(self, index):
+        with perf.timed("compile.library"):
+            self._compile(index)
+
+    def _compile(self, index):
+        self.index = index
+        df = index.frame
+
+        # Sets is Int16 after schema.coerce; raw string frames are parsed here
+        sets = pd.to_numeric(df.get('Sets', pd.Series(index=df.index, dtype=object)), errors='coerce').astype('float64')
+        sets = np.trunc(sets.replace([np.inf, -np.inf], np.nan)).fillna(3)
+        n_sets = sets.clip(lower=0).to_numpy(dtype=np.int64)
+        self.n_sets = _frozen(n_sets)
+        self.bounds = _frozen(np.concatenate([[0], np.cumsum(n_sets)]))
+
+        exercises = df.get('Exercise', pd.Series(index=df.index, dtype=object)).astype(object)
+        codes, uniques = pd.factorize(exercises)
+        self.exercise_code = _frozen(codes.astype(np.int32))
+        self.exercises = list(uniques)
+        self.names = _frozen(exercises.to_numpy())
+
+        if 'Category' in df.columns:
+            self.categories = _frozen(df['Category'].astype(object).fillna('Accessory').astype(str).to_numpy())
+        else:
+            self.categories = _frozen(np.full(len(df), 'Accessory', dtype=object))
+
+        pct_col = df['Pct'] if 'Pct' in df.columns else pd.Series("", index=df.index)
+        reps_col = df['Reps'] if 'Reps' in df.columns else pd.Series("", index=df.index)
+        pct_raw, row, set_idx = _expand_multi(pct_col, n_sets, "0")
+        reps, _, _ = _expand_multi(reps_col, n_sets, "5")
+        self.row = _frozen(row)
+        self.set_no = _frozen(set_idx + 1)
+        self.reps = _frozen(reps.astype(str).astype(object))
+        self.pct = _frozen(pd.to_numeric(pd.Series(pct_raw), errors='coerce').fillna(0.0).to_numpy())
+
+
+_plans = VersionedCache(maxsize=2, name="library_plan")
+
+
+def get_plan(index):
+    """Shared plan for this library version"""
+    return _plans.get(index.version, lambda: LibraryPlan(index))
+
+
+class CompiledLibrary:
+    """A shared LibraryPlan seen through one athlete's Profile.
+
+    The overlay only holds the athlete's max for each distinct exercise;
+    guide weights are computed for the days actually requested.
+    """
+
+    def __init__(self, plan, df_profile):
+        self.plan = plan
+        self.index = plan.index
+        resolver = get_resolver(df_profile)
+        self.exercise_max = np.array([resolver.max_for(ex) for ex in plan.exercises], dtype=float)
+
+    def guides(self, lo, hi):
+        """Guide weights for set positions lo..hi, rounded down to 5"""
+        plan = self.plan
+        codes = plan.exercise_code[plan.row[lo:hi]]
+        base = np.where(codes >= 0, self.exercise_max[codes], 0.0)
+        pct = plan.pct[lo:hi]
+        return np.where(pct > 0, np.trunc(base * pct / 5) * 5, 0).astype(np.int64)
+
+    def workout(self, template, week, day):
+        """Workout queue entries for one day, ready for session state"""
+        with perf.timed("compile.workout"):
+            return self._workout(template, week, day)
+
+    def _workout(self, template, week, day):
+        span = self.index.tree.get(template, {}).get(week, {}).get(day)
+        if span is None:
+            return []
+        plan = self.plan
+        lo, hi = plan.bounds[span.start], plan.bounds[span.stop]
+        guide = self.guides(lo, hi)
+        queue = []
+        for pos in range(span.start, span.stop):
+            first, last = plan.bounds[pos] - lo, plan.bounds[pos + 1] - lo
+            queue.append({
+                "Category": plan.categories[pos],
+                "Exercise": plan.names[pos],
+                "Sets": int(plan.n_sets[pos]),
+                "Rep_List": plan.reps[lo + first:lo + last].tolist(),
+                "Guide_List": guide[first:last].tolist(),
+                "Meta": {"Template": template, "Week": week, "Day": day},
+            })
+        return queue
+
+    def block(self, template):
+        """Every prescribed set of a template, for previewing a training block"""
+        spans = [
+            span for week in self.index.weeks(template)
+            for span in self.index.tree[template][week].values()
+        ]
+        if not spans:
+            return pd.DataFrame(columns=KEY_COLUMNS + ['Exercise', 'Set', 'Reps', 'Pct', 'Guide'])
+        plan = self.plan
+        positions = np.concatenate([np.arange(plan.bounds[span.start], plan.bounds[span.stop]) for span in spans])
+        info = self.index.frame[KEY_COLUMNS + ['Exercise']].iloc[plan.row[positions]]
+        sets = pd.DataFrame({
+            'Set': plan.set_no[positions],
+            'Reps': plan.reps[positions],
+            'Pct': plan.pct[positions],
+            'Guide': np.concatenate([self.guides(plan.bounds[s.start], plan.bounds[s.stop]) for s in spans]),
+        })
+        return pd.concat([info.reset_index(drop=True), sets], axis=1)
+
+
+_compiled = VersionedCache(maxsize=256, name="compiled_library")
+
+
+def compile_library(index, df_profile):
+    """Athlete overlay on the shared plan, cached against the library and profile versions"""
+    key = (index.version, frame_version(df_profile))
+    return _compiled.get(key, lambda: CompiledLibrary(get_plan(index), df_profile))
@@ -0,0 +1,120 @@
+"""Resolve exercise names to Profile maxes"""
+from collections import deque
+
+import pandas as pd
+
+from ironos.cache import VersionedCache, frame_version
+from ironos.catalog import normalize_name
+
+
+class LiftResolver:
+    """Aho-Corasick matcher over Profile lift names.
+
+    An exercise matches every profile lift contained in its name; the
+    longest lift wins (ties go to the earlier Profile row), so "Close Grip
+    Bench" beats "Bench" regardless of sheet order. Names are matched by
+    canonical ID (see catalog.normalize_name). Compiled once per
+    profile version, with lookups memoized per exercise name.
+    """
+
+    def __init__(self, df_profile):
+        self.patterns = []  # (length, row order, max) per pattern id
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        self.memo = {}
+
+        if df_profile is None or df_profile.empty or 'Lift' not in df_profile.columns:
+            return
+
+        maxes = df_profile['Max'] if 'Max' in df_profile.columns else pd.Series(0.0, index=df_profile.index)
+        seen = set()
+        for order, (lift, max_value) in enumerate(zip(df_profile['Lift'], maxes)):
+            if pd.isna(lift):
+                continue
+            pattern = normalize_name(lift)
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            try:
+                max_value = float(max_value)
+            except (TypeError, ValueError):
+                max_value = 0.0
+            if pd.isna(max_value):
+                max_value = 0.0
+            self._add(pattern, (len(pattern), order, max_value))
+        self._link()
+
+    def _add(self, pattern, info):
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = nxt
+        self.out[node].append(len(self.patterns))
+        self.patterns.append(info)
+
+    def _link(self):
+        """Breadth-first failure links; outputs inherit from their fail node"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+                queue.append(child)
+
+    def match(self, lift_name):
+        """Best matching pattern info (length, order, max) or None"""
+        best = None
+        node = 0
+        for ch in normalize_name(lift_name):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for pid in self.out[node]:
+                length, order, _ = self.patterns[pid]
+                if best is None or length > best[0] or (length == best[0] and order < best[1]):
+                    best = self.patterns[pid]
+        return best
+
+    def max_for(self, lift_name):
+        key = str(lift_name)
+        if key not in self.memo:
+            best = self.match(key)
+            self.memo[key] = best[2] if best else 0.0
+        return self.memo[key]
+
+
+# One per active athlete profile (and logged-max overlay), like compiled libraries
+_resolvers = VersionedCache(maxsize=256, name="lift_resolver")
+
+
+def get_resolver(df_profile):
+    """Resolver for this Profile content, rebuilt only when the sheet changes"""
+    return _resolvers.get(frame_version(df_profile), lambda: LiftResolver(df_profile))
+
+
+def profile_for(df_profile, athlete):
+    """Profile rows for one athlete: their own maxes, then shared rows for other lifts.
+
+    Rows with a blank Athlete (or a Profile without that column) are shared
+    by everyone; an athlete's own row for a lift replaces the shared one.
+    """
+    if df_profile is None or df_profile.empty or 'Athlete' not in df_profile.columns:
+        return df_profile
+    owner = df_profile['Athlete'].astype(object).fillna("").astype(str).str.strip()
+    own = df_profile[owner == str(athlete).strip()] if athlete else df_profile.iloc[0:0]
+    shared = df_profile[owner == ""]
+    taken = set(own['Lift'].map(normalize_name))
+    shared = shared[~shared['Lift'].map(normalize_name).isin(taken)]
+    return pd.concat([own, shared], ignore_index=True)
@@ -0,0 +1,160 @@
+"""Per-worksheet cached loading with revision checks"""
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ironos import perf
+from ironos.cache import frame_version
+from ironos.schema import coerce
+
+
+def prepare_master(df):
+    return coerce(df.dropna(how='all'), 'Master')
+
+
+def prepare_profile(df):
+    df, issues = coerce(df, 'Profile')
+    df['Max'] = df['Max'].fillna(0.0)
+    return df, issues
+
+
+def prepare_directory(df):
+    return coerce(df, 'Directory')
+
+
+PREPARE = {
+    'Master': prepare_master,
+    'Profile': prepare_profile,
+    'Directory': prepare_directory,
+}
+
+
+class Sheet:
+    """Cached copy of one worksheet; ``issues`` lists rows that failed validation"""
+    __slots__ = ('frame', 'version', 'revision', 'fetched_at', 'checked_at', 'error', 'issues')
+
+    def __init__(self, frame, revision=None, error=None, version=None, issues=()):
+        now = time.monotonic()
+        self.frame = frame
+        self.version = version if version is not None else frame_version(frame)
+        self.revision = revision
+        self.fetched_at = now
+        self.checked_at = now
+        self.error = error
+        self.issues = list(issues)
+
+
+class SheetLoader:
+    """Loads worksheets in parallel, each cached on its own.
+
+    A cached sheet (or a failure) is trusted for ``check_interval``
+    seconds. After that the backend's revision is compared, and the sheet
+    is only downloaded again when it changed (or, for backends without
+    revisions, once ``ttl`` has passed). A failed fetch keeps the previous
+    copy and records the error on the sheet instead of hiding it.
+    """
+
+    def __init__(self, storage, ttl=600, check_interval=30, max_workers=4):
+        self.storage = storage
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.sheets = {}
+        self.locks = {}
+        self.guard = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheet-loader")
+
+    def _lock(self, worksheet):
+        with self.guard:
+            return self.locks.setdefault(worksheet, threading.Lock())
+
+    def _revision(self, worksheet):
+        try:
+            return self.storage.revision(worksheet)
+        except Exception:
+            return None
+
+    def _fresh(self, worksheet, sheet):
+        """True if the cached sheet can be served without downloading"""
+        now = time.monotonic()
+        if now - sheet.checked_at < self.check_interval:
+            return True
+        revision = self._revision(worksheet)
+        if revision is None:
+            return sheet.error is None and now - sheet.fetched_at < self.ttl
+        if revision == sheet.revision and sheet.error is None:
+            sheet.checked_at = now
+            return True
+        return False
+
+    def _refresh(self, worksheet, fetched=None):
+        """Cached sheet, downloaded again if stale.
+
+        ``fetched`` is a (revision, frame) pair the caller already read,
+        with the revision taken before the frame.
+        """
+        # One download per sheet at a time; other sessions wait and reuse it
+        with self._lock(worksheet):
+            cached = self.sheets.get(worksheet)
+            if cached is not None and self._fresh(worksheet, cached):
+                perf.count("loader.hit", worksheet=worksheet)
+                return cached
+            perf.count("loader.miss", worksheet=worksheet)
+            revision, frame = fetched if fetched is not None else (self._revision(worksheet), None)
+            try:
+                if frame is None:
+                    frame = self.storage.read(worksheet)
+                if frame is None:
+                    frame = pd.DataFrame()
+                prepare = PREPARE.get(worksheet)
+                frame, issues = prepare(frame) if prepare else (frame, [])
+                sheet = Sheet(frame, revision, issues=issues)
+            except Exception as e:
+                if cached is not None:
+                    # Serve the last good copy but surface the failure
+                    sheet = Sheet(cached.frame, cached.revision, error=str(e), version=cached.version,
+                                  issues=cached.issues)
+                else:
+                    sheet = Sheet(coerce(None, worksheet)[0], None, error=str(e))
+            self.sheets[worksheet] = sheet
+            return sheet
+
+    def load(self, worksheets):
+        """Dict of worksheet -> Sheet, fetching stale sheets concurrently"""
+        if self.storage.batched:
+            return self._load_batched(worksheets)
+        # Copy the caller's context so worker-thread timings reach its recorders
+        futures = {
+            ws: self.pool.submit(contextvars.copy_context().run, self._refresh, ws) for ws in worksheets
+        }
+        return {ws: future.result() for ws, future in futures.items()}
+
+    def _load_batched(self, worksheets):
+        """One batched read for every stale sheet, then the usual per-sheet bookkeeping"""
+        stale = [ws for ws in worksheets if ws not in self.sheets or not self._fresh(ws, self.sheets[ws])]
+        fetched = {}
+        if stale:
+            revisions = {ws: self._revision(ws) for ws in stale}
+            try:
+                frames = self.storage.read_many(stale)
+                fetched = {ws: (revisions[ws], frames[ws]) for ws in stale if ws in frames}
+            except Exception:
+                pass  # each sheet retries on its own and records its error
+        return {ws: self._refresh(ws, fetched.get(ws)) for ws in worksheets}
+
+    def get(self, worksheet):
+        return self._refresh(worksheet)
+
+    def cached(self, worksheet):
+        """The cached frame as is (possibly stale), or None if never loaded; never fetches"""
+        sheet = self.sheets.get(worksheet)
+        return sheet.frame if sheet is not None else None
+
+    def invalidate(self, worksheet=None):
+        with self.guard:
+            if worksheet is None:
+                self.sheets.clear()
+            else:
+                self.sheets.pop(worksheet, None)
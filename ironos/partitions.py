@@ -0,0 +1,464 @@
+"""Logs split into monthly partitions with columnar archives.
+
+New sets go to a worksheet per month (``Logs_2026_10``). Months older
+than ``hot_months`` are compacted into typed Parquet files in the archive
+directory. A manifest worksheet (``Logs_manifest``) next to the
+partitions records each one's state, row count, date range and exercises
+so readers only open the partitions they need, and so every process
+(and a fresh deploy) sees the same partitions.
+
+Compaction copies a month out; the worksheet itself is left untouched.
+A month that gets rows after it was archived (a backdated or imported
+workout) goes back to being read from its worksheet until the next
+compaction.
+
+Every change to the manifest is a read-modify-write of the whole
+worksheet, so writers sharing an archive directory take a file lock
+around it; otherwise one process would drop another's row counts.
+"""
+import contextlib
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are serialized within the process only
+    fcntl = None
+
+import pandas as pd
+
+from ironos.schema import coerce
+from ironos.storage import LOG_COLUMNS, Storage, _filter
+from ironos.sync import set_key
+
+LOGS = "Logs"
+MANIFEST = "Logs_manifest"
+# Dates and month names would be reformatted by Sheets, so the detail is kept as JSON text
+MANIFEST_COLUMNS = ['Worksheet', 'State', 'Rows', 'Detail']
+
+
+def month_of(dates):
+    """'YYYY-MM' partition names for a Series of date strings or datetimes"""
+    return pd.to_datetime(dates, errors='coerce').dt.strftime('%Y-%m')
+
+
+def partition_worksheet(month):
+    return f"{LOGS}_{month.replace('-', '_')}"
+
+
+def typed_logs(df):
+    """Log rows with real dtypes instead of sheet strings (see schema.SCHEMAS)"""
+    return coerce(df, LOGS)[0]
+
+
+def _empty_manifest():
+    return {"partitions": {}, "legacy": None}
+
+
+def _parse_manifest(df):
+    """Manifest worksheet rows as a manifest dict; a later row for a worksheet wins"""
+    manifest = _empty_manifest()
+    if df is None or df.empty or 'Worksheet' not in df.columns:
+        return manifest
+    df = df.reindex(columns=MANIFEST_COLUMNS)
+    for worksheet, state, rows, detail in df.astype(object).where(df.notna(), None).itertuples(index=False):
+        if not worksheet:
+            continue
+        rows = int(float(rows or 0))
+        if worksheet == LOGS:
+            manifest["legacy"] = rows
+            continue
+        detail = json.loads(detail) if detail else {}
+        month = worksheet[len(LOGS) + 1:].replace('_', '-')
+        manifest["partitions"][month] = {
+            "worksheet": worksheet, "state": state or "hot", "rows": rows,
+            "min_date": detail.get("min_date"), "max_date": detail.get("max_date"),
+            "exercises": detail.get("exercises", []),
+        }
+    return manifest
+
+
+def _manifest_frame(manifest):
+    rows = [
+        [entry["worksheet"], entry["state"], entry["rows"], json.dumps({
+            "min_date": entry["min_date"], "max_date": entry["max_date"], "exercises": entry["exercises"],
+        })]
+        for _, entry in sorted(manifest["partitions"].items())
+    ]
+    if manifest["legacy"] is not None:
+        rows.append([LOGS, "migrated", manifest["legacy"], ""])
+    return pd.DataFrame(rows, columns=MANIFEST_COLUMNS)
+
+
+class PartitionedStorage(Storage):
+    """Storage wrapper that partitions the Logs worksheet by month.
+
+    Every other worksheet passes straight through to ``inner``. Logs reads
+    return typed frames; archived months come from Parquet without any
+    string parsing.
+    """
+
+    def __init__(self, inner, archive_dir="ironos_archive", hot_months=2):
+        self.inner = inner
+        self.archive_dir = archive_dir
+        self.hot_months = hot_months
+        self.lock = threading.Lock()
+        self.key_sets = {}
+        os.makedirs(archive_dir, exist_ok=True)
+        self.manifest = self._fetch_manifest() or _empty_manifest()
+        if not self.manifest["partitions"]:
+            self._adopt_local_manifest()
+
+    # ==========================================
+    # MANIFEST
+    # ==========================================
+    def _fetch_manifest(self):
+        """The manifest as stored in the spreadsheet, or None if it can't be read"""
+        try:
+            return _parse_manifest(self.inner.read(MANIFEST))
+        except Exception:
+            return None
+
+    def refresh_manifest(self):
+        """Pick up partitions written by other processes"""
+        manifest = self._fetch_manifest()
+        if manifest is not None:
+            self.manifest = manifest
+
+    def _reload_for_write(self):
+        """Fresh manifest before changing it, so other writers' entries are kept"""
+        manifest = self._fetch_manifest()
+        if manifest is None:
+            if self.manifest["partitions"] or self.manifest["legacy"] is not None:
+                raise RuntimeError(f"Could not read {MANIFEST}; not overwriting it")
+            return
+        self.manifest = manifest
+
+    @contextlib.contextmanager
+    def _writing(self):
+        """Hold the manifest against other threads and other processes on this machine"""
+        with self.lock, open(os.path.join(self.archive_dir, "manifest.lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _save_manifest(self):
+        frame = _manifest_frame(self.manifest)
+        try:
+            self.inner.update(MANIFEST, frame)
+        except Exception:
+            try:
+                self.inner.read(MANIFEST)
+            except Exception:
+                # New spreadsheets have no manifest tab yet; appending creates it
+                self.inner.append(MANIFEST, frame)
+                return
+            raise
+
+    def _adopt_local_manifest(self):
+        """Move a manifest.json from before the manifest lived in the spreadsheet"""
+        path = os.path.join(self.archive_dir, "manifest.json")
+        try:
+            with open(path) as f:
+                partitions = json.load(f)["partitions"]
+        except (OSError, ValueError, KeyError):
+            return
+        for month, entry in partitions.items():
+            entry.pop("file", None)
+            self.manifest["partitions"][month] = entry
+        self._save_manifest()
+        os.replace(path, path + ".migrated")
+
+    def _record(self, month, rows):
+        """Fold newly written rows into the month's manifest entry"""
+        entry = self.manifest["partitions"].setdefault(month, {
+            "worksheet": partition_worksheet(month), "state": "hot",
+            "rows": 0, "min_date": None, "max_date": None, "exercises": [],
+        })
+        dates = pd.to_datetime(rows['Date'], errors='coerce').dropna().dt.strftime('%Y-%m-%d')
+        if not dates.empty:
+            entry["min_date"] = min(filter(None, [entry["min_date"], dates.min()]))
+            entry["max_date"] = max(filter(None, [entry["max_date"], dates.max()]))
+        entry["exercises"] = sorted(set(entry["exercises"]) | set(rows['Exercise'].dropna().astype(str)))
+        entry["rows"] += len(rows)
+        # The archive no longer has every row; read the worksheet until it is compacted again
+        entry["state"] = "hot"
+
+    def _archive_path(self, month):
+        return os.path.join(self.archive_dir, f"logs_{month.replace('-', '_')}.parquet")
+
+    def partitions(self, start=None, end=None, exercises=None):
+        """Month names whose manifest entry overlaps the date range and exercises"""
+        wanted = set(exercises) if exercises else None
+        months = []
+        for month, entry in sorted(self.manifest["partitions"].items()):
+            if start is not None and entry["max_date"] and entry["max_date"] < str(start):
+                continue
+            if end is not None and entry["min_date"] and entry["min_date"] > str(end):
+                continue
+            if wanted is not None and not wanted & set(entry["exercises"]):
+                continue
+            months.append(month)
+        return months
+
+    def _archived_keys(self, month):
+        """Key set of an archived month, read once per archive (rows count) and process"""
+        rows = self.manifest["partitions"][month]["rows"]
+        cached = self.key_sets.get(month)
+        if cached is None or cached[0] != rows:
+            frame = self._read_partition(month)
+            keys = frozenset(frame['Key'].dropna()) if 'Key' in frame.columns else frozenset()
+            cached = self.key_sets[month] = (rows, keys)
+        return cached[1]
+
+    def _read_partition(self, month):
+        entry = self.manifest["partitions"][month]
+        path = self._archive_path(month)
+        # Another machine may have archived the month; its worksheet still has every row
+        if entry["state"] == "archived" and os.path.exists(path):
+            return pd.read_parquet(path)
+        return typed_logs(self.inner.read(entry["worksheet"]))
+
+    # ==========================================
+    # STORAGE INTERFACE
+    # ==========================================
+    @property
+    def batched(self):
+        return self.inner.batched
+
+    def read(self, worksheet):
+        if worksheet != LOGS:
+            return self.inner.read(worksheet)
+        return self.logs_between()
+
+    def read_many(self, worksheets):
+        frames = self.inner.read_many([ws for ws in worksheets if ws != LOGS])
+        if LOGS in worksheets:
+            frames[LOGS] = self.logs_between()
+        return frames
+
+    def append(self, worksheet, data):
+        if worksheet != LOGS:
+            return self.inner.append(worksheet, data)
+        if data is None or data.empty:
+            return 0
+        written = 0
+        with self._writing():
+            self._reload_for_write()
+            for month, rows in data.groupby(month_of(data['Date']).fillna('undated'), sort=True):
+                written += self.inner.append(partition_worksheet(month), rows)
+                self._record(month, rows)
+            self._save_manifest()
+        return written
+
+    def update(self, worksheet, data):
+        """Rewrite Logs as a whole: every partition is replaced by its rows in ``data``.
+
+        Partitions are rewritten in place, so incremental readers (see
+        ``changes``) must start over afterwards.
+        """
+        if worksheet != LOGS:
+            return self.inner.update(worksheet, data)
+        months = month_of(data['Date']).fillna('undated') if not data.empty else pd.Series(dtype=object)
+        groups = dict(tuple(data.groupby(months, sort=True))) if not data.empty else {}
+        with self._writing():
+            self._reload_for_write()
+            for month in sorted(set(self.manifest["partitions"]) | set(groups)):
+                rows = groups.get(month, data.iloc[0:0])
+                self.inner.update(partition_worksheet(month), rows)
+                self.manifest["partitions"].pop(month, None)
+                if os.path.exists(self._archive_path(month)):
+                    os.remove(self._archive_path(month))
+                if not rows.empty:
+                    self._record(month, rows)
+            self._save_manifest()
+
+    def query(self, worksheet, **filters):
+        if worksheet != LOGS:
+            return self.inner.query(worksheet, **filters)
+        exercise = filters.get('Exercise')
+        exercises = None if exercise is None else (
+            list(exercise) if isinstance(exercise, (list, tuple, set)) else [exercise]
+        )
+        if 'Key' in filters:
+            # Hot months are queried in place; an archived month is only read
+            # when its Key set (built once) has one of the keys
+            keys = filters['Key'] if isinstance(filters['Key'], (list, tuple, set)) else [filters['Key']]
+            frames = [
+                self.inner.query(partition_worksheet(m), **filters)
+                if self.manifest["partitions"][m]["state"] == "hot"
+                else _filter(self._read_partition(m), filters)
+                for m in self.partitions(exercises=exercises)
+                if self.manifest["partitions"][m]["state"] == "hot" or self._archived_keys(m) & set(keys)
+            ]
+            return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=LOG_COLUMNS)
+        return _filter(self.logs_between(exercises=exercises), filters)
+
+    def existing_keys(self, worksheet, keys, dates=None):
+        """Keys already stored, looked up only in the months of ``dates`` (all months without them)"""
+        if worksheet != LOGS:
+            return self.inner.existing_keys(worksheet, keys, dates)
+        months = self.partitions()
+        if dates is not None:
+            wanted = set(month_of(pd.Series(list(dates), dtype=object)).fillna('undated'))
+            months = [m for m in months if m in wanted]
+        keys = set(keys)
+        found = set()
+        for month in months:
+            if self.manifest["partitions"][month]["state"] == "hot":
+                found |= self.inner.existing_keys(partition_worksheet(month), keys)
+            else:
+                found |= self._archived_keys(month) & keys
+        return found
+
+    def tail(self, worksheet, start):
+        """Logs rows from position ``start`` on, in the month order ``read`` returns"""
+        if worksheet != LOGS:
+            return self.inner.tail(worksheet, start)
+        # Walk back from the newest month so only the months holding the tail are read
+        entries = self.manifest["partitions"]
+        total = sum(entry["rows"] for entry in entries.values())
+        frames = []
+        for month in sorted(entries, reverse=True):
+            if total <= start:
+                break
+            total -= entries[month]["rows"]
+            frames.append(self._read_partition(month).iloc[max(start - total, 0):])
+        if not frames:
+            return typed_logs(pd.DataFrame(columns=LOG_COLUMNS))
+        return pd.concat(frames[::-1], ignore_index=True)
+
+    def changes(self, worksheet, cursor=None):
+        """Rows added since ``cursor``, which maps each month to the rows already seen there.
+
+        Every partition keeps its own count, so rows added to an older
+        month are picked up without shifting any other month.
+        """
+        if worksheet != LOGS:
+            return self.inner.changes(worksheet, cursor)
+        self.refresh_manifest()
+        cursor = dict(cursor or {})
+        frames = []
+        for month, entry in sorted(self.manifest["partitions"].items()):
+            seen = cursor.get(month, 0)
+            if entry["state"] == "archived":
+                # Archived months are frozen until a new row turns them hot again
+                if seen >= entry["rows"]:
+                    continue
+                rows = self._read_partition(month).iloc[seen:]
+            else:
+                rows = typed_logs(self.inner.tail(entry["worksheet"], seen))
+            if not rows.empty:
+                frames.append(rows)
+                cursor[month] = seen + len(rows)
+        if not frames:
+            return typed_logs(pd.DataFrame(columns=LOG_COLUMNS)), cursor
+        return pd.concat(frames, ignore_index=True), cursor
+
+    def revision(self, worksheet):
+        if worksheet != LOGS:
+            return self.inner.revision(worksheet)
+        return sum(entry["rows"] for entry in self.manifest["partitions"].values())
+
+    # ==========================================
+    # LOG ACCESS
+    # ==========================================
+    def logs_between(self, start=None, end=None, exercises=None):
+        """Typed log rows in a date range, reading only overlapping partitions"""
+        frames = [self._read_partition(m) for m in self.partitions(start, end, exercises)]
+        if not frames:
+            return typed_logs(pd.DataFrame(columns=LOG_COLUMNS))
+        df = pd.concat(frames, ignore_index=True)
+        if start is not None:
+            df = df[df['Date'] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df['Date'] <= pd.Timestamp(end)]
+        if exercises:
+            df = df[df['Exercise'].isin(list(exercises))]
+        return df.reset_index(drop=True)
+
+    def recent(self):
+        """The current (latest) partition only, for recent-history views"""
+        months = [m for m in self.partitions() if m != 'undated']
+        if not months:
+            return typed_logs(pd.DataFrame(columns=LOG_COLUMNS))
+        return self._read_partition(months[-1])
+
+    def compact(self, today=None):
+        """Archive hot months older than ``hot_months`` into Parquet; returns months archived"""
+        today = pd.Timestamp(today) if today is not None else pd.Timestamp.today()
+        cutoff = (today.to_period('M') - self.hot_months + 1).strftime('%Y-%m')
+        archived = []
+        with self._writing():
+            self.refresh_manifest()
+            for month, entry in sorted(self.manifest["partitions"].items()):
+                if entry["state"] != "hot" or month == 'undated' or month >= cutoff:
+                    continue
+                df = typed_logs(self.inner.read(entry["worksheet"]))
+                df.to_parquet(self._archive_path(month), index=False)
+                archived.append((month, len(df)))
+            if archived:
+                self._reload_for_write()
+                for month, rows in archived:
+                    entry = self.manifest["partitions"].get(month)
+                    # Rows that arrived while the month was being copied keep it hot
+                    if entry is not None and entry["state"] == "hot" and entry["rows"] <= rows:
+                        entry["state"] = "archived"
+                        entry["rows"] = rows
+                self._save_manifest()
+        return [month for month, _ in archived]
+
+    def split_legacy(self):
+        """Move the single Logs worksheet into monthly partitions, once.
+
+        Rows without a Key get one from their position in the old sheet
+        (which no longer changes), and rows whose Key is already in their
+        partition are skipped, so a lost manifest never duplicates them.
+        """
+        if self.manifest["legacy"] is not None:
+            return 0
+        try:
+            legacy = self.inner.read(LOGS)
+        except Exception:
+            return 0
+        if legacy is None or legacy.empty:
+            return 0
+        legacy = legacy.dropna(how='all').reset_index(drop=True)
+        legacy = legacy.reindex(columns=LOG_COLUMNS + [c for c in legacy.columns if c not in LOG_COLUMNS])
+        keys = legacy['Key'].astype(object)
+        blank = keys.isna() | (keys.astype(str).str.strip() == "")
+        positional = pd.Series([
+            set_key(f"legacy:{i}", exercise, s) for i, exercise, s in legacy[['Exercise', 'Set']].itertuples(name=None)
+        ], index=legacy.index, dtype=object)
+        legacy['Key'] = keys.where(~blank, positional)
+
+        fresh, found = [], {}
+        for month, rows in legacy.groupby(month_of(legacy['Date']).fillna('undated'), sort=True):
+            try:
+                existing = self.inner.read(partition_worksheet(month))
+            except Exception:
+                existing = pd.DataFrame(columns=['Key'])
+            if not existing.empty and month not in self.manifest["partitions"]:
+                found[month] = existing
+            landed = set(existing['Key'].dropna().astype(str)) if 'Key' in existing.columns else set()
+            fresh.append(rows[~rows['Key'].astype(str).isin(landed)])
+        if found:
+            with self._writing():
+                self._reload_for_write()
+                # Partitions written before the manifest was lost
+                for month, existing in found.items():
+                    if month not in self.manifest["partitions"]:
+                        self._record(month, existing)
+                self._save_manifest()
+        moved = self.append(LOGS, pd.concat(fresh))
+        # Marked only once every row has landed, so a failed move is retried
+        with self._writing():
+            self._reload_for_write()
+            self.manifest["legacy"] = len(legacy)
+            self._save_manifest()
+        return moved
@@ -0,0 +1,136 @@
+"""Timing hooks for the hot paths.
+
+Every measurement goes to the process-wide recorder (scraped as
+Prometheus text) and to whatever recorders the current context is
+collecting into, which the app uses for per-rerun and per-session panels.
+"""
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger("ironos.perf")
+
+_active = contextvars.ContextVar("ironos_perf_recorders", default=())
+
+
+class Recorder:
+    """Count, total and max duration per (name, labels)"""
+
+    def __init__(self):
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def add(self, name, seconds, labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            count, total, worst = self.stats.get(key, (0, 0.0, 0.0))
+            self.stats[key] = (count + 1, total + seconds, max(worst, seconds))
+
+    def rows(self):
+        """One dict per metric, slowest total first"""
+        with self.lock:
+            items = list(self.stats.items())
+        rows = [{
+            "name": name,
+            "labels": ",".join(f"{k}={v}" for k, v in labels),
+            "count": count,
+            "total_ms": round(total * 1000, 2),
+            "mean_ms": round(total * 1000 / count, 2),
+            "max_ms": round(worst * 1000, 2),
+        } for (name, labels), (count, total, worst) in items]
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def total_ms(self, name):
+        with self.lock:
+            return sum(total for (n, _), (_, total, _) in self.stats.items() if n == name) * 1000
+
+    def clear(self):
+        with self.lock:
+            self.stats.clear()
+
+
+PROCESS = Recorder()
+
+
+def record(name, seconds, **labels):
+    PROCESS.add(name, seconds, labels)
+    for recorder in _active.get():
+        recorder.add(name, seconds, labels)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(json.dumps({"metric": name, "ms": round(seconds * 1000, 3), **labels}, default=str))
+
+
+def count(name, **labels):
+    """Record an event with no duration, e.g. a cache hit"""
+    record(name, 0.0, **labels)
+
+
+@contextlib.contextmanager
+def timed(name, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, **labels)
+
+
+def collect_into(*recorders):
+    """Also send measurements from this context to ``recorders``; returns a reset token"""
+    return _active.set(tuple(recorders))
+
+
+def log_summary(recorder, **labels):
+    """One structured line summarizing a rerun"""
+    log.info(json.dumps({"event": "rerun", **labels, "metrics": recorder.rows()}, default=str))
+
+
+# ==========================================
+# PROMETHEUS
+# ==========================================
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(recorder=PROCESS):
+    """Prometheus text exposition of a recorder"""
+    lines = [
+        "# HELP ironos_duration_seconds Time spent in IronOS hot paths.",
+        "# TYPE ironos_duration_seconds summary",
+    ]
+    maxima = ["# HELP ironos_duration_seconds_max Slowest observation.",
+              "# TYPE ironos_duration_seconds_max gauge"]
+    with recorder.lock:
+        items = sorted(recorder.stats.items())
+    for (name, labels), (n, total, worst) in items:
+        label_text = ",".join([f'name="{_escape(name)}"'] + [f'{k}="{_escape(v)}"' for k, v in labels])
+        lines.append(f"ironos_duration_seconds_count{{{label_text}}} {n}")
+        lines.append(f"ironos_duration_seconds_sum{{{label_text}}} {total:.6f}")
+        maxima.append(f"ironos_duration_seconds_max{{{label_text}}} {worst:.6f}")
+    return "\n".join(lines + maxima) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host="0.0.0.0"):
+    """Serve /metrics from a daemon thread; returns the server"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="ironos-metrics", daemon=True).start()
+    return server
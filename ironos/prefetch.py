@@ -0,0 +1,73 @@
+"""Upcoming program days, compiled ahead of time on a background thread.
+
+An athlete's place in a template is the last program day they logged
+(see ``Rollups.position``). The next few days after it are compiled on a
+worker thread while the athlete is still on the picker, so "today's
+workout" comes straight from memory. Entries are keyed by the library
+and profile versions, so an edited Master or Profile simply misses and
+is compiled again.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from ironos.cache import VersionedCache, frame_version
+from ironos.library import compile_library
+
+_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+_workouts = VersionedCache(maxsize=256, name="prefetch")
+
+
+def upcoming(index, position, count=3):
+    """The ``count`` program days after ``position`` in its template, as (template, week, day).
+
+    Logged positions are strings, so they are matched against the library
+    by text. Nothing is returned once the template is finished or when
+    the logged day is no longer in the library.
+    """
+    if not position:
+        return []
+    template, week, day = (str(v) for v in position)
+    match = next((t for t in index.templates if str(t) == template), None)
+    if match is None:
+        return []
+    sequence = [(match, w, d) for w in index.weeks(match) for d in index.days(match, w)]
+    for i, (_, w, d) in enumerate(sequence):
+        if (str(w), str(d)) == (week, day):
+            return sequence[i + 1:i + 1 + count]
+    return []
+
+
+def _future(key, index, df_profile, day):
+    def submit():
+        return _pool.submit(lambda: compile_library(index, df_profile).workout(*day))
+
+    future = _workouts.get(key, submit)
+    if future.done() and (future.cancelled() or future.exception() is not None):
+        # A failed compile is not remembered; the next request tries again
+        _workouts.discard(key, future)
+        future = _workouts.get(key, submit)
+    return future
+
+
+def prefetch(index, df_profile, days):
+    """Start compiling ``days`` for this profile unless they are cached or in flight"""
+    versions = (index.version, frame_version(df_profile))
+    for day in days:
+        _future(versions + tuple(day), index, df_profile, day)
+
+
+def prefetched_workout(index, df_profile, day):
+    """Workout queue for one day: its prefetch if done or running, else compiled right here.
+
+    The pool is shared by every session, so a day still queued behind
+    other athletes' prefetches is taken out of the queue and compiled on
+    the caller's thread instead of waiting its turn.
+    """
+    key = (index.version, frame_version(df_profile)) + tuple(day)
+    future = _future(key, index, df_profile, day)
+    if future.cancel():
+        _workouts.discard(key, future)
+        queue = compile_library(index, df_profile).workout(*day)
+    else:
+        queue = future.result()
+    # A fresh list per load, so session state sees a new plan
+    return [dict(entry) for entry in queue]
@@ -0,0 +1,124 @@
+"""Declared column types for every worksheet, applied once at load time.
+
+Sheets arrive as strings; ``coerce`` turns them into compact dtypes
+(categoricals for repeated labels, nullable small ints, float32) so
+cached frames are smaller and filters/groupbys skip string parsing.
+Values that don't fit their column become missing and are reported as
+row-level issues instead of failing the whole sheet.
+"""
+import numpy as np
+import pandas as pd
+
+from ironos.storage import WORKSHEETS
+
+# Multi-value cells like Master Reps/Pct ("5,5,3+") stay plain strings
+SCHEMAS = {
+    'Master': {
+        'Template': 'category', 'Week': 'category', 'Day': 'category',
+        'Exercise': 'category', 'Sets': 'Int16', 'Reps': 'str', 'Pct': 'str',
+        'Category': 'category',
+    },
+    'Profile': {'Athlete': 'str', 'Lift': 'str', 'Max': 'float32'},
+    'Directory': {'Exercise': 'str', 'Aliases': 'str'},
+    'Logs': {
+        'Date': 'date', 'Athlete': 'category', 'Template': 'category', 'Week': 'category', 'Day': 'category',
+        'Exercise': 'category', 'ExerciseId': 'category',
+        'Set': 'Int16', 'Weight': 'float32', 'Reps': 'Int16', 'RPE': 'float32', 'Key': 'str',
+    },
+}
+
+REQUIRED = {
+    'Master': ['Template', 'Week', 'Day', 'Exercise'],
+    'Profile': ['Lift'],
+    'Directory': ['Exercise'],
+    'Logs': ['Date', 'Exercise'],
+}
+
+_EXPECTED = {
+    'Int16': "a whole number",
+    'float32': "a number",
+    'date': "a date",
+}
+
+
+class Issue:
+    """One value that failed validation; ``row`` is the sheet row number"""
+    __slots__ = ('worksheet', 'row', 'column', 'value', 'message')
+
+    def __init__(self, worksheet, row, column, value, message):
+        self.worksheet = worksheet
+        self.row = row
+        self.column = column
+        self.value = value
+        self.message = message
+
+    def __str__(self):
+        return f"{self.worksheet} row {self.row}, {self.column}: {self.message}"
+
+    def __repr__(self):
+        return f"Issue({self})"
+
+
+def _sheet_rows(index):
+    """Sheet row numbers for frame labels (row 1 is the header)"""
+    if pd.api.types.is_integer_dtype(index):
+        return index.to_numpy() + 2
+    return np.arange(len(index)) + 2
+
+
+def _blank(s):
+    """Mask of missing or whitespace-only cells (object or pandas string dtype)"""
+    blank = s.isna().to_numpy(copy=True)
+    if pd.api.types.is_string_dtype(s) or pd.api.types.is_object_dtype(s):
+        blank |= s.astype(str).str.strip().eq("").to_numpy()
+    return blank
+
+
+def _convert(raw, kind):
+    """Converted column and a mask of values that could not be converted"""
+    blank = _blank(raw)
+    values = raw.where(~blank)
+    if kind == 'category':
+        return values.astype('category'), np.zeros(len(raw), dtype=bool)
+    if kind == 'date':
+        converted = pd.to_datetime(values, errors='coerce')
+    else:
+        converted = pd.to_numeric(values, errors='coerce').astype('float64')
+        converted = converted.where(np.isfinite(converted))
+        if kind == 'Int16':
+            converted = np.trunc(converted).where(converted.abs() < 2 ** 15)
+        converted = converted.astype(kind)
+    bad = converted.isna().to_numpy() & ~blank
+    return converted, bad
+
+
+def coerce(df, worksheet):
+    """Typed copy of a worksheet frame plus a list of Issue for invalid cells"""
+    schema = SCHEMAS.get(worksheet, {})
+    if df is None or df.empty:
+        df = pd.DataFrame(columns=WORKSHEETS.get(worksheet, list(schema)))
+    df = df.copy()
+    issues = []
+    reported = set()
+    rows = _sheet_rows(df.index)
+    for column, kind in schema.items():
+        if column not in df.columns or kind == 'str':
+            continue
+        raw = df[column]
+        converted, bad = _convert(raw, kind)
+        for pos in bad.nonzero()[0]:
+            value = raw.iat[pos]
+            reported.add((pos, column))
+            issues.append(Issue(worksheet, int(rows[pos]), column, value,
+                                f"{value!r} is not {_EXPECTED[kind]}"))
+        df[column] = converted
+    for column in REQUIRED.get(worksheet, []):
+        if column not in df.columns:
+            continue
+        missing = _blank(df[column])
+        for pos in missing.nonzero()[0]:
+            # Invalid cells were already reported above
+            if (pos, column) not in reported:
+                issues.append(Issue(worksheet, int(rows[pos]), column, None, "missing"))
+    issues.sort(key=lambda i: i.row)
+    return df, issues
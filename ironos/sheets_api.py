@@ -0,0 +1,245 @@
+"""Asyncio Google Sheets v4 client with batched reads and pooled connections.
+
+One event loop thread per client owns an httpx.AsyncClient (a keep-alive
+connection pool) and a semaphore, so every Streamlit session shares the
+same connections and in-flight requests stay bounded. Range reads issued
+within ``batch_window`` seconds of each other, from any session, are
+coalesced into a single ``values:batchGet`` request.
+
+httpx is optional; install it to use the ``sheets_api`` backend.
+"""
+import asyncio
+import threading
+import time
+import urllib.parse
+
+import pandas as pd
+
+from ironos import perf
+from ironos.storage import Storage, _check_header, _column_letter, _to_values
+
+SHEETS_URL = "https://sheets.googleapis.com"
+DRIVE_URL = "https://www.googleapis.com"
+MAX_RANGES = 100  # ranges per batchGet request
+
+
+def quote_sheet(worksheet):
+    """Worksheet name as it appears in A1 notation"""
+    return "'" + worksheet.replace("'", "''") + "'"
+
+
+def _cells(rows):
+    """JSON-safe cell values (numpy scalars become numbers, timestamps and other objects strings)"""
+    rows = [[v.item() if hasattr(v, "item") and not isinstance(v, str) else v for v in row] for row in rows]
+    return [[v if v is None or isinstance(v, (str, int, float, bool)) else str(v) for v in row] for row in rows]
+
+
+class SheetsClient:
+    """Blocking facade over an asyncio client; safe to share between threads"""
+
+    def __init__(self, spreadsheet_id, token=None, base_url=SHEETS_URL, drive_url=DRIVE_URL,
+                 max_concurrency=8, max_connections=16, batch_window=0.005, timeout=30.0):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("The sheets_api backend needs httpx (pip install httpx)") from None
+        self.httpx = httpx
+        self.spreadsheet_id = spreadsheet_id
+        self.token = token
+        self.base = f"{base_url.rstrip('/')}/v4/spreadsheets/{urllib.parse.quote(spreadsheet_id, safe='')}"
+        self.drive_url = drive_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self.pending = {}
+        self.flush_handle = None
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="sheets-api", daemon=True)
+        self.thread.start()
+        self.run(self._setup())
+
+    async def _setup(self):
+        # Created on the loop thread so they bind to this loop
+        limits = self.httpx.Limits(max_connections=self.max_connections,
+                                   max_keepalive_connections=self.max_connections)
+        self.client = self.httpx.AsyncClient(timeout=self.timeout, limits=limits)
+        self.limit = asyncio.Semaphore(self.max_concurrency)
+
+    def run(self, coro):
+        """Run a coroutine on the client's loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        self.run(self.client.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _headers(self):
+        token = self.token() if callable(self.token) else self.token
+        return {"Authorization": f"Bearer {token}"} if token else {}
+
+    async def _request(self, method, url, **kwargs):
+        # A token callable may refresh over HTTP; keep that blocking call off the loop
+        headers = await asyncio.to_thread(self._headers) if callable(self.token) else self._headers()
+        async with self.limit:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    # ==========================================
+    # BATCHED READS
+    # ==========================================
+    async def get_ranges(self, ranges):
+        """Values (lists of rows) for each A1 range; concurrent callers share requests"""
+        futures = []
+        for name in ranges:
+            future = self.pending.get(name)
+            if future is None:
+                future = self.pending[name] = self.loop.create_future()
+            futures.append(future)
+        if self.flush_handle is None:
+            self.flush_handle = self.loop.call_later(self.batch_window, self._flush)
+        return await asyncio.gather(*futures)
+
+    def _flush(self):
+        self.flush_handle = None
+        items = list(self.pending.items())
+        self.pending = {}
+        for i in range(0, len(items), MAX_RANGES):
+            self.loop.create_task(self._batch_get(dict(items[i:i + MAX_RANGES])))
+
+    async def _batch_get(self, batch):
+        params = [("ranges", name) for name in batch] + [("majorDimension", "ROWS")]
+        try:
+            with perf.timed("sheets.batch_get", ranges=str(len(batch))):
+                data = await self._request("GET", f"{self.base}/values:batchGet", params=params)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        value_ranges = data.get("valueRanges", [])
+        for i, future in enumerate(batch.values()):
+            if not future.done():
+                future.set_result(value_ranges[i].get("values", []) if i < len(value_ranges) else [])
+
+    def batch_get(self, ranges):
+        return self.run(self.get_ranges(list(ranges)))
+
+    # ==========================================
+    # WRITES AND METADATA
+    # ==========================================
+    def _values_url(self, name, action=""):
+        return f"{self.base}/values/{urllib.parse.quote(name, safe='')}{action}"
+
+    def append_rows(self, worksheet, rows):
+        params = {"valueInputOption": "RAW", "insertDataOption": "INSERT_ROWS"}
+        body = {"majorDimension": "ROWS", "values": _cells(rows)}
+        return self.run(self._request("POST", self._values_url(quote_sheet(worksheet), ":append"),
+                                      params=params, json=body))
+
+    def replace(self, worksheet, rows):
+        """Clear a worksheet and write ``rows`` from A1"""
+        async def replace():
+            name = quote_sheet(worksheet)
+            await self._request("POST", self._values_url(name, ":clear"), json={})
+            await self._request("PUT", self._values_url(f"{name}!A1"), params={"valueInputOption": "RAW"},
+                                json={"majorDimension": "ROWS", "values": _cells(rows)})
+        return self.run(replace())
+
+    def add_sheet(self, title):
+        body = {"requests": [{"addSheet": {"properties": {"title": title}}}]}
+        return self.run(self._request("POST", f"{self.base}:batchUpdate", json=body))
+
+    def modified_time(self):
+        url = f"{self.drive_url}/drive/v3/files/{urllib.parse.quote(self.spreadsheet_id, safe='')}"
+        params = {"fields": "modifiedTime", "supportsAllDrives": "true"}
+        return self.run(self._request("GET", url, params=params)).get("modifiedTime")
+
+
+def _frame(values, header=None):
+    """Sheet rows as a frame; the first row is the header unless one is given"""
+    if header is None:
+        header, values = (values[0], values[1:]) if values else ([], [])
+    width = len(header)
+    rows = [(row + [""] * width)[:width] for row in values if any(row)]
+    df = pd.DataFrame(rows, columns=header)
+    return df.mask(df.eq(""))
+
+
+class SheetsAPIStorage(Storage):
+    """Backend over SheetsClient: several worksheets per request, rows appended in place"""
+
+    batched = True
+
+    def __init__(self, client, revision_ttl=1.0):
+        self.client = client
+        self.revision_ttl = revision_ttl
+        self.headers = {}
+        self.modified = (0.0, None)
+
+    def read(self, worksheet):
+        return self.read_many([worksheet])[worksheet]
+
+    def read_many(self, worksheets):
+        worksheets = list(worksheets)
+        with perf.timed("conn.read", worksheet=",".join(worksheets)):
+            values = self.client.batch_get([quote_sheet(ws) for ws in worksheets])
+        frames = {ws: _frame(rows) for ws, rows in zip(worksheets, values)}
+        for ws, df in frames.items():
+            self.headers[ws] = list(df.columns)
+        return frames
+
+    def revision(self, worksheet):
+        """Spreadsheet modified time, shared by every tab and reused for ``revision_ttl`` seconds"""
+        checked, value = self.modified
+        if time.monotonic() - checked < self.revision_ttl:
+            return value
+        try:
+            value = self.client.modified_time()
+        except Exception:
+            value = None
+        self.modified = (time.monotonic(), value)
+        return value
+
+    def _header(self, worksheet):
+        if worksheet not in self.headers:
+            rows = self.client.batch_get([f"{quote_sheet(worksheet)}!1:1"])[0]
+            self.headers[worksheet] = [h for h in (rows[0] if rows else []) if h]
+        return self.headers[worksheet]
+
+    def tail(self, worksheet, start):
+        """Only the rows below ``start``, with a cached header"""
+        header = self._header(worksheet)
+        if not header:
+            return pd.DataFrame()
+        with perf.timed("conn.tail", worksheet=worksheet):
+            rows = self.client.batch_get([f"{quote_sheet(worksheet)}!A{start + 2}:{_column_letter(len(header))}"])[0]
+        return _frame(rows, header)
+
+    def update(self, worksheet, data):
+        with perf.timed("conn.update", worksheet=worksheet):
+            self.client.replace(worksheet, [list(data.columns)] + _to_values(data, list(data.columns)))
+        self.headers[worksheet] = list(data.columns)
+
+    def append(self, worksheet, data):
+        if data is None or data.empty:
+            return 0
+        with perf.timed("conn.append", worksheet=worksheet):
+            try:
+                header = self._header(worksheet)
+            except self.client.httpx.HTTPStatusError as e:
+                # Reading a missing tab is a 400; new tabs are created on first write
+                if e.response.status_code != 400:
+                    raise
+                self.client.add_sheet(worksheet)
+                header = []
+            if not header:
+                header = list(data.columns)
+                self.client.append_rows(worksheet, [header] + _to_values(data, header))
+                self.headers[worksheet] = header
+            else:
+                _check_header(worksheet, header, data)
+                self.client.append_rows(worksheet, _to_values(data, header))
+        return len(data)
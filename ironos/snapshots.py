@@ -0,0 +1,191 @@
+"""Local snapshots of in-progress workouts, restored when a client reconnects.
+
+A snapshot is one row per (athlete, day) with the workout id, plan and
+builder queue, plus one row per exercise holding its actual values. Edits
+only touch the exercise they belong to; they are coalesced in memory and
+written in one transaction every ``interval`` seconds by SnapshotWriter,
+so an input change never waits on disk.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from ironos import perf
+from ironos.workout import WorkoutSession
+
+
+def _plain(value):
+    """JSON fallback for numpy scalars and other plan values"""
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class SnapshotStore:
+    """Session snapshots in a local SQLite WAL file, with a write buffer"""
+
+    def __init__(self, path="ironos_snapshots.db"):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.pruned = ""
+        with self.lock, self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " athlete TEXT NOT NULL, day TEXT NOT NULL, workout_id TEXT, plan TEXT NOT NULL,"
+                " builder TEXT NOT NULL, updated REAL NOT NULL, PRIMARY KEY (athlete, day))"
+            )
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS exercises ("
+                " athlete TEXT NOT NULL, day TEXT NOT NULL, position INTEGER NOT NULL, workout_id TEXT NOT NULL,"
+                " weight TEXT NOT NULL, reps TEXT NOT NULL, rpe TEXT NOT NULL,"
+                " PRIMARY KEY (athlete, day, position))"
+            )
+
+    # ==========================================
+    # BUFFERED WRITES
+    # ==========================================
+    def _entry(self, athlete, day):
+        return self.pending.setdefault((athlete, day), {"discard": False, "session": None, "exercises": {}})
+
+    def put_session(self, athlete, day, workout_id, plan, builder):
+        """Record the active plan (workout_id None when there is none) and the builder queue"""
+        row = (workout_id, json.dumps(plan, default=_plain), json.dumps(builder, default=_plain))
+        with self.pending_lock:
+            self._entry(athlete, day)["session"] = row
+
+    def put_exercise(self, athlete, day, workout_id, position, log):
+        """Record the actual values of one exercise; later calls replace earlier ones"""
+        row = (workout_id, json.dumps(log.weight.tolist()), json.dumps(log.reps.tolist()),
+               json.dumps(log.rpe.tolist()))
+        with self.pending_lock:
+            self._entry(athlete, day)["exercises"][position] = row
+
+    def discard(self, athlete, day):
+        """Forget the snapshot, e.g. once the workout is saved"""
+        with self.pending_lock:
+            self.pending[(athlete, day)] = {"discard": True, "session": None, "exercises": {}}
+
+    def flush(self):
+        """Write buffered changes in one transaction; returns the number of snapshots touched"""
+        with self.pending_lock:
+            batch, self.pending = self.pending, {}
+        if not batch:
+            return 0
+        try:
+            self._write(batch)
+        except Exception:
+            self._requeue(batch)
+            raise
+        return len(batch)
+
+    def _requeue(self, batch):
+        """Put a failed batch back under anything buffered since"""
+        with self.pending_lock:
+            for key, older in batch.items():
+                newer = self.pending.get(key)
+                if newer is None:
+                    self.pending[key] = older
+                elif not newer["discard"]:
+                    newer["discard"] = older["discard"]
+                    newer["session"] = newer["session"] or older["session"]
+                    newer["exercises"] = {**older["exercises"], **newer["exercises"]}
+
+    def _write(self, batch):
+        now = time.time()
+        with perf.timed("snapshot.flush"), self.lock, self.db:
+            for (athlete, day), entry in batch.items():
+                key = (athlete, day)
+                if entry["discard"]:
+                    self.db.execute("DELETE FROM sessions WHERE athlete = ? AND day = ?", key)
+                    self.db.execute("DELETE FROM exercises WHERE athlete = ? AND day = ?", key)
+                exercises = entry["exercises"]
+                if entry["session"] is not None:
+                    workout_id, plan, builder = entry["session"]
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO sessions (athlete, day, workout_id, plan, builder, updated)"
+                        " VALUES (?, ?, ?, ?, ?, ?)", key + (workout_id, plan, builder, now))
+                    # Values of an earlier workout no longer apply
+                    self.db.execute("DELETE FROM exercises WHERE athlete = ? AND day = ? AND workout_id IS NOT ?",
+                                    key + (workout_id,))
+                    exercises = {p: row for p, row in exercises.items() if row[0] == workout_id}
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO exercises (athlete, day, position, workout_id, weight, reps, rpe)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [key + (position,) + row for position, row in exercises.items()],
+                )
+
+    # ==========================================
+    # READS
+    # ==========================================
+    def load(self, athlete, day):
+        """Snapshot dict (workout_id, plan, builder, values by position), or None"""
+        self.flush()
+        with perf.timed("snapshot.load"), self.lock:
+            session = self.db.execute(
+                "SELECT workout_id, plan, builder FROM sessions WHERE athlete = ? AND day = ?", (athlete, day)
+            ).fetchone()
+            if session is None:
+                return None
+            workout_id, plan, builder = session
+            rows = self.db.execute(
+                "SELECT position, weight, reps, rpe FROM exercises WHERE athlete = ? AND day = ? AND workout_id = ?",
+                (athlete, day, workout_id),
+            ).fetchall()
+        return {
+            "workout_id": workout_id,
+            "plan": json.loads(plan),
+            "builder": json.loads(builder),
+            "values": {position: tuple(map(json.loads, values)) for position, *values in rows},
+        }
+
+    def prune(self, before_day):
+        """Drop snapshots from days before ``before_day`` (ISO dates); a no-op once done for that day"""
+        if before_day <= self.pruned:
+            return
+        self.pruned = before_day
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM sessions WHERE day < ?", (before_day,))
+            self.db.execute("DELETE FROM exercises WHERE day < ?", (before_day,))
+
+
+def restore(snapshot):
+    """(workout_queue, builder_queue, WorkoutSession or None) from a snapshot"""
+    if snapshot is None:
+        return [], [], None
+    plan = snapshot["plan"]
+    if not plan or not snapshot["workout_id"]:
+        return [], snapshot["builder"], None
+    session = WorkoutSession(plan, workout_id=snapshot["workout_id"])
+    for position, (weight, reps, rpe) in snapshot["values"].items():
+        if position < len(session.logs) and len(weight) == session.logs[position].sets:
+            log = session.logs[position]
+            log.weight[:] = weight
+            log.reps[:] = reps
+            log.rpe[:] = rpe
+    return plan, snapshot["builder"], session
+
+
+class SnapshotWriter(threading.Thread):
+    """Flushes a SnapshotStore's buffer every ``interval`` seconds"""
+
+    def __init__(self, store, interval=0.5):
+        super().__init__(name="ironos-snapshots", daemon=True)
+        self.store = store
+        self.interval = interval
+        self.stopping = threading.Event()
+
+    def stop(self):
+        self.stopping.set()
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            try:
+                self.store.flush()
+            except Exception:
+                # Snapshots are best effort; saved workouts go through the journal
+                perf.count("snapshot.error")
+        self.store.flush()
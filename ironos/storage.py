@@ -0,0 +1,441 @@
+"""Worksheet storage backends.
+
+Every backend exposes the same small interface over the Master, Profile,
+Directory and Logs worksheets: ``read``, ``append``, ``query`` and
+``update`` (full rewrite, kept only as a fallback).
+"""
+import sqlite3
+import threading
+
+import pandas as pd
+
+from ironos import perf
+
+LOG_COLUMNS = ['Date', 'Athlete', 'Template', 'Week', 'Day', 'Exercise', 'ExerciseId', 'Set', 'Weight', 'Reps', 'RPE', 'Key']
+
+WORKSHEETS = {
+    'Master': ['Template', 'Week', 'Day', 'Exercise', 'Sets', 'Reps', 'Pct', 'Category'],
+    'Profile': ['Athlete', 'Lift', 'Max'],
+    'Directory': ['Exercise'],
+    'Logs': LOG_COLUMNS,
+}
+
+# Columns added in later versions; sheets without them simply don't store them
+OPTIONAL_COLUMNS = {'Template', 'Week', 'Day', 'ExerciseId', 'Key'}
+
+INDEXES = {
+    'Master': [('Template', 'Week', 'Day')],
+    'Logs': [('Exercise', 'Date'), ('Athlete', 'Date'), ('Key',)],
+}
+
+
+def _filter(df, filters):
+    """Apply column == value (or column in [values]) filters to a frame"""
+    if df.empty or not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for col, value in filters.items():
+        if col not in df.columns:
+            return df.iloc[0:0]
+        if isinstance(value, (list, tuple, set)):
+            mask &= df[col].isin(list(value))
+        else:
+            mask &= df[col] == value
+    return df[mask]
+
+
+class Storage:
+    """Interface shared by all worksheet backends"""
+
+    # True when read_many costs a single round trip
+    batched = False
+
+    def read(self, worksheet):
+        raise NotImplementedError
+
+    def read_many(self, worksheets):
+        """Dict of worksheet -> frame"""
+        return {worksheet: self.read(worksheet) for worksheet in worksheets}
+
+    def append(self, worksheet, data):
+        """Append rows, returns the number of rows written"""
+        raise NotImplementedError
+
+    def update(self, worksheet, data):
+        """Replace the whole worksheet"""
+        raise NotImplementedError
+
+    def query(self, worksheet, **filters):
+        """Rows where each column equals the given value (or is in the given list)"""
+        return _filter(self.read(worksheet), filters)
+
+    def existing_keys(self, worksheet, keys, dates=None):
+        """The subset of ``keys`` already stored in the Key column.
+
+        ``dates`` (the Date values of the rows being checked) lets
+        partitioned backends skip months none of them belong to.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = set()
+        for i in range(0, len(keys), 500):
+            rows = self.query(worksheet, Key=keys[i:i + 500])
+            if 'Key' in rows.columns:
+                found.update(rows['Key'].dropna())
+        return found
+
+    def tail(self, worksheet, start):
+        """Rows from position ``start`` on, for incremental readers"""
+        return self.read(worksheet).iloc[start:].reset_index(drop=True)
+
+    def changes(self, worksheet, cursor=None):
+        """(rows added since ``cursor``, new cursor) for incremental readers.
+
+        The cursor is opaque to callers and JSON-serializable; for a single
+        append-only worksheet it is the number of rows already seen.
+        """
+        start = cursor or 0
+        rows = self.tail(worksheet, start)
+        return rows, start + len(rows)
+
+    def revision(self, worksheet):
+        """Cheap change marker for a worksheet, or None if the backend has none"""
+        return None
+
+
+# ==========================================
+# GOOGLE SHEETS
+# ==========================================
+def _to_values(df, header):
+    """Order frame columns to match the sheet header and blank out NaNs.
+
+    Values are plain Python scalars: they are written RAW, so numbers stay
+    numbers and strings (such as Keys) stay text instead of being parsed
+    as dates or formulas by Sheets.
+    """
+    df = df.reindex(columns=header)
+    rows = df.astype(object).where(pd.notna(df), "").values.tolist()
+    return [[v.item() if hasattr(v, "item") else v for v in row] for row in rows]
+
+
+def _check_header(worksheet, header, data):
+    """Refuse to append when the sheet header would silently drop data.
+
+    Rows are reindexed to the header, so a column the sheet lacks is lost;
+    that is only acceptable for the optional columns.
+    """
+    dropped = [c for c in data.columns
+               if c not in header and c not in OPTIONAL_COLUMNS and data[c].notna().any()]
+    if dropped:
+        raise ValueError(f"{worksheet} header is missing {', '.join(dropped)}; add the column to row 1")
+
+
+def _column_letter(n):
+    """1 -> A, 27 -> AA"""
+    letters = ""
+    n = max(n, 1)
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class GSheetsStorage(Storage):
+    """Backend over an st-gsheets-connection GSheetsConnection"""
+
+    rewrite_lock = threading.Lock()
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def read(self, worksheet):
+        with perf.timed("conn.read", worksheet=worksheet):
+            return self.conn.read(worksheet=worksheet, ttl=0, dtype=str)
+
+    def update(self, worksheet, data):
+        with perf.timed("conn.update", worksheet=worksheet):
+            self.conn.update(worksheet=worksheet, data=data)
+
+    def _open_spreadsheet(self):
+        """Return the gspread spreadsheet behind the connection, or None.
+
+        This goes through the connection's private ``client._open_spreadsheet``;
+        if a release of st-gsheets-connection renames or changes it, every
+        caller falls back to the public read/update API instead of failing.
+        """
+        client = getattr(self.conn, 'client', None)
+        opener = getattr(client, '_open_spreadsheet', None)
+        if not callable(opener):
+            return None
+        try:
+            spreadsheet = opener()
+        except Exception:
+            perf.count("conn.spreadsheet_unavailable")
+            return None
+        if not all(callable(getattr(spreadsheet, name, None)) for name in ('worksheet', 'add_worksheet')):
+            perf.count("conn.spreadsheet_unavailable")
+            return None
+        return spreadsheet
+
+    def _open_worksheet(self, worksheet):
+        """Return the gspread worksheet behind the connection, or None"""
+        spreadsheet = self._open_spreadsheet()
+        if spreadsheet is None:
+            return None
+        try:
+            return spreadsheet.worksheet(worksheet)
+        except Exception:
+            return None
+
+    def revision(self, worksheet):
+        """Spreadsheet modified time from Drive metadata.
+
+        Sheets has no per-tab revision, so any edit to the spreadsheet
+        invalidates every tab; still far cheaper than downloading them.
+        """
+        spreadsheet = self._open_spreadsheet()
+        if spreadsheet is None:
+            return None
+        try:
+            getter = getattr(spreadsheet, 'get_lastUpdateTime', None)
+            return getter() if getter else spreadsheet.lastUpdateTime
+        except Exception:
+            return None
+
+    def tail(self, worksheet, start):
+        """Fetch only the rows below ``start`` (plus the header row)"""
+        ws = self._open_worksheet(worksheet)
+        if ws is None:
+            return super().tail(worksheet, start)
+        with perf.timed("conn.tail", worksheet=worksheet):
+            header = ws.row_values(1)
+            values = ws.get_values(f"A{start + 2}:{_column_letter(len(header))}") if header else []
+        rows = [row + [""] * (len(header) - len(row)) for row in values if any(row)]
+        df = pd.DataFrame(rows, columns=header)
+        return df.mask(df.eq(""))
+
+    def rewrite(self, worksheet, data):
+        """Fallback append: read the whole worksheet, concat, write it all back.
+
+        Best effort, used only when the connection exposes no spreadsheet
+        handle. Writers in this process are serialized, but the connection
+        has no conditional write, so rows another process appends between
+        the read and the write are lost.
+        """
+        with self.rewrite_lock:
+            current = self.read(worksheet)
+            if current is None or current.empty:
+                current = pd.DataFrame(columns=data.columns)
+            self.update(worksheet, pd.concat([current, data], ignore_index=True))
+        return len(data)
+
+    def append(self, worksheet, data):
+        """Send only the new rows (plus a one-row header lookup)"""
+        if data is None or data.empty:
+            return 0
+
+        with perf.timed("conn.append", worksheet=worksheet):
+            return self._append(worksheet, data)
+
+    def _append(self, worksheet, data):
+        spreadsheet = self._open_spreadsheet()
+        if spreadsheet is None:
+            return self.rewrite(worksheet, data)
+        try:
+            ws = spreadsheet.worksheet(worksheet)
+        except Exception as e:
+            # New tabs (e.g. a new monthly Logs partition) are created on first write
+            if type(e).__name__ != "WorksheetNotFound":
+                raise
+            ws = spreadsheet.add_worksheet(title=worksheet, rows=1000, cols=max(len(data.columns), 1))
+
+        header = [h for h in ws.row_values(1) if h]
+        if not header:
+            header = list(data.columns)
+            ws.append_rows([header] + _to_values(data, header), value_input_option="RAW")
+        else:
+            _check_header(worksheet, header, data)
+            ws.append_rows(_to_values(data, header), value_input_option="RAW")
+        return len(data)
+
+
+# ==========================================
+# IN-MEMORY
+# ==========================================
+class MemoryStorage(Storage):
+    """Frames kept in process memory; used when no backend is reachable"""
+
+    def __init__(self, frames=None):
+        self.frames = dict(frames or {})
+        self.revisions = {}
+        self.lock = threading.Lock()
+
+    def revision(self, worksheet):
+        return self.revisions.get(worksheet, 0)
+
+    def tail(self, worksheet, start):
+        with self.lock:
+            df = self.frames.get(worksheet)
+        if df is None:
+            return pd.DataFrame(columns=WORKSHEETS.get(worksheet, []))
+        return df.iloc[start:].reset_index(drop=True)
+
+    def read(self, worksheet):
+        with self.lock:
+            df = self.frames.get(worksheet)
+        if df is None:
+            return pd.DataFrame(columns=WORKSHEETS.get(worksheet, []))
+        return df.copy()
+
+    def append(self, worksheet, data):
+        if data is None or data.empty:
+            return 0
+        with self.lock:
+            current = self.frames.get(worksheet)
+            if current is None or current.empty:
+                self.frames[worksheet] = data.reset_index(drop=True)
+            else:
+                self.frames[worksheet] = pd.concat([current, data], ignore_index=True)
+            self.revisions[worksheet] = self.revisions.get(worksheet, 0) + 1
+        return len(data)
+
+    def update(self, worksheet, data):
+        with self.lock:
+            self.frames[worksheet] = data.reset_index(drop=True)
+            self.revisions[worksheet] = self.revisions.get(worksheet, 0) + 1
+
+
+# ==========================================
+# LOCAL SQLITE
+# ==========================================
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SQLiteStorage(Storage):
+    """Local SQLite file with one table per worksheet.
+
+    Values are stored as TEXT, matching how the sheets are read with
+    ``dtype=str``. Master is indexed on (Template, Week, Day) and Logs on
+    (Exercise, Date) so ``query`` avoids full scans. A ``_revisions``
+    table is bumped in the same transaction as every write.
+    """
+
+    def __init__(self, path="ironos.db"):
+        self.path = path
+        # Other processes may hold the write lock briefly; wait rather than fail
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.lock = threading.Lock()
+        with self.lock, self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS _revisions (worksheet TEXT PRIMARY KEY, rev INTEGER NOT NULL)"
+            )
+            for worksheet, columns in WORKSHEETS.items():
+                self._ensure_table(worksheet, columns)
+
+    def _bump(self, worksheet):
+        self.db.execute(
+            "INSERT INTO _revisions (worksheet, rev) VALUES (?, 1) "
+            "ON CONFLICT(worksheet) DO UPDATE SET rev = rev + 1",
+            (worksheet,),
+        )
+
+    def revision(self, worksheet):
+        with self.lock:
+            row = self.db.execute("SELECT rev FROM _revisions WHERE worksheet = ?", (worksheet,)).fetchone()
+        return row[0] if row else 0
+
+    def _columns(self, worksheet):
+        rows = self.db.execute(f"PRAGMA table_info({_quote(worksheet)})").fetchall()
+        return [r[1] for r in rows]
+
+    def _ensure_table(self, worksheet, columns):
+        existing = self._columns(worksheet)
+        if not existing:
+            cols = ", ".join(f"{_quote(c)} TEXT" for c in columns)
+            self.db.execute(f"CREATE TABLE {_quote(worksheet)} ({cols})")
+            existing = list(columns)
+        for col in columns:
+            if col not in existing:
+                self.db.execute(f"ALTER TABLE {_quote(worksheet)} ADD COLUMN {_quote(col)} TEXT")
+                existing.append(col)
+        for index_cols in INDEXES.get(worksheet, []):
+            if all(c in existing for c in index_cols):
+                name = _quote(f"idx_{worksheet}_{'_'.join(index_cols)}")
+                cols = ", ".join(_quote(c) for c in index_cols)
+                self.db.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {_quote(worksheet)} ({cols})")
+        return existing
+
+    def _select(self, worksheet, where="", params=(), offset=0):
+        with self.lock:
+            columns = self._columns(worksheet)
+            if not columns:
+                return pd.DataFrame(columns=WORKSHEETS.get(worksheet, []))
+            cols = ", ".join(_quote(c) for c in columns)
+            rows = self.db.execute(
+                f"SELECT {cols} FROM {_quote(worksheet)}{where} ORDER BY rowid LIMIT -1 OFFSET ?",
+                (*params, offset),
+            ).fetchall()
+        return pd.DataFrame(rows, columns=columns)
+
+    def _insert(self, worksheet, data):
+        columns = [str(c) for c in data.columns]
+        self._ensure_table(worksheet, columns)
+        values = data.astype(object).where(pd.notna(data), None).values.tolist()
+        values = [[None if v is None else str(v) for v in row] for row in values]
+        cols = ", ".join(_quote(c) for c in columns)
+        marks = ", ".join("?" for _ in columns)
+        self.db.executemany(f"INSERT INTO {_quote(worksheet)} ({cols}) VALUES ({marks})", values)
+
+    def read(self, worksheet):
+        return self._select(worksheet)
+
+    def tail(self, worksheet, start):
+        return self._select(worksheet, offset=start)
+
+    def append(self, worksheet, data):
+        if data is None or data.empty:
+            return 0
+        with self.lock, self.db:
+            self._insert(worksheet, data)
+            self._bump(worksheet)
+        return len(data)
+
+    def update(self, worksheet, data):
+        with self.lock, self.db:
+            if self._columns(worksheet):
+                self.db.execute(f"DELETE FROM {_quote(worksheet)}")
+            self._insert(worksheet, data)
+            self._bump(worksheet)
+
+    def query(self, worksheet, **filters):
+        clauses, params = [], []
+        for col, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                value = [str(v) for v in value]
+                clauses.append(f"{_quote(col)} IN ({', '.join('?' for _ in value)})")
+                params.extend(value)
+            else:
+                clauses.append(f"{_quote(col)} = ?")
+                params.append(str(value))
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        try:
+            return self._select(worksheet, where, params)
+        except sqlite3.OperationalError:
+            # Unknown column
+            return pd.DataFrame(columns=self._columns(worksheet))
+
+
+BACKENDS = {
+    'memory': MemoryStorage,
+    'sqlite': SQLiteStorage,
+}
+
+
+def open_storage(backend, **options):
+    """Create a local backend by name ('sqlite' or 'memory')"""
+    try:
+        factory = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {backend}") from None
+    return factory(**options)
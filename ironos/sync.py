@@ -0,0 +1,196 @@
+"""Durable local save journal with a background flush to the backend"""
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from ironos import perf
+
+
+def set_key(workout_id, exercise, set_no):
+    """Idempotency key for one logged set of one workout"""
+    raw = f"{workout_id}|{exercise}|{set_no}".encode()
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def permanent(error):
+    """True for failures a retry cannot fix: rejected rows or a 4xx other than auth/rate limits"""
+    if isinstance(error, (ValueError, TypeError, KeyError)):
+        return True
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status in (400, 403, 404)
+
+
+class SaveJournal:
+    """Rows waiting to reach the backend, kept in a local SQLite WAL file.
+
+    Rows are keyed by their idempotency key, so saving the same workout
+    twice only journals it once. Rows the backend can never accept are
+    parked as stuck (with their error) until ``retry_stuck``.
+    """
+
+    def __init__(self, path="ironos_journal.db"):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.Lock()
+        with self.lock, self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS pending ("
+                " key TEXT PRIMARY KEY, worksheet TEXT NOT NULL, row TEXT NOT NULL,"
+                " created REAL NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+                " next_attempt REAL NOT NULL DEFAULT 0, last_error TEXT)"
+            )
+            columns = {row[1] for row in self.db.execute("PRAGMA table_info(pending)")}
+            if "stuck" not in columns:
+                # Journals from before stuck rows were parked
+                self.db.execute("ALTER TABLE pending ADD COLUMN stuck INTEGER NOT NULL DEFAULT 0")
+
+    def enqueue(self, worksheet, data):
+        """Journal rows (which must carry a Key column), returns rows added"""
+        records = data.astype(object).where(pd.notna(data), None).to_dict('records')
+        now = time.time()
+        with self.lock, self.db:
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO pending (key, worksheet, row, created) VALUES (?, ?, ?, ?)",
+                [(r['Key'], worksheet, json.dumps(r, default=str), now) for r in records],
+            )
+            return self.db.total_changes - before
+
+    def due(self, limit=500):
+        """Oldest rows whose backoff has expired: (key, worksheet, row, attempts)"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT key, worksheet, row, attempts FROM pending WHERE next_attempt <= ? AND stuck = 0 "
+                "ORDER BY created, rowid LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        return [(key, ws, json.loads(row), attempts) for key, ws, row, attempts in rows]
+
+    def mark_sent(self, keys):
+        with self.lock, self.db:
+            self.db.executemany("DELETE FROM pending WHERE key = ?", [(k,) for k in keys])
+
+    def mark_failed(self, keys, delay, error):
+        with self.lock, self.db:
+            self.db.executemany(
+                "UPDATE pending SET attempts = attempts + 1, next_attempt = ?, last_error = ? WHERE key = ?",
+                [(time.time() + delay, error, k) for k in keys],
+            )
+
+    def mark_stuck(self, keys, error):
+        """Stop retrying rows the backend rejected; they wait for ``retry_stuck``"""
+        with self.lock, self.db:
+            self.db.executemany(
+                "UPDATE pending SET attempts = attempts + 1, stuck = 1, last_error = ? WHERE key = ?",
+                [(error, k) for k in keys],
+            )
+
+    def stuck(self, limit=50):
+        """Parked rows, oldest first: (worksheet, row, error)"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT worksheet, row, last_error FROM pending WHERE stuck = 1 ORDER BY created, rowid LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [(ws, json.loads(row), error) for ws, row, error in rows]
+
+    def stuck_count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM pending WHERE stuck = 1").fetchone()[0]
+
+    def retry_stuck(self):
+        """Queue parked rows again (e.g. after fixing the sheet header); returns how many"""
+        with self.lock, self.db:
+            return self.db.execute("UPDATE pending SET stuck = 0, next_attempt = 0 WHERE stuck = 1").rowcount
+
+    def pending_count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+    def last_error(self):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT last_error FROM pending WHERE last_error IS NOT NULL AND stuck = 0 ORDER BY rowid DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+
+class SyncWorker(threading.Thread):
+    """Flushes the journal to a storage backend in batches.
+
+    Failed batches back off exponentially (with jitter) up to
+    ``max_delay``; a batch rejected for good (see ``permanent``) is parked
+    as stuck instead. A batch that was attempted before may have landed even
+    though the call failed, so its keys are looked up in the backend first
+    and rows already present are not appended again.
+    """
+
+    def __init__(self, journal, storage, batch_size=500, base_delay=2.0, max_delay=300.0, poll=5.0):
+        super().__init__(name="ironos-sync", daemon=True)
+        self.journal = journal
+        self.storage = storage
+        self.batch_size = batch_size
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll = poll
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+
+    def wake(self):
+        self.wakeup.set()
+
+    def stop(self):
+        self.stopping.set()
+        self.wakeup.set()
+
+    def backoff(self, attempts):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempts))
+        return delay * random.uniform(0.5, 1.0)
+
+    def flush_once(self):
+        """Send one batch per worksheet, returns the number of rows delivered"""
+        batch = self.journal.due(self.batch_size)
+        delivered = 0
+        by_sheet = {}
+        for key, worksheet, row, attempts in batch:
+            by_sheet.setdefault(worksheet, []).append((key, row, attempts))
+
+        for worksheet, items in by_sheet.items():
+            keys = [key for key, _, _ in items]
+            try:
+                retried = [(key, row) for key, row, attempts in items if attempts > 0]
+                landed = set()
+                if retried:
+                    landed = self.storage.existing_keys(
+                        worksheet, [key for key, _ in retried], dates=[row.get('Date') for _, row in retried])
+                rows = [row for key, row, _ in items if key not in landed]
+                if rows:
+                    with perf.timed("sync.flush", worksheet=worksheet):
+                        self.storage.append(worksheet, pd.DataFrame(rows))
+                self.journal.mark_sent(keys)
+                delivered += len(rows)
+            except Exception as e:
+                if permanent(e):
+                    self.journal.mark_stuck(keys, str(e))
+                    continue
+                attempts = max(a for _, _, a in items)
+                self.journal.mark_failed(keys, self.backoff(attempts), str(e))
+        return delivered
+
+    def run(self):
+        while not self.stopping.is_set():
+            try:
+                while self.flush_once():
+                    pass
+            except Exception:
+                # Journal trouble (e.g. disk) must not kill the worker
+                pass
+            self.wakeup.wait(self.poll)
+            self.wakeup.clear()
@@ -0,0 +1,159 @@
+"""Workout prescriptions and logged-set helpers"""
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from ironos.catalog import normalize_name
+from ironos.storage import LOG_COLUMNS
+from ironos.sync import set_key
+
+
+def parse_multi_value(value_str, count, is_number=False):
+    """Parse comma-separated values"""
+    if pd.isna(value_str) or value_str is None:
+        value_str = ""
+    val_str = str(value_str).replace(" ", "").strip()
+
+    if not val_str:
+        if is_number:
+            return [0.0] * count
+        else:
+            return ["5"] * count
+
+    parts = val_str.split(',')
+    if len(parts) == 1:
+        try:
+            v = float(parts[0]) if is_number else parts[0]
+            return [v] * count
+        except (TypeError, ValueError):
+            if is_number:
+                return [0.0] * count
+            else:
+                return ["5"] * count
+
+    result = []
+    for i in range(count):
+        raw = parts[i] if i < len(parts) else parts[-1]
+        if is_number:
+            try:
+                result.append(float(raw))
+            except (TypeError, ValueError):
+                result.append(0.0)
+        else:
+            result.append(str(raw))
+    return result
+
+
+def _per_set(values, n, default):
+    """One value per set, the last value repeating when the list is short"""
+    values = list(values) if values else [default]
+    return np.asarray(values, dtype=object)[np.minimum(np.arange(n), len(values) - 1)]
+
+
+def _rep_counts(target_reps):
+    """Integer reps from targets like "5", "3+" or "AMRAP" (which falls back to 5)"""
+    text = pd.Series(target_reps, dtype=object).astype(str).str.replace('+', '', regex=False).str.strip()
+    whole = text.str.fullmatch(r'-?\d+')
+    return np.where(whole, pd.to_numeric(text.where(whole, '5')), 5).astype(np.int32)
+
+
+class ExerciseLog:
+    """Planned and actual values for every set of one exercise.
+
+    ``rev`` changes on bulk edits (fill/reset) so widgets can be keyed
+    by it and pick up the new values.
+    """
+    __slots__ = ('exercise', 'category', 'target_weight', 'target_reps', 'weight', 'reps', 'rpe', 'rev')
+
+    def __init__(self, entry):
+        n = int(entry['Sets'])
+        self.exercise = entry['Exercise']
+        self.category = entry.get('Category', 'Exercise')
+        self.target_weight = _per_set(entry.get('Guide_List'), n, 0).astype(float)
+        self.target_reps = _per_set(entry.get('Rep_List'), n, '5').astype(str).astype(object)
+        self.weight = np.zeros(n)
+        self.reps = np.zeros(n, dtype=np.int32)
+        self.rpe = np.zeros(n)
+        self.rev = 0
+
+    @property
+    def sets(self):
+        return len(self.weight)
+
+    def fill(self):
+        """Copy the plan into the actual values"""
+        self.weight[:] = self.target_weight
+        self.reps[:] = _rep_counts(self.target_reps)
+        self.rpe[:] = 0.0
+        self.rev += 1
+
+    def reset(self):
+        self.weight[:] = 0.0
+        self.reps[:] = 0
+        self.rpe[:] = 0.0
+        self.rev += 1
+
+    def frame(self):
+        """Set table for the grid editor"""
+        return pd.DataFrame({
+            "Set": np.arange(1, self.sets + 1),
+            "Target": self.target_weight.astype(int),
+            "Target Reps": self.target_reps,
+            "Actual": self.weight,
+            "Reps": self.reps,
+            "RPE": self.rpe,
+        })
+
+
+class WorkoutSession:
+    """The active workout: its plan, one ExerciseLog per exercise and an id for idempotency keys"""
+    __slots__ = ('plan', 'logs', 'workout_id')
+
+    def __init__(self, plan, workout_id=None):
+        self.plan = plan
+        self.logs = [ExerciseLog(entry) for entry in plan]
+        # A restored session keeps its id, so saving it again adds no duplicate rows
+        self.workout_id = workout_id or uuid.uuid4().hex
+
+    def fill(self):
+        for log in self.logs:
+            log.fill()
+
+    def reset(self):
+        for log in self.logs:
+            log.reset()
+
+    def logs_frame(self, day, athlete="", logged_only=True, catalog=None):
+        """Log rows for every set (or only sets with a weight) as one DataFrame.
+
+        With a catalog, exercises are logged under their canonical display
+        name so spelling variants land as one exercise. Template, Week and
+        Day come from each entry's Meta, so the athlete's place in a
+        program can be found from Logs.
+        """
+        if not self.logs:
+            return pd.DataFrame(columns=LOG_COLUMNS)
+        counts = [log.sets for log in self.logs]
+        order = np.repeat(np.arange(len(self.logs)), counts)
+        names = [catalog.name_for(log.exercise) if catalog else log.exercise for log in self.logs]
+        exercise = np.repeat(np.array(names, dtype=object), counts)
+        set_no = np.concatenate([np.arange(1, n + 1) for n in counts])
+        meta = [entry.get("Meta") or {} for entry in self.plan]
+        df = pd.DataFrame({
+            "Date": day,
+            "Athlete": athlete,
+            "Template": np.repeat(np.array([m.get("Template", "") for m in meta], dtype=object), counts),
+            "Week": np.repeat(np.array([m.get("Week", "") for m in meta], dtype=object), counts),
+            "Day": np.repeat(np.array([m.get("Day", "") for m in meta], dtype=object), counts),
+            "Exercise": exercise,
+            "ExerciseId": np.repeat(np.array([normalize_name(n) for n in names], dtype=object), counts),
+            "Set": set_no,
+            "Weight": np.concatenate([log.weight for log in self.logs]),
+            "Reps": np.concatenate([log.reps for log in self.logs]),
+            "RPE": np.concatenate([log.rpe for log in self.logs]),
+            "Key": [set_key(self.workout_id, f"{i}:{ex}", int(s)) for i, ex, s in zip(order, exercise, set_no)],
+        }, columns=LOG_COLUMNS)
+        if logged_only:
+            df = df[df["Weight"] > 0].reset_index(drop=True)
+        return df
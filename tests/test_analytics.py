@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+
+from ironos.analytics import FORMAT, Rollups
+from ironos.storage import LOG_COLUMNS, MemoryStorage
+
+
+def log(rows):
+    return pd.DataFrame([dict(zip(['Date', 'Athlete', 'Exercise', 'ExerciseId', 'Weight', 'Reps', 'RPE'], r))
+                         for r in rows], columns=LOG_COLUMNS)
+
+
+def test_spellings_of_one_lift_roll_up_together():
+    rollups = Rollups()
+    rollups.fold(log([
+        ("2026-09-01", "sam", "Bench Press", "bench press", "100", "5", "8"),
+        ("2026-09-02", "sam", "bench press", "bench press", "105", "5", ""),
+        ("2026-09-03", "sam", "Bench-Press", None, "110", "3", ""),  # logged before ExerciseId existed
+    ]))
+    summary = rollups.summary("sam")
+    assert summary.index.tolist() == ["Bench-Press"]
+    assert summary.loc["Bench-Press", "Sets"] == 3
+    assert rollups.weekly_for("Bench-Press", "sam")['Volume'].sum() == 100 * 5 + 105 * 5 + 110 * 3
+    assert rollups.weekly_for("bench press", "sam")['Volume'].sum() == 100 * 5 + 105 * 5 + 110 * 3
+    maxes = rollups.estimated_maxes("sam", as_of="2026-09-10")
+    assert maxes['Lift'].tolist() == ["Bench-Press"]
+
+
+FIRST = [
+    ("2026-09-01", "sam", "Squat", "squat", "100", "5", "8"),
+    ("2026-09-01", "sam", "Squat", "squat", "110", "3", "9"),
+    ("2026-09-02", "kim", "Bench Press", "bench press", "60", "8", ""),
+]
+SECOND = [
+    ("2026-09-03", "sam", "Squat", "squat", "120", "2", "9.5"),  # same week, new best
+    ("2026-09-09", "sam", "Squat", "squat", "105", "5", "8"),  # next week
+    ("2026-09-09", "sam", "Deadlift", "deadlift", "140", "5", ""),
+]
+
+
+def assert_same(a, b):
+    for name in ("exercises", "weekly", "positions"):
+        pd.testing.assert_frame_equal(getattr(a, name).sort_index(), getattr(b, name).sort_index(),
+                                      check_dtype=False, check_index_type=False)
+
+
+@pytest.fixture
+def storage():
+    storage = MemoryStorage()
+    storage.append("Logs", log(FIRST))
+    return storage
+
+
+def test_changes_cursor_returns_only_new_rows(storage):
+    rows, cursor = storage.changes("Logs")
+    assert (len(rows), cursor) == (3, 3)
+    rows, cursor = storage.changes("Logs", cursor)
+    assert rows.empty and cursor == 3
+
+    storage.append("Logs", log(SECOND))
+    rows, cursor = storage.changes("Logs", cursor)
+    assert rows['Date'].tolist() == ["2026-09-03", "2026-09-09", "2026-09-09"]
+    assert cursor == 6
+
+
+def test_refresh_merges_a_second_batch(storage):
+    rollups = Rollups()
+    assert rollups.refresh(storage, min_interval=0)
+    assert rollups.exercises.loc[("sam", "squat"), "Sets"] == 2
+
+    storage.append("Logs", log(SECOND))
+    assert rollups.refresh(storage, min_interval=0)
+    assert not rollups.refresh(storage, min_interval=0)
+    squat = rollups.exercises.loc[("sam", "squat")]
+    assert squat["Sets"] == 4
+    assert squat["Tonnage"] == 100 * 5 + 110 * 3 + 120 * 2 + 105 * 5
+    assert squat["Best_Weight"] == 120
+    assert set(rollups.summary("sam").index) == {"Squat", "Deadlift"}
+    weeks = rollups.weekly_for("Squat", "sam")
+    assert weeks["Volume"].tolist() == [100 * 5 + 110 * 3 + 120 * 2, 105 * 5]
+    assert rollups.cursor == 6
+
+
+def test_incremental_folds_equal_one_full_fold():
+    rows = FIRST + SECOND
+    incremental = Rollups()
+    for row in rows:
+        incremental.fold(log([row]))
+    full = Rollups()
+    full.fold(log(rows))
+    assert_same(incremental, full)
+
+
+def test_save_and_load_round_trip(storage, tmp_path):
+    rollups = Rollups()
+    rollups.refresh(storage, min_interval=0)
+    rollups.save(tmp_path / "analytics")
+
+    loaded = Rollups.load(tmp_path / "analytics")
+    assert loaded.cursor == 3
+    assert_same(loaded, rollups)
+
+    # A loaded rollup picks up where the saved one stopped
+    storage.append("Logs", log(SECOND))
+    loaded.refresh(storage, min_interval=0)
+    full = Rollups()
+    full.fold(storage.read("Logs"))
+    assert_same(loaded, full)
+
+
+def test_load_ignores_an_older_format(storage, tmp_path):
+    rollups = Rollups()
+    rollups.refresh(storage, min_interval=0)
+    rollups.save(tmp_path)
+    state = (tmp_path / "state.json").read_text().replace(f'"format": {FORMAT}', '"format": 1')
+    (tmp_path / "state.json").write_text(state)
+    loaded = Rollups.load(tmp_path)
+    assert loaded.cursor is None and loaded.exercises.empty
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from ironos.catalog import ExerciseCatalog, get_catalog, normalize_name
+from ironos.library import LibraryIndex
+
+
+@pytest.mark.parametrize("name,expected", [
+    ("Bench Press", "bench press"),
+    ("  bench   PRESS ", "bench press"),
+    ("Bench-Press", "bench press"),
+    ("Ｂench press", "bench press"),  # full-width letters fold via NFKC
+    (None, ""),
+    (float("nan"), ""),
+    (pd.NA, ""),
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+
+
+def test_first_spelling_is_the_display_name_and_aliases_resolve():
+    catalog = ExerciseCatalog(["Bench Press", "bench press", "Back Squat"], aliases={"BP": "bench-press"})
+    assert len(catalog) == 2
+    assert catalog.name_for("bench  press") == "Bench Press"
+    assert catalog.name_for("bp") == "Bench Press"
+    assert catalog.canonical("BP") == "bench press"
+    assert catalog.name_for(" Zercher Squat ") == "Zercher Squat"
+
+
+def test_prefix_and_fuzzy_search():
+    catalog = ExerciseCatalog(["Bench Press", "Back Squat", "Front Squat", "Barbell Row"])
+    assert catalog.search("sq") == ["Back Squat", "Front Squat"]
+    assert catalog.search("ba", limit=2) == ["Back Squat", "Barbell Row"]
+    assert catalog.search("bnech press")[0] == "Bench Press"
+    assert catalog.search("") == []
+
+
+def test_display_names_do_not_depend_on_directory():
+    index = LibraryIndex(pd.DataFrame({
+        'Template': ["T"], 'Week': ["1"], 'Day': ["A"], 'Exercise': ["Bench Press"],
+        'Sets': ["3"], 'Reps': ["5"], 'Pct': [""],
+    }))
+    profile = pd.DataFrame({'Athlete': ["sam"], 'Lift': ["bench press"], 'Max': [100.0]})
+    directory = pd.DataFrame({'Exercise': ["bench press", "Dip"], 'Aliases': ["BP", None]})
+
+    without = get_catalog(index, profile, None)
+    with_dir = get_catalog(index, profile, directory)
+    assert without.name_for("bench press") == with_dir.name_for("bench press") == "Bench Press"
+    assert with_dir.name_for("bp") == "Bench Press"
+    assert with_dir.name_for("dip") == "Dip"
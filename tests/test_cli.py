@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from ironos.cli import main
+from ironos.config import build_storage
+
+CSV = """Date,Athlete,Exercise,Set,Weight,Reps
+2026-09-01,sam,Squat,1,100,5
+2026-09-01,sam,Squat,2,100,5
+2026-09-03,sam,Bench Press,,80,8
+"""
+
+
+def import_twice(tmp_path, archive=None, journals=("a.db", "b.db")):
+    csv = tmp_path / "history.csv"
+    csv.write_text(CSV)
+    db = str(tmp_path / "ironos.db")
+    extra = ["--archive", str(archive)] if archive else []
+    for journal in journals:
+        assert main(["--db", db, "--journal", str(tmp_path / journal)] + extra + ["import-logs", str(csv)]) == 0
+    return build_storage("sqlite", db, str(archive) if archive else None).read("Logs")
+
+
+def test_reimport_adds_nothing(tmp_path, capsys):
+    logs = import_twice(tmp_path)
+    assert len(logs) == 3
+    assert "3 already imported, 0 new" in capsys.readouterr().out.splitlines()[-1]
+
+
+def test_reimport_adds_nothing_to_archived_months(tmp_path):
+    from ironos.partitions import PartitionedStorage
+
+    archive = tmp_path / "archive"
+    import_twice(tmp_path, archive, journals=("a.db",))
+    storage = build_storage("sqlite", str(tmp_path / "ironos.db"), str(archive))
+    assert isinstance(storage, PartitionedStorage)
+    assert storage.compact(today="2026-12-01")
+    logs = import_twice(tmp_path, archive, journals=("b.db",))
+    assert len(logs) == 3
+    assert pd.Series(logs['Key']).is_unique
+
+
+def test_repeated_sets_on_one_day_are_all_imported(tmp_path, capsys):
+    csv = tmp_path / "history.csv"
+    csv.write_text("Date,Athlete,Exercise,Set,Weight,Reps,Key\n"
+                   "2026-09-01,sam,Squat,1,100,5,\n"
+                   "2026-09-01,sam,Squat,1,60,10,\n"
+                   "2026-09-01,sam,Squat,1,60,10,\n"
+                   "2026-09-02,sam,Dip,1,0,10,k1\n"
+                   "2026-09-02,sam,Dip,2,0,10,k1\n")
+    db = str(tmp_path / "ironos.db")
+    for journal in ("a.db", "b.db"):
+        assert main(["--db", db, "--journal", str(tmp_path / journal), "import-logs", str(csv)]) == 0
+    assert len(build_storage("sqlite", db).read("Logs")) == 4
+    out = capsys.readouterr()
+    assert "skipped 1 rows repeating a Key" in out.err
+    assert "5 rows read, 1 duplicates, 4 already imported, 0 new" in out.out.splitlines()[-1]
+
+
+def test_commands_use_the_configured_sheets_api_backend(tmp_path, monkeypatch, capsys):
+    pytest.importorskip("httpx")
+    from benchmarks.fake_sheets_api import FakeSheetsServer
+
+    server = FakeSheetsServer({
+        "Logs": pd.DataFrame([["2026-09-01", "sam", "Squat", "1", "100", "5", "k1"]],
+                             columns=["Date", "Athlete", "Exercise", "Set", "Weight", "Reps", "Key"]),
+        "Profile": pd.DataFrame({"Athlete": ["sam"], "Lift": ["Squat"], "Max": ["120"]}),
+    })
+    server.start()
+    try:
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("IRONOS_STORAGE", raising=False)
+        (tmp_path / ".streamlit").mkdir()
+        (tmp_path / ".streamlit" / "secrets.toml").write_text(
+            f'[storage]\nbackend = "sheets_api"\nspreadsheet = "fake"\ntoken = "t"\n'
+            f'base_url = "{server.url}"\ndrive_url = "{server.url}"\n')
+        assert main(["recompute-maxes", "--athlete", "sam", "--weeks", "1000"]) == 0
+    finally:
+        server.stop()
+    assert "Squat" in capsys.readouterr().out
+    # Rollups built from another backend never replace the app's saved state
+    assert not (tmp_path / "ironos_analytics").exists()
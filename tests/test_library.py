@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ironos.library import LibraryIndex, LibraryPlan, _expand_multi, compile_library
+from ironos.workout import parse_multi_value
+
+CELLS = ["", None, "5", "3+", "AMRAP", "5,3,1", "5, 3 ,1", "65,75", "70,,80", "abc", "60,x,80", " 72.5 ", "1,2,3,4,5,6"]
+
+
+def reference(column, n_sets, is_number):
+    """Row-by-row parse_multi_value, the behavior the vectorized parse replaces"""
+    return [v for cell, n in zip(column, n_sets) for v in parse_multi_value(cell, int(n), is_number=is_number)]
+
+
+@pytest.mark.parametrize("is_number,default", [(False, "5"), (True, "0")])
+def test_expand_multi_matches_parse_multi_value(is_number, default):
+    rng = np.random.default_rng(0)
+    column = pd.Series(rng.choice(np.array(CELLS, dtype=object), 500), dtype=object)
+    n_sets = rng.integers(0, 7, len(column))
+
+    values, row, set_idx = _expand_multi(column, n_sets, default)
+    if is_number:
+        values = pd.to_numeric(pd.Series(values), errors='coerce').fillna(0.0).tolist()
+    assert list(values) == reference(column, n_sets, is_number)
+    assert row.tolist() == np.repeat(np.arange(len(column)), n_sets).tolist()
+    assert set_idx.tolist() == [s for n in n_sets for s in range(n)]
+
+
+def library():
+    return pd.DataFrame({
+        'Template': ["T", "T", "T", "T"],
+        'Week': ["1", "1", "1", "2"],
+        'Day': ["A", "A", "B", "A"],
+        'Exercise': ["Squat", "Bench Press", "Deadlift", "Squat"],
+        'Sets': ["3", "2", "", "1"],
+        'Reps': ["5,3,1", "8", "5", "AMRAP"],
+        'Pct': ["0.65,0.75,0.85", "", "0.7", "0.9"],
+        'Category': ["Main", "Accessory", "Main", None],
+    })
+
+
+def test_plan_matches_row_by_row_parse():
+    df = library()
+    plan = LibraryPlan(LibraryIndex(df))
+    frame = plan.index.frame
+    n_sets = frame['Sets'].replace("", "3").astype(int)
+    assert plan.n_sets.tolist() == n_sets.tolist()
+    assert plan.reps.tolist() == reference(frame['Reps'], n_sets, False)
+    assert plan.pct.tolist() == reference(frame['Pct'], n_sets, True)
+
+
+def test_workout_guides_use_the_athlete_max():
+    index = LibraryIndex(library())
+    profile = pd.DataFrame({'Lift': ["Squat"], 'Max': [200.0]})
+    queue = compile_library(index, profile).workout("T", "1", "A")
+    assert [e["Exercise"] for e in queue] == ["Squat", "Bench Press"]
+    assert queue[0]["Guide_List"] == [130, 150, 170]
+    assert queue[0]["Rep_List"] == ["5", "3", "1"]
+    assert queue[1]["Guide_List"] == [0, 0]
+    assert queue[0]["Meta"] == {"Template": "T", "Week": "1", "Day": "A"}
+
+
+def test_shared_plan_is_read_only():
+    plan = LibraryPlan(LibraryIndex(library()))
+    with pytest.raises(ValueError):
+        plan.pct[0] = 1.0
+
+
+def test_weeks_and_days_sort_naturally():
+    df = pd.DataFrame({
+        'Template': ["T"] * 5, 'Week': ["10", "2", "1", "1", "1"], 'Day': ["A", "A", "Day 10", "Day 2", "Day 1"],
+        'Exercise': ["Squat"] * 5, 'Sets': ["1"] * 5, 'Reps': ["5"] * 5, 'Pct': [""] * 5,
+    })
+    index = LibraryIndex(df)
+    assert index.weeks("T") == ["1", "2", "10"]
+    assert index.days("T", "1") == ["Day 1", "Day 2", "Day 10"]
@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from ironos import lifts
+from ironos.lifts import LiftResolver, get_resolver, profile_for
+
+
+def profile(rows, athlete=None):
+    df = pd.DataFrame(rows, columns=['Lift', 'Max'])
+    if athlete is not None:
+        df.insert(0, 'Athlete', athlete)
+    return df
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    lifts._resolvers.clear()
+
+
+def test_longest_lift_wins_regardless_of_row_order():
+    resolver = LiftResolver(profile([("Bench Press", 100), ("Close Grip Bench Press", 80)]))
+    assert resolver.max_for("Close Grip Bench Press") == 80
+    assert resolver.max_for("Paused Bench Press") == 100
+
+    reordered = LiftResolver(profile([("Close Grip Bench Press", 80), ("Bench Press", 100)]))
+    assert reordered.max_for("Close Grip Bench Press") == 80
+
+
+def test_ties_go_to_the_earlier_row():
+    resolver = LiftResolver(profile([("Squat", 140), ("squat", 150)]))
+    assert resolver.max_for("Front Squat") == 140
+
+
+def test_names_are_normalized():
+    resolver = LiftResolver(profile([("Bench-Press", 100), ("Deadlift", 180)]))
+    assert resolver.max_for("  bench press ") == 100
+    assert resolver.max_for("DEADLIFT (conventional)") == 180
+    assert resolver.max_for("Overhead Press") == 0.0
+
+
+def test_blank_and_bad_values():
+    resolver = LiftResolver(profile([(None, 100), ("Row", "heavy"), ("Curl", None)]))
+    assert resolver.max_for("Row") == 0.0
+    assert resolver.max_for("Curl") == 0.0
+    assert LiftResolver(None).max_for("Squat") == 0.0
+    assert LiftResolver(pd.DataFrame()).max_for("Squat") == 0.0
+
+
+def test_overlapping_patterns_use_failure_links():
+    # "press" only appears after a failed partial match of "bench press"
+    resolver = LiftResolver(profile([("Bench Press", 100), ("Press", 60)]))
+    assert resolver.max_for("Bench Bench Press") == 100
+    assert resolver.max_for("Benchpress Press") == 60
+
+
+def test_resolver_is_rebuilt_only_when_the_profile_changes():
+    df = profile([("Squat", 140)])
+    first = get_resolver(df)
+    assert get_resolver(df.copy()) is first
+
+    changed = profile([("Squat", 150)])
+    assert get_resolver(changed) is not first
+    assert get_resolver(changed).max_for("Squat") == 150
+
+
+def test_many_athletes_do_not_evict_each_other():
+    shared = pd.concat([profile([("Squat", 100)], athlete="")] + [
+        profile([("Squat", 100 + i)], athlete=f"athlete{i}") for i in range(20)
+    ], ignore_index=True)
+    resolvers = [get_resolver(profile_for(shared, f"athlete{i}")) for i in range(20)]
+    again = [get_resolver(profile_for(shared, f"athlete{i}")) for i in range(20)]
+    assert all(a is b for a, b in zip(resolvers, again))
+    assert [r.max_for("Squat") for r in again] == [100 + i for i in range(20)]
+
+
+def test_profile_for_prefers_the_athletes_own_rows():
+    shared = pd.concat([
+        profile([("Squat", 100), ("Bench Press", 80)], athlete=""),
+        profile([("squat", 120)], athlete="sam"),
+    ], ignore_index=True)
+    own = profile_for(shared, "sam")
+    assert get_resolver(own).max_for("Squat") == 120
+    assert get_resolver(own).max_for("Bench Press") == 80
+    assert get_resolver(profile_for(shared, "")).max_for("Squat") == 100
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from ironos.loader import SheetLoader
+from ironos.storage import MemoryStorage
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.reads = 0
+
+    def read(self, worksheet):
+        self.reads += 1
+        return super().read(worksheet)
+
+
+def test_cached_never_fetches():
+    storage = CountingStorage({"Directory": pd.DataFrame({"Exercise": ["Squat", "Dip"]})})
+    loader = SheetLoader(storage)
+    assert loader.cached("Directory") is None
+    assert storage.reads == 0
+    loader.get("Directory")
+    assert loader.cached("Directory")["Exercise"].tolist() == ["Squat", "Dip"]
+    assert storage.reads == 1
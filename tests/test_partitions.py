@@ -0,0 +1,157 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from ironos.analytics import Rollups
+from ironos.partitions import MANIFEST, PartitionedStorage
+from ironos.storage import LOG_COLUMNS, MemoryStorage
+
+
+def sets(athlete, day, n, key):
+    return pd.DataFrame([{
+        "Date": day, "Athlete": athlete, "Exercise": "Squat", "Set": i + 1,
+        "Weight": 100, "Reps": 5, "RPE": 8, "Key": f"{key}-{i}",
+    } for i in range(n)], columns=LOG_COLUMNS)
+
+
+@pytest.fixture
+def inner():
+    return MemoryStorage()
+
+
+@pytest.fixture
+def storage(inner, tmp_path):
+    return PartitionedStorage(inner, archive_dir=str(tmp_path / "archive"))
+
+
+def set_counts(rollups):
+    return rollups.exercises["Sets"].to_dict()
+
+
+def test_backdated_rows_are_counted_once(storage):
+    storage.append("Logs", sets("a", "2026-09-10", 3, "a"))
+    storage.append("Logs", sets("b", "2026-10-05", 2, "b"))
+    rollups = Rollups()
+    rollups.refresh(storage, min_interval=0)
+
+    # An older month grows after a newer one was already folded in
+    storage.append("Logs", sets("a", "2026-09-12", 2, "late"))
+    storage.append("Logs", sets("b", "2026-10-06", 1, "b2"))
+    rollups.refresh(storage, min_interval=0)
+
+    assert set_counts(rollups) == {("a", "squat"): 5, ("b", "squat"): 3}
+    assert rollups.cursor == {"2026-09": 5, "2026-10": 3}
+    assert not rollups.refresh(storage, min_interval=0)
+
+
+def test_rows_added_to_an_archived_month_are_read(storage):
+    storage.append("Logs", sets("a", "2026-07-01", 2, "old"))
+    rollups = Rollups()
+    rollups.refresh(storage, min_interval=0)
+    assert storage.compact(today="2026-10-01") == ["2026-07"]
+    assert storage.manifest["partitions"]["2026-07"]["state"] == "archived"
+
+    storage.append("Logs", sets("a", "2026-07-02", 1, "backdated"))
+    assert storage.manifest["partitions"]["2026-07"]["state"] == "hot"
+    assert len(storage.logs_between()) == 3
+    rollups.refresh(storage, min_interval=0)
+    assert set_counts(rollups) == {("a", "squat"): 3}
+
+
+def test_manifest_lives_in_the_spreadsheet(inner, storage, tmp_path):
+    storage.append("Logs", sets("a", "2026-10-01", 2, "a"))
+    assert not inner.read(MANIFEST).empty
+
+    # Another process (or a fresh deploy without the archive directory)
+    other = PartitionedStorage(inner, archive_dir=str(tmp_path / "elsewhere"))
+    assert other.partitions() == ["2026-10"]
+    assert len(other.logs_between()) == 2
+
+
+def test_split_legacy_never_duplicates_rows(inner, tmp_path):
+    legacy = pd.DataFrame({
+        "Date": ["2026-08-01", "2026-08-01", "2026-09-02"], "Exercise": ["Squat", "Squat", "Bench"],
+        "Set": ["1", "2", "1"], "Weight": ["100", "100", "80"], "Reps": ["5", "5", "5"],
+    })
+    inner.update("Logs", legacy)
+    storage = PartitionedStorage(inner, archive_dir=str(tmp_path / "a"))
+    assert storage.split_legacy() == 3
+    assert storage.split_legacy() == 0
+
+    # Losing the manifest must not migrate the old sheet a second time
+    inner.frames.pop(MANIFEST)
+    again = PartitionedStorage(inner, archive_dir=str(tmp_path / "b"))
+    assert again.split_legacy() == 0
+    assert len(again.logs_between()) == 3
+    assert again.partitions() == ["2026-08", "2026-09"]
+
+
+def test_update_rewrites_every_partition(storage):
+    storage.append("Logs", sets("a", "2026-09-10", 3, "a"))
+    storage.append("Logs", sets("a", "2026-10-05", 2, "b"))
+    storage.update("Logs", sets("a", "2026-10-05", 1, "c"))
+    assert storage.partitions() == ["2026-10"]
+    assert storage.logs_between()['Key'].tolist() == ["c-0"]
+
+
+def test_key_lookups_read_each_archive_once_and_only_matching_months(storage, monkeypatch):
+    storage.append("Logs", sets("a", "2026-06-01", 2, "june"))
+    storage.append("Logs", sets("a", "2026-07-01", 2, "july"))
+    storage.compact(today="2026-10-01")
+    reads = []
+    real = storage._read_partition
+    monkeypatch.setattr(storage, "_read_partition", lambda month: reads.append(month) or real(month))
+
+    for _ in range(3):
+        assert storage.existing_keys("Logs", ["july-0", "june-1", "new"], dates=["2026-07-01"] * 3) == {"july-0"}
+    assert reads == ["2026-07"]
+    assert storage.existing_keys("Logs", ["june-1", "new"]) == {"june-1"}
+    assert reads == ["2026-07", "2026-06"]
+
+
+class SlowManifest(MemoryStorage):
+    """Manifest reads that take long enough for writers to interleave"""
+
+    def read(self, worksheet):
+        df = super().read(worksheet)
+        if worksheet == MANIFEST:
+            time.sleep(0.01)
+        return df
+
+
+def test_writers_in_other_processes_keep_each_others_counts(tmp_path):
+    inner = SlowManifest()
+    archive = str(tmp_path / "archive")
+    # Separate instances share nothing but the archive directory, like two app processes
+    writers = [PartitionedStorage(inner, archive_dir=archive) for _ in range(2)]
+
+    def write(i, storage):
+        for n in range(5):
+            storage.append("Logs", sets(f"w{i}", "2026-10-05", 1, f"w{i}-{n}"))
+
+    threads = [threading.Thread(target=write, args=(i, s)) for i, s in enumerate(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    fresh = PartitionedStorage(inner, archive_dir=archive)
+    assert fresh.manifest["partitions"]["2026-10"]["rows"] == 10
+    assert fresh.revision("Logs") == len(fresh.read("Logs")) == 10
+
+
+def test_tail_reads_only_the_newest_partitions(storage, monkeypatch):
+    storage.append("Logs", sets("a", "2026-08-01", 3, "aug"))
+    storage.append("Logs", sets("a", "2026-09-01", 2, "sep"))
+    storage.append("Logs", sets("a", "2026-10-01", 2, "oct"))
+    everything = storage.read("Logs")
+
+    opened = []
+    read_partition = storage._read_partition
+    monkeypatch.setattr(storage, "_read_partition", lambda m: opened.append(m) or read_partition(m))
+    tail = storage.tail("Logs", 4)
+    assert opened == ["2026-10", "2026-09"]
+    assert tail["Key"].tolist() == everything["Key"].iloc[4:].tolist() == ["sep-1", "oct-0", "oct-1"]
+    assert storage.tail("Logs", 7).empty
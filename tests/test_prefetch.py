@@ -0,0 +1,63 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from ironos import prefetch
+from ironos.library import LibraryIndex
+
+WEEKS = [str(w) for w in range(1, 12)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    prefetch._workouts.clear()
+    yield
+    prefetch._workouts.clear()
+
+
+@pytest.fixture
+def index():
+    return LibraryIndex(pd.DataFrame({
+        'Template': ["T"] * len(WEEKS), 'Week': WEEKS, 'Day': ["A"] * len(WEEKS),
+        'Exercise': ["Squat"] * len(WEEKS), 'Sets': ["1"] * len(WEEKS), 'Reps': ["5"] * len(WEEKS),
+        'Pct': ["0.8"] * len(WEEKS),
+    }))
+
+
+PROFILE = pd.DataFrame({'Lift': ["Squat"], 'Max': [200.0]})
+
+
+def test_upcoming_follows_numeric_week_order(index):
+    assert prefetch.upcoming(index, ("T", "9", "A"), count=2) == [("T", "10", "A"), ("T", "11", "A")]
+
+
+def test_queued_day_is_compiled_inline(index):
+    release = threading.Event()
+    blocker = prefetch._pool.submit(release.wait)
+    try:
+        queue = prefetch.prefetched_workout(index, PROFILE, ("T", "1", "A"))
+        assert [e["Exercise"] for e in queue] == ["Squat"]
+        assert not blocker.done()
+    finally:
+        release.set()
+
+
+def test_failed_prefetch_is_retried(index, monkeypatch):
+    calls = []
+    real = prefetch.compile_library
+
+    def flaky(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("Profile read failed")
+        return real(*args)
+
+    monkeypatch.setattr(prefetch, "compile_library", flaky)
+    prefetch.prefetch(index, PROFILE, [("T", "1", "A")])
+    (failed,) = prefetch._workouts.entries.values()
+    with pytest.raises(RuntimeError):
+        failed.result()
+    # The failure is not served from the cache; loading the day compiles it again
+    assert [e["Exercise"] for e in prefetch.prefetched_workout(index, PROFILE, ("T", "1", "A"))] == ["Squat"]
+    assert len(calls) == 2
@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+from ironos.schema import coerce
+
+
+@pytest.fixture(params=[object, "str"])
+def text(request):
+    """Sheets read as object columns (pandas < 3) or the str dtype (pandas 3)"""
+    return lambda values: pd.Series(values, dtype=request.param)
+
+
+def test_blank_cells_are_missing_not_invalid(text):
+    df = pd.DataFrame({
+        'Template': text(["T", "T"]), 'Week': text(["1", "1"]), 'Day': text(["A", "A"]),
+        'Exercise': text(["Squat", "Dip"]), 'Sets': text(["  ", "x"]),
+    })
+    typed, issues = coerce(df, 'Master')
+    assert typed['Sets'].isna().all()
+    assert [(i.row, i.column, i.value) for i in issues] == [(3, 'Sets', "x")]
+
+
+def test_blank_required_cells_are_reported(text):
+    df = pd.DataFrame({'Athlete': text(["", ""]), 'Lift': text(["Squat", " "]), 'Max': text(["100", "90"])})
+    typed, issues = coerce(df, 'Profile')
+    assert [(i.row, i.column, i.message) for i in issues] == [(3, 'Lift', "missing")]
+    assert typed['Max'].tolist() == [100.0, 90.0]
@@ -0,0 +1,35 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("httpx")
+
+from benchmarks.fake_sheets_api import FakeSheetsServer
+from ironos.sheets_api import SheetsAPIStorage, SheetsClient
+
+
+@pytest.fixture
+def server():
+    server = FakeSheetsServer({"Profile": pd.DataFrame({"Athlete": ["sam"], "Lift": ["Squat"], "Max": ["200"]})})
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_token_refresh_runs_off_the_event_loop(server):
+    threads = []
+
+    def token():
+        threads.append(threading.current_thread())
+        time.sleep(0.05)  # a slow refresh must not stall other requests on the loop
+        return "t"
+
+    client = SheetsClient("fake", token=token, base_url=server.url, drive_url=server.url)
+    try:
+        frame = SheetsAPIStorage(client).read("Profile")
+        assert frame["Lift"].tolist() == ["Squat"]
+        assert threads and client.thread not in threads
+    finally:
+        client.close()
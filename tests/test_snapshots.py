@@ -0,0 +1,32 @@
+from ironos.snapshots import SnapshotStore, restore
+from ironos.workout import WorkoutSession
+
+PLAN = [{"Exercise": "Squat", "Sets": 3, "Guide_List": [100, 110, 120], "Rep_List": ["5", "5", "5"]}]
+
+
+def store_with(tmp_path, athlete, day):
+    store = SnapshotStore(str(tmp_path / "snapshots.db"))
+    session = WorkoutSession(PLAN)
+    session.logs[0].fill()
+    store.put_session(athlete, day, session.workout_id, PLAN, [])
+    store.put_exercise(athlete, day, session.workout_id, 0, session.logs[0])
+    store.flush()
+    return store, session
+
+
+def test_restore_resumes_the_workout(tmp_path):
+    store, session = store_with(tmp_path, "sam", "2026-10-17")
+    queue, builder, restored = restore(store.load("sam", "2026-10-17"))
+    assert queue == PLAN and builder == []
+    assert restored.workout_id == session.workout_id
+    assert restored.logs[0].weight.tolist() == [100, 110, 120]
+    assert store.load("alex", "2026-10-17") is None
+
+
+def test_prune_runs_again_when_the_day_changes(tmp_path):
+    store, _ = store_with(tmp_path, "sam", "2026-10-17")
+    store.prune("2026-10-17")
+    assert store.load("sam", "2026-10-17") is not None
+    store.prune("2026-10-18")
+    assert store.load("sam", "2026-10-17") is None
+
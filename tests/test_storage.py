@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import FakeConnection
+from ironos.storage import LOG_COLUMNS, GSheetsStorage, SQLiteStorage
+
+
+def logs(n=2):
+    return pd.DataFrame([{
+        "Date": "2026-10-01", "Athlete": "sam", "Exercise": "Squat", "Set": s + 1,
+        "Weight": 100.0, "Reps": 5, "RPE": 8.0, "Key": f"w1:squat:{s + 1}",
+    } for s in range(n)], columns=LOG_COLUMNS)
+
+
+class Changed:
+    """Client objects from st-gsheets-connection releases whose private API differs"""
+
+    class NoOpener:
+        pass
+
+    class NewSignature:
+        def _open_spreadsheet(self, *, spreadsheet):
+            raise AssertionError("not called this way")
+
+    class Raises:
+        def _open_spreadsheet(self):
+            raise TypeError("_open_spreadsheet() missing 1 required keyword-only argument")
+
+    class OtherObject:
+        def _open_spreadsheet(self):
+            return object()
+
+
+class RewriteOnly(FakeConnection):
+    """A connection whose gspread handle can't be reached, so appends rewrite the sheet"""
+
+    def __init__(self, frames, client=None):
+        super().__init__(frames)
+        self.client = client
+        self.updates = 0
+
+    def update(self, worksheet, data):
+        self.updates += 1
+        super().update(worksheet, data)
+
+
+def test_missing_athlete_column_fails_loudly():
+    header = [c for c in LOG_COLUMNS if c != "Athlete"]
+    conn = FakeConnection({"Logs": pd.DataFrame(columns=header)})
+    with pytest.raises(ValueError, match="Athlete"):
+        GSheetsStorage(conn).append("Logs", logs())
+    assert len(conn.spreadsheet.worksheet("Logs").rows) == 1
+
+
+def test_missing_optional_columns_are_dropped():
+    header = ["Date", "Athlete", "Exercise", "Set", "Weight", "Reps", "RPE"]
+    conn = FakeConnection({"Logs": pd.DataFrame(columns=header)})
+    assert GSheetsStorage(conn).append("Logs", logs()) == 2
+    assert conn.spreadsheet.worksheet("Logs").rows[1] == ["2026-10-01", "sam", "Squat", 1, 100.0, 5, 8.0]
+
+
+@pytest.mark.parametrize("client", [None, Changed.NoOpener(), Changed.NewSignature(), Changed.Raises(),
+                                    Changed.OtherObject()])
+def test_append_falls_back_to_rewrite(client):
+    conn = RewriteOnly({"Logs": logs(1)}, client)
+    storage = GSheetsStorage(conn)
+    assert storage.revision("Logs") is None
+    assert storage.append("Logs", logs(2).iloc[1:]) == 1
+    assert conn.updates == 1
+    assert [row[-1] for row in conn.spreadsheet.worksheet("Logs").rows[1:]] == ["w1:squat:1", "w1:squat:2"]
+
+
+@pytest.fixture
+def sqlite(tmp_path):
+    return SQLiteStorage(str(tmp_path / "ironos.db"))
+
+
+def test_sqlite_append_and_read(sqlite):
+    assert sqlite.read("Logs").empty
+    assert sqlite.append("Logs", logs(2)) == 2
+    assert sqlite.append("Logs", logs(0)) == 0
+    df = sqlite.read("Logs")
+    assert df.columns.tolist() == LOG_COLUMNS
+    # Values come back as sheet text; missing ones stay missing
+    assert df["Weight"].tolist() == ["100.0", "100.0"]
+    assert df["Template"].isna().all()
+    assert sqlite.revision("Logs") == 1
+    assert sqlite.tail("Logs", 1)["Key"].tolist() == ["w1:squat:2"]
+
+
+def test_sqlite_query(sqlite):
+    sqlite.append("Logs", logs(3))
+    assert sqlite.query("Logs", Key="w1:squat:2")["Set"].tolist() == ["2"]
+    assert sqlite.query("Logs", Key=["w1:squat:1", "w1:squat:3", "other"])["Set"].tolist() == ["1", "3"]
+    assert sqlite.query("Logs", Athlete="sam", Set=3)["Key"].tolist() == ["w1:squat:3"]
+    assert sqlite.query("Logs", Missing="x").empty
+    assert sqlite.existing_keys("Logs", ["w1:squat:1", "other"]) == {"w1:squat:1"}
+
+
+def test_sqlite_update_replaces_the_worksheet(sqlite, tmp_path):
+    sqlite.append("Logs", logs(3))
+    sqlite.update("Logs", logs(1))
+    assert sqlite.read("Logs")["Key"].tolist() == ["w1:squat:1"]
+    assert sqlite.revision("Logs") == 2
+
+    # New columns are added, and everything is on disk for the next process
+    extra = logs(1).assign(Note="felt good")
+    sqlite.update("Logs", extra)
+    reopened = SQLiteStorage(str(tmp_path / "ironos.db"))
+    assert reopened.read("Logs")["Note"].tolist() == ["felt good"]
+    assert reopened.revision("Logs") == 3
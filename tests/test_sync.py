@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import FakeConnection
+from ironos.storage import LOG_COLUMNS, GSheetsStorage, MemoryStorage
+from ironos.sync import SaveJournal, SyncWorker, set_key
+
+
+def logs(workout, n=3):
+    return pd.DataFrame([{
+        "Date": "2026-10-01", "Athlete": "sam", "Exercise": "Squat", "Set": s + 1,
+        "Weight": 100.0, "Reps": 5, "RPE": 8.0, "Key": set_key(workout, "Squat", s + 1),
+    } for s in range(n)], columns=LOG_COLUMNS)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return SaveJournal(str(tmp_path / "journal.db"))
+
+
+class FlakyStorage(MemoryStorage):
+    """Appends land but report failure while ``failures`` remain, like a timed-out request"""
+
+    def __init__(self, failures=1):
+        super().__init__()
+        self.failures = failures
+        self.appends = 0
+
+    def append(self, worksheet, data):
+        written = super().append(worksheet, data)
+        self.appends += 1
+        if self.failures:
+            self.failures -= 1
+            raise TimeoutError("read timed out")
+        return written
+
+
+def test_enqueue_is_idempotent(journal):
+    assert journal.enqueue("Logs", logs("w1")) == 3
+    assert journal.enqueue("Logs", logs("w1")) == 0
+    assert journal.pending_count() == 3
+
+
+def test_flush_delivers_and_clears(journal):
+    storage = MemoryStorage()
+    journal.enqueue("Logs", logs("w1"))
+    assert SyncWorker(journal, storage).flush_once() == 3
+    assert journal.pending_count() == 0
+    assert storage.read("Logs")['Key'].tolist() == logs("w1")['Key'].tolist()
+
+
+def test_failed_flush_backs_off_and_records_the_error(journal):
+    storage = FlakyStorage()
+    journal.enqueue("Logs", logs("w1"))
+    worker = SyncWorker(journal, storage, base_delay=60)
+    assert worker.flush_once() == 0
+    assert journal.pending_count() == 3
+    assert "timed out" in journal.last_error()
+    # Still backing off, so nothing is due
+    assert journal.due() == []
+
+
+def test_retry_skips_rows_that_already_landed(journal):
+    storage = FlakyStorage()
+    journal.enqueue("Logs", logs("w1"))
+    worker = SyncWorker(journal, storage, base_delay=0)
+    worker.flush_once()
+    worker.flush_once()
+    assert journal.pending_count() == 0
+    assert len(storage.read("Logs")) == 3
+    assert storage.appends == 1
+
+
+def test_flush_to_sheets_keeps_keys_as_text(journal):
+    conn = FakeConnection({"Logs": pd.DataFrame(columns=LOG_COLUMNS)})
+    journal.enqueue("Logs", logs("w1"))
+    SyncWorker(journal, GSheetsStorage(conn)).flush_once()
+    rows = conn.spreadsheet.worksheet("Logs").rows
+    assert len(rows) == 4
+    assert [row[LOG_COLUMNS.index("Key")] for row in rows[1:]] == logs("w1")['Key'].tolist()
+
+
+def test_sheet_rows_are_plain_values():
+    conn = FakeConnection({"Logs": pd.DataFrame(columns=LOG_COLUMNS)})
+    GSheetsStorage(conn).append("Logs", logs("w1").astype({"Set": "int16", "RPE": "float32"}))
+    row = dict(zip(LOG_COLUMNS, conn.spreadsheet.worksheet("Logs").rows[1]))
+    # Written RAW: numbers must reach the API as JSON numbers, Keys as text
+    assert type(row["Set"]) is int and type(row["RPE"]) is float
+    assert row["Key"] == set_key("w1", "Squat", 1)
+
+
+def test_rejected_rows_are_parked_until_retried(journal):
+    header = [c for c in LOG_COLUMNS if c != "Athlete"]
+    conn = FakeConnection({"Logs": pd.DataFrame(columns=header)})
+    journal.enqueue("Logs", logs("w1"))
+    worker = SyncWorker(journal, GSheetsStorage(conn), base_delay=0)
+    assert worker.flush_once() == 0
+    assert journal.stuck_count() == 3 and journal.due() == []
+    (worksheet, row, error), *_ = journal.stuck()
+    assert worksheet == "Logs" and row["Exercise"] == "Squat" and "Athlete" in error
+
+    conn.spreadsheet.worksheet("Logs").rows[0] = LOG_COLUMNS
+    assert journal.retry_stuck() == 3
+    assert worker.flush_once() == 3
+    assert journal.pending_count() == 0
@@ -0,0 +1,57 @@
+from ironos.catalog import ExerciseCatalog
+from ironos.storage import LOG_COLUMNS
+from ironos.workout import ExerciseLog, WorkoutSession
+
+META = {"Template": "5/3/1", "Week": "1", "Day": "A"}
+PLAN = [
+    {"Exercise": "squat", "Category": "Main", "Sets": 3, "Guide_List": [100, 110, 120],
+     "Rep_List": ["5", "3", "1+"], "Meta": META},
+    {"Exercise": "Dips", "Sets": 2, "Rep_List": ["AMRAP"]},
+]
+
+
+def test_exercise_log_fill_and_reset():
+    log = ExerciseLog(PLAN[0])
+    assert log.sets == 3 and log.rev == 0
+    log.fill()
+    assert log.weight.tolist() == [100, 110, 120]
+    assert log.reps.tolist() == [5, 3, 1]
+    assert log.rev == 1
+    log.reset()
+    assert log.weight.tolist() == [0, 0, 0] and log.rev == 2
+
+
+def test_short_plans_repeat_their_last_value():
+    log = ExerciseLog(PLAN[1])
+    assert log.category == "Exercise"
+    assert log.target_weight.tolist() == [0, 0]
+    assert log.target_reps.tolist() == ["AMRAP", "AMRAP"]
+    log.fill()
+    assert log.reps.tolist() == [5, 5]
+    assert log.frame()["Target Reps"].tolist() == ["AMRAP", "AMRAP"]
+
+
+def test_logs_frame_rows():
+    session = WorkoutSession(PLAN, workout_id="w1")
+    session.fill()
+    session.logs[0].weight[2] = 0.0  # an unlogged set
+    catalog = ExerciseCatalog(["Back Squat", "Squat", "Dips"], aliases={"squat": "Back Squat"})
+    df = session.logs_frame("2026-10-17", "sam", catalog=catalog)
+
+    assert list(df.columns) == LOG_COLUMNS
+    assert df["Exercise"].tolist() == ["Squat", "Squat"]
+    assert df["ExerciseId"].tolist() == ["squat", "squat"]
+    assert df["Set"].tolist() == [1, 2]
+    assert df[["Template", "Week", "Day"]].iloc[0].tolist() == ["5/3/1", "1", "A"]
+    assert (df["Athlete"] == "sam").all() and (df["Date"] == "2026-10-17").all()
+    assert df["Key"].is_unique
+
+
+def test_logs_frame_keys_are_stable_per_workout():
+    first = WorkoutSession(PLAN, workout_id="w1").logs_frame("2026-10-17", logged_only=False)
+    again = WorkoutSession(PLAN, workout_id="w1").logs_frame("2026-10-17", logged_only=False)
+    other = WorkoutSession(PLAN).logs_frame("2026-10-17", logged_only=False)
+    assert len(first) == 5
+    assert first["Key"].tolist() == again["Key"].tolist()
+    assert not set(first["Key"]) & set(other["Key"])
+    assert WorkoutSession([]).logs_frame("2026-10-17").empty